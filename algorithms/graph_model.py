@@ -0,0 +1,132 @@
+# algorithms/graph_model.py
+from array import array
+from itertools import accumulate
+from collections.abc import Mapping
+
+
+def label_key(label):
+    """Sort key for node labels: numeric labels by value first, then everything else as text."""
+    text = str(label)
+    return (0, int(text), '') if text.isdigit() else (1, 0, text)
+
+
+class CSRGraph:
+    """
+    Compact, read-only graph in compressed sparse row form, built once per request
+    from the `{'adjacency_list': {node: [{'node': v, 'weight': w}, ...]}}` payload.
+
+    Nodes get integer ids in label order, so walking a node's row visits its
+    neighbors already sorted by label. The edges of node `u` are
+    `targets[offsets[u]:offsets[u + 1]]`, with matching `weights`. When every
+    node of the payload has an x/y position, `xs` and `ys` hold them by node id.
+    """
+
+    __slots__ = ('labels', 'index', 'offsets', 'targets', 'weights', 'xs', 'ys')
+
+    def __init__(self, labels, offsets, targets, weights, xs=None, ys=None):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.xs = xs
+        self.ys = ys
+
+    @classmethod
+    def from_graph_data(cls, graph_data):
+        """
+        Builds the graph from a request payload. Neighbor entries may be
+        `{'node': v, 'weight': w}` dicts or bare labels (weight 1); labels that
+        only appear as neighbors still become nodes.
+        """
+        if isinstance(graph_data, cls):
+            return graph_data
+        adjacency = graph_data['adjacency_list']
+        rows = {}
+        for node, neighbors in adjacency.items():
+            rows[node] = [(n['node'], n.get('weight', 1)) if isinstance(n, dict) else (n, 1) for n in neighbors]
+        seen = set(rows)
+        for row in list(rows.values()):
+            for neighbor, _ in row:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    rows[neighbor] = []
+
+        labels = sorted(rows, key=label_key)
+        index = {label: i for i, label in enumerate(labels)}
+        offsets, targets, weight_values = array('l', [0]), array('l'), []
+        for label in labels:
+            row = sorted((index[neighbor], weight) for neighbor, weight in rows[label])
+            targets.extend(v for v, _ in row)
+            weight_values.extend(w for _, w in row)
+            offsets.append(len(targets))
+        # Integer weights stay integers so the steps serialize exactly as they came in
+        weights = array('q', weight_values) if all(type(w) is int for w in weight_values) else array('d', weight_values)
+
+        xs = ys = None
+        positions = graph_data.get('nodes') or {}
+        if all(label in positions for label in labels):
+            xs = array('d', (positions[label]['x'] for label in labels))
+            ys = array('d', (positions[label]['y'] for label in labels))
+        return cls(labels, offsets, targets, weights, xs, ys)
+
+    @property
+    def node_count(self):
+        return len(self.labels)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def neighbors(self, u):
+        """Neighbor ids of node id `u`, in label order."""
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def reversed(self):
+        """The same graph with every edge flipped, for searches that walk edges backwards."""
+        n, offsets, targets, weights = self.node_count, self.offsets, self.targets, self.weights
+        counts = [0] * (n + 1)
+        for v in targets:
+            counts[v + 1] += 1
+        new_offsets = array('l', accumulate(counts))
+        new_targets = array('l', bytes(targets.itemsize * len(targets)))
+        new_weights = array(weights.typecode, bytes(weights.itemsize * len(weights)))
+        fill = list(new_offsets[:-1])
+        # Sources are visited in id order, so every reversed row stays in label order
+        for u in range(n):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                new_targets[fill[v]] = u
+                new_weights[fill[v]] = weights[e]
+                fill[v] += 1
+        return CSRGraph(self.labels, new_offsets, new_targets, new_weights, self.xs, self.ys)
+
+    def edges(self, u):
+        """(neighbor id, weight) pairs of node id `u`, in label order."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+
+class NodeValues(Mapping):
+    """Read-only label -> value view over a per-node-id list, for snapshotting id-indexed state."""
+
+    __slots__ = ('graph', 'values')
+
+    def __init__(self, graph, values):
+        self.graph = graph
+        self.values = values
+
+    def __getitem__(self, label):
+        return self.values[self.graph.index[label]]
+
+    def __iter__(self):
+        return iter(self.graph.labels)
+
+    def __len__(self):
+        return len(self.values)
+
+    def items(self):
+        return zip(self.graph.labels, self.values)
@@ -1,152 +1,189 @@
 # algorithms/graphs.py
 from collections import deque
 import heapq 
-def bfs(graph_data, start_node):
+import math
+from itertools import chain, repeat
+from operator import sub
+
+from algorithms.graph_model import CSRGraph, NodeValues
+from algorithms.snapshots import DictSnapshots, ListSnapshots
+
+# As in sorting.py, record=False yields bare action names and records no snapshots.
+
+def _finite_or_none(distance):
+    # JSON has no infinity, so unreached nodes are sent as null
+    return None if distance == float('inf') else distance
+
+def bfs(graph_data, start_node, record=True):
     """
     Generates animation steps for Breadth-First Search.
     Uses a queue to explore level by level.
     """
+    graph = CSRGraph.from_graph_data(graph_data)
     # Validate that the start node exists in the graph
-    if start_node not in graph_data['adjacency_list']:
-        return [{'action': 'error', 'message': f'Start node "{start_node}" not in graph.'}]
+    if start_node not in graph:
+        yield {'action': 'error', 'message_id': 'graph.bad_start', 'message_args': (start_node,)} if record else 'error'
+        return
 
-    steps = []
+    labels = graph.labels
     queue = deque([start_node])
-    visited = {start_node}
+    visited = bytearray(graph.node_count)
+    visited[graph.index[start_node]] = 1
+    queue_snapshots = ListSnapshots('queue_state')
     
     # Step: Initial state
-    steps.append({
+    yield {
         'action': 'enqueue',
         'node': start_node,
-        'queue_state': list(queue),
-        'message': f'Starting BFS at node {start_node}. Add it to the queue.'
-    })
+        **queue_snapshots.record(queue, push=[start_node]),
+        'message_id': 'bfs.start',
+        'message_args': (start_node,)
+    } if record else 'enqueue'
 
     while queue:
         node = queue.popleft()
         # Step: Dequeue a node to visit it
-        steps.append({
+        yield {
             'action': 'dequeue',
             'node': node,
-            'queue_state': list(queue),
-            'message': f'Dequeueing and visiting node {node}.'
-        })
+            **queue_snapshots.record(queue, shift=1),
+            'message_id': 'bfs.dequeue',
+            'message_args': (node,)
+        } if record else 'dequeue'
         
-        # Explore neighbors of the current node
-        for neighbor in sorted(graph_data['adjacency_list'].get(node, [])): # Sorted for consistency
+        # Explore neighbors of the current node, already in label order
+        for v in graph.neighbors(graph.index[node]):
+            neighbor = labels[v]
             # Step: Show which edge is being checked
-            steps.append({
+            yield {
                 'action': 'explore_edge',
                 'from': node,
                 'to': neighbor,
-                'message': f'Exploring edge from {node} to {neighbor}.'
-            })
-            if neighbor not in visited:
-                visited.add(neighbor)
+                'message_id': 'bfs.explore_edge',
+                'message_args': (node, neighbor)
+            } if record else 'explore_edge'
+            if not visited[v]:
+                visited[v] = 1
                 queue.append(neighbor)
                 # Step: Enqueue an unvisited neighbor
-                steps.append({
+                yield {
                     'action': 'enqueue',
                     'node': neighbor,
-                    'queue_state': list(queue),
-                    'message': f'Node {neighbor} is unvisited. Add to queue.'
-                })
+                    **queue_snapshots.record(queue, push=[neighbor]),
+                    'message_id': 'bfs.enqueue',
+                    'message_args': (neighbor,)
+                } if record else 'enqueue'
             else:
                 # Step: Note that the neighbor has already been visited
-                 steps.append({
+                 yield {
                     'action': 'neighbor_visited',
                     'node': neighbor,
-                    'message': f'Node {neighbor} has already been visited. Skipping.'
-                 })
+                    'message_id': 'bfs.visited',
+                    'message_args': (neighbor,)
+                 } if record else 'neighbor_visited'
     
-    steps.append({'action': 'complete', 'message': 'BFS complete. All reachable nodes visited.'})
-    return steps
+    yield {'action': 'complete', 'message_id': 'bfs.complete'} if record else 'complete'
 
 
-def dfs(graph_data, start_node):
+def dfs(graph_data, start_node, record=True):
     """
     Generates animation steps for Depth-First Search (iterative version).
     Uses a stack to explore as deep as possible before backtracking.
     """
-    if start_node not in graph_data['adjacency_list']:
-        return [{'action': 'error', 'message': f'Start node "{start_node}" not in graph.'}]
-        
-    steps = []
+    graph = CSRGraph.from_graph_data(graph_data)
+    if start_node not in graph:
+        yield {'action': 'error', 'message_id': 'graph.bad_start', 'message_args': (start_node,)} if record else 'error'
+        return
+
+    labels = graph.labels
     stack = [start_node]
-    visited = set()
+    visited = bytearray(graph.node_count)
+    stack_snapshots = ListSnapshots('stack_state')
 
     # Step: Initial state
-    steps.append({
+    yield {
         'action': 'push',
         'node': start_node,
-        'stack_state': list(stack),
-        'message': f'Starting DFS at node {start_node}. Push it to the stack.'
-    })
+        **stack_snapshots.record(stack, push=[start_node]),
+        'message_id': 'dfs.start',
+        'message_args': (start_node,)
+    } if record else 'push'
     
     while stack:
         node = stack.pop()
         
         # Step: Show the node being popped for consideration
-        steps.append({
+        yield {
             'action': 'pop',
             'node': node,
-            'stack_state': list(stack),
-            'message': f'Popping node {node} from the stack to visit.'
-        })
+            **stack_snapshots.record(stack, pop=1),
+            'message_id': 'dfs.pop',
+            'message_args': (node,)
+        } if record else 'pop'
         
-        if node in visited:
+        u = graph.index[node]
+        if visited[u]:
             # Step: If already visited, skip it
-            steps.append({
+            yield {
                 'action': 'skip_visited',
                 'node': node,
-                'message': f'Node {node} already visited. Skipping.'
-            })
+                'message_id': 'dfs.skip_visited',
+                'message_args': (node,)
+            } if record else 'skip_visited'
             continue
 
-        visited.add(node)
+        visited[u] = 1
         # Step: Mark the node as visited
-        steps.append({
+        yield {
             'action': 'visit_node',
             'node': node,
-            'message': f'Visiting node {node} for the first time.'
-        })
+            'message_id': 'dfs.visit',
+            'message_args': (node,)
+        } if record else 'visit_node'
         
-        # Add neighbors to the stack. We sort and reverse so they are processed alphabetically.
-        neighbors = sorted(graph_data['adjacency_list'].get(node, []), reverse=True)
-        for neighbor in neighbors:
+        # Add neighbors to the stack in reverse label order, so they are popped in label order
+        for v in reversed(graph.neighbors(u)):
+            neighbor = labels[v]
             # Step: Explore edge and push unvisited neighbors to the stack
-            steps.append({
+            yield {
                 'action': 'explore_edge',
                 'from': node,
                 'to': neighbor,
-                'message': f'Checking neighbor {neighbor} of {node}.'
-            })
-            if neighbor not in visited:
+                'message_id': 'dfs.explore_edge',
+                'message_args': (neighbor, node)
+            } if record else 'explore_edge'
+            if not visited[v]:
                 stack.append(neighbor)
-                steps.append({
+                yield {
                     'action': 'push',
                     'node': neighbor,
-                    'stack_state': list(stack),
-                    'message': f'Pushing unvisited neighbor {neighbor} to stack.'
-                })
+                    **stack_snapshots.record(stack, push=[neighbor]),
+                    'message_id': 'dfs.push',
+                    'message_args': (neighbor,)
+                } if record else 'push'
 
-    steps.append({'action': 'complete', 'message': 'DFS complete. All reachable nodes visited.'})
-    return steps
-def dijkstra_steps(graph_data, start_node, end_node):
+    yield {'action': 'complete', 'message_id': 'dfs.complete'} if record else 'complete'
+
+def dijkstra_steps(graph_data, start_node, end_node, record=True):
     """Generates animation steps for Dijkstra's Shortest Path algorithm."""
-    adj = graph_data['adjacency_list']
-    if start_node not in adj or end_node not in adj:
-        return [{'action': 'error', 'message': 'Start or end node not in graph.'}]
-
-    steps = []
-    distances = {node: float('inf') for node in adj}
-    predecessors = {node: None for node in adj}
-    distances[start_node] = 0
+    graph = CSRGraph.from_graph_data(graph_data)
+    if start_node not in graph or end_node not in graph:
+        yield {'action': 'error', 'message_id': 'graph.bad_endpoints'} if record else 'error'
+        return
+
+    labels = graph.labels
+    source, target = graph.index[start_node], graph.index[end_node]
+    distances = [float('inf')] * graph.node_count
+    predecessors = [-1] * graph.node_count
+    distances[source] = 0
+    distance_view = NodeValues(graph, distances)
+    distance_snapshots = DictSnapshots('distances', encode=_finite_or_none)
     
-    # Priority queue stores (distance, node)
-    pq = [(0, start_node)]
+    # Priority queue stores (distance, node id)
+    pq = [(0, source)]
+    closed = 0
 
-    steps.append({'action': 'init_distances', 'distances': distances, 'message': f'Initializing all distances to infinity, source {start_node} to 0.'})
+    yield {'action': 'init_distances', **distance_snapshots.record(distance_view), 'message_id': 'dijkstra.init', 'message_args': (start_node,)} if record else 'init_distances'
 
     while pq:
         dist, u = heapq.heappop(pq)
@@ -155,35 +192,230 @@ def dijkstra_steps(graph_data, start_node, end_node):
         if dist > distances[u]:
             continue
 
-        steps.append({'action': 'visit_node', 'node': u, 'message': f'Visiting node {u}, current shortest distance is {dist}.'})
+        closed += 1
+        yield {'action': 'visit_node', 'node': labels[u], 'frontier_size': len(pq), 'closed_size': closed, 'message_id': 'dijkstra.visit', 'message_args': (labels[u], dist)} if record else 'visit_node'
 
-        for neighbor_data in adj.get(u, []):
-            v = neighbor_data['node']
-            weight = neighbor_data['weight']
-            
-            steps.append({'action': 'explore_edge', 'from': u, 'to': v, 'weight': weight, 'message': f'Exploring edge from {u} to {v} with weight {weight}.'})
+        for v, weight in graph.edges(u):
+            yield {'action': 'explore_edge', 'from': labels[u], 'to': labels[v], 'weight': weight, 'message_id': 'dijkstra.explore_edge', 'message_args': (labels[u], labels[v], weight)} if record else 'explore_edge'
 
             if distances[u] + weight < distances[v]:
                 # Found a shorter path to v
                 distances[v] = distances[u] + weight
                 predecessors[v] = u
                 heapq.heappush(pq, (distances[v], v))
-                steps.append({'action': 'update_distance', 'node': v, 'new_dist': distances[v], 'distances': dict(distances), 'message': f'Found shorter path to {v}! New distance: {distances[v]}.'})
+                yield {'action': 'update_distance', 'node': labels[v], 'new_dist': distances[v], **distance_snapshots.record(distance_view, changed=(labels[v],)), 'message_id': 'dijkstra.relax', 'message_args': (labels[v], distances[v])} if record else 'update_distance'
             else:
-                steps.append({'action': 'skip_update', 'from': u, 'to': v, 'message': f'Path to {v} via {u} is not shorter.'})
+                yield {'action': 'skip_update', 'from': labels[u], 'to': labels[v], 'message_id': 'dijkstra.no_relax', 'message_args': (labels[v], labels[u])} if record else 'skip_update'
     
-    # Reconstruct and highlight the final path
-    path = []
-    current = end_node
-    while current is not None:
-        path.insert(0, current)
-        current = predecessors[current]
+    # Reconstruct and highlight the final path, walking back from the end node
+    path = [labels[i] for i in tree_path(predecessors, target)]
 
     if path[0] == start_node:
-        steps.append({'action': 'highlight_path', 'path': path, 'distance': distances[end_node], 'message': f'Shortest path found! Total distance: {distances[end_node]}.'})
+        yield {'action': 'highlight_path', 'path': path, 'distance': distances[target], 'message_id': 'dijkstra.path', 'message_args': (distances[target],)} if record else 'highlight_path'
     else:
-        steps.append({'action': 'path_not_found', 'end_node': end_node, 'message': f'No path found from {start_node} to {end_node}.'})
+        yield {'action': 'path_not_found', 'end_node': end_node, 'message_id': 'dijkstra.no_path', 'message_args': (start_node, end_node)} if record else 'path_not_found'
         
-    steps.append({'action': 'complete', 'message': 'Dijkstra\'s algorithm complete.'})
-    return steps
+    yield {'action': 'complete', 'message_id': 'dijkstra.complete'} if record else 'complete'
+
+
+def _heuristic_scale(graph):
+    """
+    Largest factor k such that k * (straight-line length) never exceeds an edge's
+    weight. Scaling the Euclidean distance by k keeps the heuristic admissible and
+    consistent whatever units the weights use; 0 turns A* into Dijkstra.
+    """
+    xs, ys, targets, offsets = graph.xs, graph.ys, graph.targets, graph.offsets
+    if xs is None:
+        return 0.0
+    # Edge-parallel arrays built with map() so the O(E) pass stays out of the interpreter loop
+    sources = list(chain.from_iterable(map(repeat, range(graph.node_count), map(sub, offsets[1:], offsets[:-1]))))
+    lengths = map(math.hypot,
+                  map(sub, map(xs.__getitem__, targets), map(xs.__getitem__, sources)),
+                  map(sub, map(ys.__getitem__, targets), map(ys.__getitem__, sources)))
+    return min((w / length for w, length in zip(graph.weights, lengths) if length > 0), default=0.0)
+
+
+def astar_steps(graph_data, start_node, end_node, record=True):
+    """
+    Generates animation steps for A* search. Nodes are expanded in order of
+    f = g + h, where h is the scaled straight-line distance to the end node from
+    the layout coordinates, and the search stops as soon as the end node is settled.
+    """
+    graph = CSRGraph.from_graph_data(graph_data)
+    if start_node not in graph or end_node not in graph:
+        yield {'action': 'error', 'message_id': 'graph.bad_endpoints'} if record else 'error'
+        return
+
+    labels = graph.labels
+    source, target = graph.index[start_node], graph.index[end_node]
+    scale = _heuristic_scale(graph)
+    xs, ys = graph.xs, graph.ys
+
+    def heuristic(v):
+        if not scale:
+            return 0
+        return scale * math.hypot(xs[v] - xs[target], ys[v] - ys[target])
+
+    distances = [float('inf')] * graph.node_count
+    predecessors = [-1] * graph.node_count
+    settled = bytearray(graph.node_count)
+    distances[source] = 0
+    distance_view = NodeValues(graph, distances)
+    distance_snapshots = DictSnapshots('distances', encode=_finite_or_none)
+
+    # Priority queue stores (f, g, node id)
+    pq = [(heuristic(source), 0, source)]
+    closed = 0
+
+    yield {'action': 'init_distances', **distance_snapshots.record(distance_view), 'message_id': 'astar.init', 'message_args': (start_node, end_node)} if record else 'init_distances'
+
+    while pq:
+        f, dist, u = heapq.heappop(pq)
+        if settled[u] or dist > distances[u]:
+            continue
+        settled[u] = 1
+        closed += 1
+
+        yield {'action': 'visit_node', 'node': labels[u], 'f': f, 'frontier_size': len(pq), 'closed_size': closed, 'message_id': 'astar.visit', 'message_args': (labels[u], dist, round(f, 2))} if record else 'visit_node'
+
+        # The end node is settled: its distance is final, nothing left to explore
+        if u == target:
+            break
+
+        for v, weight in graph.edges(u):
+            if settled[v]:
+                continue
+            yield {'action': 'explore_edge', 'from': labels[u], 'to': labels[v], 'weight': weight, 'message_id': 'astar.explore_edge', 'message_args': (labels[u], labels[v], weight)} if record else 'explore_edge'
+
+            if dist + weight < distances[v]:
+                distances[v] = dist + weight
+                predecessors[v] = u
+                heapq.heappush(pq, (distances[v] + heuristic(v), distances[v], v))
+                yield {'action': 'update_distance', 'node': labels[v], 'new_dist': distances[v], **distance_snapshots.record(distance_view, changed=(labels[v],)), 'message_id': 'astar.relax', 'message_args': (labels[v], distances[v])} if record else 'update_distance'
+            else:
+                yield {'action': 'skip_update', 'from': labels[u], 'to': labels[v], 'message_id': 'dijkstra.no_relax', 'message_args': (labels[v], labels[u])} if record else 'skip_update'
+
+    if settled[target]:
+        path = [labels[i] for i in tree_path(predecessors, target)]
+        yield {'action': 'highlight_path', 'path': path, 'distance': distances[target], 'expanded': closed, 'message_id': 'astar.path', 'message_args': (distances[target], closed)} if record else 'highlight_path'
+    else:
+        yield {'action': 'path_not_found', 'end_node': end_node, 'message_id': 'dijkstra.no_path', 'message_args': (start_node, end_node)} if record else 'path_not_found'
+
+    yield {'action': 'complete', 'message_id': 'astar.complete'} if record else 'complete'
+
+
+def shortest_path_tree(graph, source, guard=None):
+    """
+    Plain Dijkstra from node id `source`, without steps. Returns the distance and
+    predecessor lists by node id, which answer a query to any target. `guard`,
+    if given, wraps the iterator of settled nodes (e.g. with a deadline check).
+    """
+    distances = [float('inf')] * graph.node_count
+    predecessors = [-1] * graph.node_count
+    distances[source] = 0
+    settled = _settle(graph, source, distances, predecessors)
+    for _ in (settled if guard is None else guard(settled)):
+        pass
+    return distances, predecessors
+
+
+def _settle(graph, source, distances, predecessors):
+    """Runs Dijkstra into `distances` and `predecessors`, yielding each node id as it is settled."""
+    pq = [(0, source)]
+    while pq:
+        dist, u = heapq.heappop(pq)
+        if dist > distances[u]:
+            continue
+        yield u
+        for v, weight in graph.edges(u):
+            if dist + weight < distances[v]:
+                distances[v] = dist + weight
+                predecessors[v] = u
+                heapq.heappush(pq, (distances[v], v))
+
+
+def tree_path(predecessors, target):
+    """Node ids from the tree's source to `target`, walking the predecessor list back."""
+    path = []
+    while target != -1:
+        path.append(target)
+        target = predecessors[target]
+    path.reverse()
+    return path
+
+
+def bidirectional_dijkstra_steps(graph_data, start_node, end_node, record=True):
+    """
+    Generates animation steps for bidirectional Dijkstra. A forward search from
+    the start and a backward search from the end expand in turn (the side with
+    the smaller frontier first) and stop once the two frontiers together cannot
+    beat the best meeting point found so far.
+    """
+    graph = CSRGraph.from_graph_data(graph_data)
+    if start_node not in graph or end_node not in graph:
+        yield {'action': 'error', 'message_id': 'graph.bad_endpoints'} if record else 'error'
+        return
+
+    labels = graph.labels
+    n = graph.node_count
+    source, target = graph.index[start_node], graph.index[end_node]
+    # Index 0 is the forward search over the graph, 1 the backward search over its reverse
+    graphs = (graph, graph.reversed())
+    distances = ([float('inf')] * n, [float('inf')] * n)
+    predecessors = ([-1] * n, [-1] * n)
+    settled = (bytearray(n), bytearray(n))
+    distances[0][source] = distances[1][target] = 0
+    pqs = ([(0, source)], [(0, target)])
+    distance_view = NodeValues(graph, distances[0])
+    distance_snapshots = DictSnapshots('distances', encode=_finite_or_none)
+    best, meeting = float('inf'), -1
+    if source == target:
+        best, meeting = 0, source
+    closed = 0
+
+    yield {'action': 'init_distances', **distance_snapshots.record(distance_view), 'message_id': 'bidijkstra.init', 'message_args': (start_node, end_node)} if record else 'init_distances'
+
+    while pqs[0] and pqs[1]:
+        # No unexplored path can be shorter than the two frontier minimums combined
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+        side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+        direction = ('forward', 'backward')[side]
+        dist, u = heapq.heappop(pqs[side])
+        if settled[side][u] or dist > distances[side][u]:
+            continue
+        settled[side][u] = 1
+        closed += 1
+
+        yield {'action': 'visit_node', 'node': labels[u], 'direction': direction, 'frontier_size': len(pqs[0]) + len(pqs[1]), 'closed_size': closed, 'message_id': 'bidijkstra.visit', 'message_args': (labels[u], direction, dist)} if record else 'visit_node'
+
+        own, other = distances[side], distances[1 - side]
+        for v, weight in graphs[side].edges(u):
+            # Edges keep their real orientation in the trace, whichever side walks them
+            edge = (labels[u], labels[v]) if side == 0 else (labels[v], labels[u])
+            yield {'action': 'explore_edge', 'from': edge[0], 'to': edge[1], 'weight': weight, 'message_id': 'dijkstra.explore_edge', 'message_args': (*edge, weight)} if record else 'explore_edge'
+
+            if dist + weight < own[v]:
+                own[v] = dist + weight
+                predecessors[side][v] = u
+                heapq.heappush(pqs[side], (own[v], v))
+                snapshot = distance_snapshots.record(distance_view, changed=(labels[v],)) if record and side == 0 else {}
+                yield {'action': 'update_distance', 'node': labels[v], 'new_dist': own[v], 'direction': direction, **snapshot, 'message_id': 'dijkstra.relax', 'message_args': (labels[v], own[v])} if record else 'update_distance'
+            else:
+                yield {'action': 'skip_update', 'from': edge[0], 'to': edge[1], 'message_id': 'dijkstra.no_relax', 'message_args': (labels[v], labels[u])} if record else 'skip_update'
+
+            # v has now been reached from both ends: a candidate shortest path
+            if own[v] + other[v] < best:
+                best, meeting = own[v] + other[v], v
+                yield {'action': 'meet', 'node': labels[v], 'distance': best, 'message_id': 'bidijkstra.meet', 'message_args': (labels[v], best)} if record else 'meet'
+
+    if meeting == -1:
+        yield {'action': 'path_not_found', 'end_node': end_node, 'message_id': 'dijkstra.no_path', 'message_args': (start_node, end_node)} if record else 'path_not_found'
+    else:
+        # Start -> meeting from the forward tree, then meeting -> end from the backward tree
+        forward = tree_path(predecessors[0], meeting)
+        backward = tree_path(predecessors[1], meeting)[::-1]
+        path = [labels[i] for i in forward + backward[1:]]
+        yield {'action': 'highlight_path', 'path': path, 'distance': best, 'expanded': closed, 'message_id': 'bidijkstra.path', 'message_args': (best, closed)} if record else 'highlight_path'
 
+    yield {'action': 'complete', 'message_id': 'bidijkstra.complete'} if record else 'complete'
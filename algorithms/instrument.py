@@ -0,0 +1,113 @@
+# algorithms/instrument.py
+
+import time
+from collections import Counter
+from itertools import chain
+
+# Operation counts contributed by each step action. Counters are tallied from
+# the very same step generators that drive the animation, so the numbers always
+# match what the visualization shows; only the bookkeeping differs.
+ACTION_COUNTERS = {
+    # Arrays (sorting and searching)
+    'compare': {'comparisons': 1, 'reads': 1},
+    'compare_block': {'comparisons': 1, 'reads': 1},
+    'compare_shift': {'comparisons': 1, 'reads': 1},
+    'merge_compare': {'comparisons': 1, 'reads': 2},
+    'probe': {'reads': 1},
+    'swap': {'swaps': 1, 'reads': 2, 'writes': 2},
+    'highlight_key': {'reads': 1},
+    'shift_right': {'writes': 1},
+    'insert_key': {'writes': 1},
+    'count': {'reads': 1, 'writes': 1},
+    'prefix_sum': {'reads': 1, 'writes': 1},
+    'place': {'reads': 1, 'writes': 1},
+    'scatter': {'reads': 1, 'writes': 1},
+
+    # Graphs
+    'enqueue': {'enqueues': 1},
+    'push': {'enqueues': 1},
+    'dequeue': {'dequeues': 1},
+    'pop': {'dequeues': 1},
+    'visit_node': {'visits': 1},
+    'explore_edge': {'edge_scans': 1},
+    'update_distance': {'comparisons': 1, 'relaxations': 1, 'writes': 1},
+    'skip_update': {'comparisons': 1},
+
+    # Trees
+    'insert': {'writes': 1},
+    'compare_node': {'comparisons': 1, 'reads': 1},
+    'insert_node': {'writes': 1},
+    'delete_node': {'writes': 1},
+    'replace_key': {'reads': 1, 'writes': 1},
+    'check_balance': {'reads': 2, 'writes': 1},
+    'rotate': {'rotations': 1, 'writes': 3},
+
+    # Dynamic programming
+    'call': {'calls': 1},
+    'memo_hit': {'memo_hits': 1},
+    'store_memo': {'writes': 1},
+    'fib_add': {'additions': 1},
+    'matrix_square': {'multiplications': 8, 'additions': 4},
+    'matrix_multiply': {'multiplications': 8, 'additions': 4},
+    'fib_double': {'multiplications': 3, 'additions': 3},
+    'fib_increment': {'additions': 1},
+    'copy_above': {'reads': 1, 'writes': 1},
+    'compare_options': {'comparisons': 1, 'reads': 2, 'writes': 1},
+    'dp_row': {'rows': 1},
+    'knapsack_split': {'splits': 1},
+    'take_item': {'reads': 1},
+}
+
+# Steps whose cost depends on their payload: field -> counter charged per element
+SIZED_ACTIONS = {
+    'update_range': ('values', 'writes'),
+    'pivot_candidates': ('indices', 'reads'),
+    'recolor': ('colors', 'recolors'),
+    'load_tree': ('nodes', 'writes'),
+}
+
+
+def _action_key(step):
+    """The tally key of a step dict: its action, paired with its size for SIZED_ACTIONS."""
+    action = step['action']
+    if action in SIZED_ACTIONS:
+        return action, len(step[SIZED_ACTIONS[action][0]])
+    return action
+
+
+def count_operations(steps):
+    """
+    Consumes a step generator without keeping any step, returning the operation
+    counters, the per-action tally, the step count and the wall time. Generators
+    that take `record=False` skip building the steps altogether and yield what
+    would be tallied instead: the bare action name, or (action, size) for
+    SIZED_ACTIONS. Those are counted as they come, in C, by Counter.
+    """
+    start = time.perf_counter()
+    steps = iter(steps)
+    first = next(steps, None)
+    if first is None:
+        tally = Counter()
+    elif isinstance(first, dict):
+        tally = Counter(map(_action_key, chain((first,), steps)))
+    else:
+        tally = Counter(steps)
+        tally[first] += 1
+    wall_time = time.perf_counter() - start
+
+    actions = Counter()
+    counters = Counter()
+    for key, times in tally.items():
+        if isinstance(key, tuple):
+            key, size = key
+            counters[SIZED_ACTIONS[key][1]] += size * times
+        actions[key] += times
+    for action, times in actions.items():
+        for counter, amount in ACTION_COUNTERS.get(action, {}).items():
+            counters[counter] += amount * times
+    return {
+        'counters': dict(counters),
+        'actions': dict(actions),
+        'steps': sum(actions.values()),
+        'wall_time_ms': wall_time * 1000,
+    }
@@ -1,19 +1,28 @@
 # algorithms/other_algorithms.py
 
+from operator import add
+
+from algorithms.snapshots import DictSnapshots
+
 # =================================================================
 # DYNAMIC PROGRAMMING ALGORITHMS
 # =================================================================
 
+# Memo snapshots are delta-encoded, so the trace grows linearly with n; the cap
+# keeps every result exactly representable as a JavaScript number.
+FIB_DP_MAX_N = 78
+
 def fib_dp_steps(n):
     """
     Generates steps to visualize Fibonacci calculation using memoization (Dynamic Programming).
     This visualization focuses on the recursion tree and the memoization table.
     """
-    if n > 12: # Limit input to prevent extremely long animations
-        return [{'action': 'error', 'message': 'Input is too large for animation. Please choose a number <= 12.'}]
+    if n > FIB_DP_MAX_N: # Limit input to prevent extremely long animations
+        yield {'action': 'error', 'message_id': 'fib.too_large', 'message_args': (FIB_DP_MAX_N,)}
+        return
 
-    steps = []
     memo = {}
+    memo_snapshots = DictSnapshots('memo_state')
     call_id_counter = 0
 
     def _fib_recursive(num, parent_id):
@@ -21,44 +30,186 @@ def fib_dp_steps(n):
         current_id = call_id_counter
         call_id_counter += 1
 
-        steps.append({'action': 'call', 'id': current_id, 'parent_id': parent_id, 'n': num, 'message': f'Calling fib({num}).'})
-        steps.append({'action': 'check_memo', 'id': current_id, 'n': num, 'memo_state': dict(memo), 'message': f'Is fib({num}) in memo table?'})
+        yield {'action': 'call', 'id': current_id, 'parent_id': parent_id, 'n': num, 'message_id': 'fib.call', 'message_args': (num,)}
+        yield {'action': 'check_memo', 'id': current_id, 'n': num, **memo_snapshots.record(memo), 'message_id': 'fib.check_memo', 'message_args': (num,)}
         
         if num in memo:
-            steps.append({'action': 'memo_hit', 'id': current_id, 'n': num, 'value': memo[num], 'message': f'Yes! fib({num}) = {memo[num]}. Returning stored value.'})
+            yield {'action': 'memo_hit', 'id': current_id, 'n': num, 'value': memo[num], 'message_id': 'fib.memo_hit', 'message_args': (num, memo[num])}
             return memo[num]
         
         if num <= 1:
-            steps.append({'action': 'base_case', 'id': current_id, 'n': num, 'value': num, 'message': f'Base case reached. fib({num}) = {num}.'})
+            yield {'action': 'base_case', 'id': current_id, 'n': num, 'value': num, 'message_id': 'fib.base_case', 'message_args': (num,)}
             memo[num] = num
-            steps.append({'action': 'store_memo', 'id': current_id, 'n': num, 'value': num, 'memo_state': dict(memo), 'message': f'Storing result fib({num}) = {num} in memo.'})
+            yield {'action': 'store_memo', 'id': current_id, 'n': num, 'value': num, **memo_snapshots.record(memo, changed=(num,)), 'message_id': 'fib.store_memo', 'message_args': (num, num)}
             return num
 
-        res1 = _fib_recursive(num - 1, current_id)
-        res2 = _fib_recursive(num - 2, current_id)
+        res1 = yield from _fib_recursive(num - 1, current_id)
+        res2 = yield from _fib_recursive(num - 2, current_id)
         result = res1 + res2
         
-        steps.append({'action': 'calculate', 'id': current_id, 'n': num, 'val1': res1, 'val2': res2, 'result': result, 'message': f'Calculating fib({num}) = {res1} + {res2} = {result}.'})
+        yield {'action': 'calculate', 'id': current_id, 'n': num, 'val1': res1, 'val2': res2, 'result': result, 'message_id': 'fib.calculate', 'message_args': (num, res1, res2, result)}
         memo[num] = result
-        steps.append({'action': 'store_memo', 'id': current_id, 'n': num, 'value': result, 'memo_state': dict(memo), 'message': f'Storing result fib({num}) = {result} in memo.'})
+        yield {'action': 'store_memo', 'id': current_id, 'n': num, 'value': result, **memo_snapshots.record(memo, changed=(num,)), 'message_id': 'fib.store_memo', 'message_args': (num, result)}
         return result
 
-    final_result = _fib_recursive(n, parent_id=None)
-    steps.append({'action': 'complete', 'result': final_result, 'message': f'Final result for fib({n}) is {final_result}.'})
-    return steps
+    final_result = yield from _fib_recursive(n, parent_id=None)
+    yield {'action': 'complete', 'result': final_result, 'message_id': 'fib.complete', 'message_args': (n, final_result)}
+
+# The O(n) and O(log n) engines below keep no memo table, so they only stop
+# where Python refuses to print the result (sys.get_int_max_str_digits(), 4300
+# digits by default; fib(20000) has 4180).
+FIB_BIG_MAX_N = 20_000
+# Largest integer a JavaScript number holds exactly
+JS_MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+def _fib_value(value):
+    """A Fibonacci value for a step: the number itself while JavaScript can hold it, else just its size."""
+    if value <= JS_MAX_SAFE_INTEGER:
+        return {'value': value}
+    return {'bits': value.bit_length()}
+
+def _fib_shown(value):
+    """The same, as text for a message argument."""
+    return value if value <= JS_MAX_SAFE_INTEGER else f'a {value.bit_length()}-bit number'
+
+def _fib_checked(n):
+    """The error step for an n the big-number engines refuse, or None."""
+    if n < 0:
+        return {'action': 'error', 'message_id': 'fib.negative'}
+    if n > FIB_BIG_MAX_N:
+        return {'action': 'error', 'message_id': 'fib.too_large', 'message_args': (FIB_BIG_MAX_N,)}
+    return None
+
+def _fib_complete(n, result):
+    # The full result travels once, as a string when JavaScript could not hold it exactly
+    return {'action': 'complete', 'n': n, 'result': result if result <= JS_MAX_SAFE_INTEGER else str(result),
+            'message_id': 'fib.complete', 'message_args': (n, _fib_shown(result))}
+
+def fib_tabulation_steps(n):
+    """
+    Generates steps for bottom-up Fibonacci: fib(i) = fib(i-1) + fib(i-2) for
+    i = 2..n, keeping only the last two values. O(n) additions, O(1) values held.
+    """
+    error = _fib_checked(n)
+    if error:
+        yield error
+        return
+    previous, current = 0, 1
+    yield {'action': 'fib_window', 'i': 1, 'message_id': 'fib.window', 'message_args': (0, 1)}
+    for i in range(2, n + 1):
+        previous, current = current, previous + current
+        yield {'action': 'fib_add', 'i': i, **_fib_value(current), 'message_id': 'fib.add', 'message_args': (i, _fib_shown(current))}
+    yield _fib_complete(n, current if n else 0)
+
+def _mat_mult(x, y):
+    """Product of two 2x2 matrices given as (a, b, c, d) row-major tuples."""
+    a, b, c, d = x
+    e, f, g, h = y
+    return (a * e + b * g, a * f + b * h, c * e + d * g, c * f + d * h)
+
+def fib_matrix_steps(n):
+    """
+    Generates steps for Fibonacci by matrix power: [[1, 1], [1, 0]]^n holds
+    fib(n) off the diagonal. The power is built from the bits of n, high to low:
+    square for every bit, multiply by the base matrix for every 1 bit. O(log n)
+    matrix products.
+    """
+    error = _fib_checked(n)
+    if error:
+        yield error
+        return
+    base = (1, 1, 1, 0)
+    power, result = 0, (1, 0, 0, 1)
+    for position, bit in enumerate(bin(n)[2:]):
+        if power:
+            result = _mat_mult(result, result)
+            power *= 2
+            yield {'action': 'matrix_square', 'bit': position, 'power': power, **_fib_value(result[1]), 'message_id': 'fib.matrix_square', 'message_args': (power, _fib_shown(result[1]))}
+        if bit == '1':
+            result = _mat_mult(result, base)
+            power += 1
+            yield {'action': 'matrix_multiply', 'bit': position, 'power': power, **_fib_value(result[1]), 'message_id': 'fib.matrix_multiply', 'message_args': (power, _fib_shown(result[1]))}
+    yield _fib_complete(n, result[1])
+
+def fib_fast_doubling_steps(n):
+    """
+    Generates steps for Fibonacci by fast doubling. From (fib(k), fib(k+1)):
+        fib(2k)   = fib(k) * (2 fib(k+1) - fib(k))
+        fib(2k+1) = fib(k)^2 + fib(k+1)^2
+    Walking the bits of n from the top doubles k for every bit and adds one for
+    every 1 bit: O(log n) steps of three multiplications each.
+    """
+    error = _fib_checked(n)
+    if error:
+        yield error
+        return
+    k, a, b = 0, 0, 1
+    for position, bit in enumerate(bin(n)[2:]):
+        if k:
+            a, b = a * (2 * b - a), a * a + b * b
+            k *= 2
+            yield {'action': 'fib_double', 'bit': position, 'k': k, **_fib_value(a), 'message_id': 'fib.double', 'message_args': (k, _fib_shown(a))}
+        if bit == '1':
+            a, b = b, a + b
+            k += 1
+            yield {'action': 'fib_increment', 'bit': position, 'k': k, **_fib_value(a), 'message_id': 'fib.increment', 'message_args': (k, _fib_shown(a))}
+    yield _fib_complete(n, a)
+
+# 0/1 knapsack. 'table' keeps the whole (n+1) x (capacity+1) table and shows
+# every cell, so it is refused past KNAPSACK_TABLE_MAX_CELLS; 'rolling' and
+# 'hirschberg' hold O(capacity) values and report one step per item row.
+KNAPSACK_MODES = ('rolling', 'hirschberg', 'table')
+KNAPSACK_TABLE_MAX_CELLS = 2_500
+KNAPSACK_MAX_CAPACITY = 100_000
+KNAPSACK_MAX_ITEMS = 10_000
+# Row steps carry the row itself (for the table view) only up to this capacity
+KNAPSACK_ROW_VALUES_MAX = 64
+
+def validate_knapsack(capacity, items):
+    """Raises ValueError unless `capacity` and `items` ([{'weight': w, 'value': v}]) form a knapsack instance."""
+    if type(capacity) is not int or not 0 <= capacity <= KNAPSACK_MAX_CAPACITY:
+        raise ValueError(f'Knapsack capacity must be an integer between 0 and {KNAPSACK_MAX_CAPACITY}.')
+    if not isinstance(items, list):
+        raise ValueError("Knapsack 'items' must be a list of {'weight', 'value'} objects.")
+    if len(items) > KNAPSACK_MAX_ITEMS:
+        raise ValueError(f'A knapsack instance has at most {KNAPSACK_MAX_ITEMS} items.')
+    for item in items:
+        if not isinstance(item, dict) or type(item.get('weight')) is not int or item['weight'] < 1:
+            raise ValueError('Every knapsack item needs a positive integer weight.')
+        if type(item.get('value')) not in (int, float) or item['value'] < 0:
+            raise ValueError('Every knapsack item needs a non-negative value.')
+
+def _knapsack_update(row, weight, value):
+    """
+    Adds one item to a DP row in place: row[w] = max(row[w], row[w - weight] + value).
+    The new values are all built from the old row before the slice is assigned,
+    which is what the usual descending-w loop achieves, in a single comprehension.
+    """
+    if weight < len(row):
+        row[weight:] = [kept if kept > taken + value else taken + value for kept, taken in zip(row[weight:], row)]
 
-def knapsack_01_steps(capacity, items):
+def _knapsack_row(weights, values, lo, hi, capacity):
     """
-    Generates steps for the 0/1 Knapsack problem using Dynamic Programming.
-    `items` is a list of dicts: [{'weight': w, 'value': v}]
+    Best value for every capacity 0..capacity using items lo..hi-1, in O(capacity)
+    memory; returned once a step per item has been yielded, which is also what
+    lets a deadline interrupt a long pass.
     """
-    weights = [item['weight'] for item in items]
-    values = [item['value'] for item in items]
-    steps = []
+    row = [0] * (capacity + 1)
+    for i in range(lo, hi):
+        _knapsack_update(row, weights[i], values[i])
+        yield {'action': 'dp_row', 'row': i + 1, 'range': (lo, hi), 'best': row[capacity], 'message_id': 'knapsack.pass_row', 'message_args': (i + 1, lo + 1, hi, capacity, row[capacity])}
+    return row
+
+def _knapsack_table(capacity, weights, values):
+    """The full table with a step per cell, then a traceback of the chosen items."""
     n = len(weights)
+    cells = (n + 1) * (capacity + 1)
+    if cells > KNAPSACK_TABLE_MAX_CELLS:
+        yield {'action': 'error', 'message_id': 'knapsack.table_too_large', 'message_args': (cells, KNAPSACK_TABLE_MAX_CELLS)}
+        return
     dp = [[0 for _ in range(capacity + 1)] for _ in range(n + 1)]
 
-    steps.append({'action': 'init_table', 'rows': n + 1, 'cols': capacity + 1, 'weights': weights, 'values': values, 'message': 'Initializing DP table for Knapsack problem.'})
+    yield {'action': 'init_table', 'rows': n + 1, 'cols': capacity + 1, 'weights': weights, 'values': values, 'message_id': 'knapsack.init'}
 
     for i in range(1, n + 1):
         for w in range(1, capacity + 1):
@@ -66,21 +217,89 @@ def knapsack_01_steps(capacity, items):
             item_weight = weights[item_index]
             item_value = values[item_index]
 
-            steps.append({'action': 'highlight_cell', 'cell': (i, w), 'message': f'Calculating value for item {i} (w:{item_weight}, v:{item_value}) at capacity {w}.'})
+            yield {'action': 'highlight_cell', 'cell': (i, w), 'message_id': 'knapsack.highlight', 'message_args': (i, item_weight, item_value, w)}
 
             if item_weight > w:
                 dp[i][w] = dp[i-1][w]
-                steps.append({'action': 'copy_above', 'from_cell': (i-1, w), 'to_cell': (i, w), 'value': dp[i][w], 'message': f'Item {i} is too heavy. Value is same as above: {dp[i][w]}.'})
+                yield {'action': 'copy_above', 'from_cell': (i-1, w), 'to_cell': (i, w), 'value': dp[i][w], 'message_id': 'knapsack.too_heavy', 'message_args': (i, dp[i][w])}
             else:
                 value_without_item = dp[i-1][w]
                 value_with_item = item_value + dp[i-1][w - item_weight]
                 dp[i][w] = max(value_with_item, value_without_item)
                 
-                steps.append({'action': 'compare_options', 'cell': (i, w), 'option_without': {'cell': (i-1, w), 'value': value_without_item}, 'option_with': {'cell': (i-1, w - item_weight), 'value': value_with_item, 'item_value': item_value}, 'result': dp[i][w], 'message': f'Choose max between excluding ({value_without_item}) and including ({value_with_item}). Max is {dp[i][w]}.'})
-
-    final_value = dp[n][capacity]
-    steps.append({'action': 'complete', 'result': final_value, 'final_cell': (n, capacity), 'message': f'Knapsack calculation complete. Maximum value is {final_value}.'})
-    return steps
+                yield {'action': 'compare_options', 'cell': (i, w), 'option_without': {'cell': (i-1, w), 'value': value_without_item}, 'option_with': {'cell': (i-1, w - item_weight), 'value': value_with_item, 'item_value': item_value}, 'result': dp[i][w], 'message_id': 'knapsack.compare', 'message_args': (value_without_item, value_with_item, dp[i][w])}
+
+    # Step: Walk back up the table; a row that changed the value took its item
+    chosen, w = [], capacity
+    for i in range(n, 0, -1):
+        if dp[i][w] != dp[i-1][w]:
+            chosen.append(i - 1)
+            yield {'action': 'take_item', 'item': i - 1, 'cell': (i, w), 'weight': weights[i - 1], 'value': values[i - 1], 'message_id': 'knapsack.take', 'message_args': (i, weights[i - 1], values[i - 1])}
+            w -= weights[i - 1]
+    yield _knapsack_complete(dp[n][capacity], sorted(chosen), weights, final_cell=(n, capacity))
+
+def _knapsack_rolling(capacity, weights, values):
+    """One DP row, updated in place per item: the optimal value in O(capacity) memory, one step per row."""
+    row = [0] * (capacity + 1)
+    shown = capacity <= KNAPSACK_ROW_VALUES_MAX
+    if shown:
+        yield {'action': 'init_table', 'rows': len(weights) + 1, 'cols': capacity + 1, 'weights': weights, 'values': values, 'message_id': 'knapsack.init'}
+    for i, (weight, value) in enumerate(zip(weights, values), 1):
+        _knapsack_update(row, weight, value)
+        step = {'action': 'dp_row', 'row': i, 'best': row[capacity], 'message_id': 'knapsack.row', 'message_args': (i, weight, value, row[capacity])}
+        if shown:
+            step['values'] = list(row)
+        yield step
+    yield {'action': 'complete', 'result': row[capacity], 'message_id': 'knapsack.complete', 'message_args': (row[capacity],)}
+
+def _knapsack_hirschberg(capacity, weights, values):
+    """
+    Recovers the chosen items without a table. Items lo..hi-1 with capacity c
+    are split in half; one row over the first half (f) and one over the second
+    (g) give the best way to share c between them, c1 = argmax f[c1] + g[c - c1],
+    and each half is solved again with its share. Every level of the recursion
+    does at most n * capacity work, and the capacities it hands down sum to c,
+    so the whole run is O(n * capacity) time in O(capacity) memory.
+    """
+    chosen = []
+    stack = [(0, len(weights), capacity)]
+    while stack:
+        lo, hi, c = stack.pop()
+        if hi - lo == 1:
+            if weights[lo] <= c and values[lo] > 0:
+                chosen.append(lo)
+                yield {'action': 'take_item', 'item': lo, 'weight': weights[lo], 'value': values[lo], 'message_id': 'knapsack.take', 'message_args': (lo + 1, weights[lo], values[lo])}
+            continue
+        if hi - lo < 1 or c == 0:
+            continue
+        mid = (lo + hi) // 2
+        first = yield from _knapsack_row(weights, values, lo, mid, c)
+        second = yield from _knapsack_row(weights, values, mid, hi, c)
+        totals = list(map(add, first, reversed(second)))
+        best = max(totals)
+        left = totals.index(best)
+        yield {'action': 'knapsack_split', 'range': (lo, hi), 'split': mid, 'capacity': c, 'left_capacity': left, 'best': best, 'message_id': 'knapsack.split', 'message_args': (lo + 1, hi, c, left, mid, c - left, best)}
+        # Right half pushed first, so items are taken in index order
+        stack.append((mid, hi, c - left))
+        stack.append((lo, mid, left))
+    yield _knapsack_complete(sum(values[i] for i in chosen), chosen, weights)
+
+def _knapsack_complete(result, chosen, weights, **fields):
+    return {'action': 'complete', 'result': result, 'items': chosen, 'weight': sum(weights[i] for i in chosen), **fields,
+            'message_id': 'knapsack.complete_items', 'message_args': (result, len(chosen), sum(weights[i] for i in chosen))}
+
+def knapsack_01_steps(capacity, items, mode='rolling'):
+    """
+    Generates steps for the 0/1 Knapsack problem using Dynamic Programming.
+    `items` is a list of dicts: [{'weight': w, 'value': v}]. See KNAPSACK_MODES.
+    """
+    weights = [item['weight'] for item in items]
+    values = [item['value'] for item in items]
+    if mode == 'table':
+        return _knapsack_table(capacity, weights, values)
+    if mode == 'hirschberg':
+        return _knapsack_hirschberg(capacity, weights, values)
+    return _knapsack_rolling(capacity, weights, values)
 
 
 # =================================================================
@@ -92,83 +311,110 @@ def fractional_knapsack_steps(capacity, items):
     Generates steps for the Fractional Knapsack problem using a Greedy approach.
     `items` is a list of dicts: [{'weight': w, 'value': v, 'id': i}]
     """
-    steps = []
     
     # Step 1: Calculate value-to-weight ratio for each item
     for item in items:
         item['ratio'] = item['value'] / item['weight']
-    steps.append({'action': 'calculate_ratios', 'items': list(items), 'message': 'Calculated value-to-weight ratio for each item.'})
+    yield {'action': 'calculate_ratios', 'items': list(items), 'message_id': 'greedy.ratios'}
     
     # Step 2: Sort items by ratio in descending order
     items.sort(key=lambda x: x['ratio'], reverse=True)
-    steps.append({'action': 'sort_items', 'items': list(items), 'message': 'Sorted items by ratio in descending order.'})
+    yield {'action': 'sort_items', 'items': list(items), 'message_id': 'greedy.sorted'}
     
     total_value = 0
     current_capacity = capacity
     
     for item in items:
-        steps.append({'action': 'select_item', 'item_id': item['id'], 'message': f"Considering item {item['id']} (w:{item['weight']}, v:{item['value']})"})
+        yield {'action': 'select_item', 'item_id': item['id'], 'message_id': 'greedy.consider', 'message_args': (item['id'], item['weight'], item['value'])}
         
         if current_capacity == 0:
-            steps.append({'action': 'knapsack_full', 'item_id': item['id'], 'message': 'Knapsack is full. Cannot add more items.'})
+            yield {'action': 'knapsack_full', 'item_id': item['id'], 'message_id': 'greedy.full'}
             break
             
         if item['weight'] <= current_capacity:
             # Take the whole item
             current_capacity -= item['weight']
             total_value += item['value']
-            steps.append({'action': 'take_whole', 'item_id': item['id'], 'capacity_left': current_capacity, 'total_value': total_value, 'message': f"Took all of item {item['id']}. Capacity left: {current_capacity:.2f}."})
+            yield {'action': 'take_whole', 'item_id': item['id'], 'capacity_left': current_capacity, 'total_value': total_value, 'message_id': 'greedy.take_whole', 'message_args': (item['id'], format(current_capacity, '.2f'))}
         else:
             # Take a fraction of the item
             fraction = current_capacity / item['weight']
             value_taken = item['value'] * fraction
             total_value += value_taken
             current_capacity = 0
-            steps.append({'action': 'take_fraction', 'item_id': item['id'], 'fraction': fraction, 'capacity_left': 0, 'total_value': total_value, 'message': f"Took {fraction*100:.1f}% of item {item['id']}. Knapsack is now full."})
+            yield {'action': 'take_fraction', 'item_id': item['id'], 'fraction': fraction, 'capacity_left': 0, 'total_value': total_value, 'message_id': 'greedy.take_fraction', 'message_args': (format(fraction * 100, '.1f'), item['id'])}
 
-    steps.append({'action': 'complete', 'result': total_value, 'message': f'Greedy knapsack complete. Total value is {total_value:.2f}.'})
-    return steps
+    yield {'action': 'complete', 'result': total_value, 'message_id': 'greedy.complete', 'message_args': (format(total_value, '.2f'),)}
 
 
 # =================================================================
 # RECURSIVE ALGORITHMS
 # =================================================================
 
+# The optimal solution is fixed by the binary digits of the move number, so any
+# move, and the position after any move, is computed directly in O(n) instead of
+# replaying the moves before it. Move numbers stay exact in JavaScript up to 53
+# disks; a full trace is only built for small puzzles.
+HANOI_PEGS = ('A', 'B', 'C')
+HANOI_MAX_DISKS = 53
+HANOI_TRACE_MAX_DISKS = 10
+
+def _hanoi_direction(n_disks, disk):
+    """Every disk cycles through the pegs in one direction: A->B->C when n - disk is odd, A->C->B when even."""
+    return 1 if (n_disks - disk) % 2 else 2
+
+def hanoi_move(n_disks, k):
+    """(disk, from_peg, to_peg) of move k (1-based) of the n-disk solution from A to C."""
+    # Disk d moves on the odd multiples of 2^(d-1); this is its (k >> d)-th move
+    disk = (k & -k).bit_length()
+    done = k >> disk
+    direction = _hanoi_direction(n_disks, disk)
+    return disk, HANOI_PEGS[direction * done % 3], HANOI_PEGS[direction * (done + 1) % 3]
+
+def hanoi_state(n_disks, k):
+    """The towers after k moves, each a list of disks from the bottom up."""
+    towers = {peg: [] for peg in HANOI_PEGS}
+    for disk in range(n_disks, 0, -1):
+        moves = (k + (1 << (disk - 1))) >> disk
+        towers[HANOI_PEGS[_hanoi_direction(n_disks, disk) * moves % 3]].append(disk)
+    return towers
+
+def hanoi_window_steps(n_disks, start=0, count=None):
+    """
+    Generates the steps for moves start+1..start+count (all remaining moves if
+    count is None) of the n-disk Tower of Hanoi. The first step sets up the
+    towers as they stand after move `start`; only that window is ever held.
+    """
+    total = (1 << n_disks) - 1
+    stop = total if count is None else min(total, start + count)
+    towers = hanoi_state(n_disks, start)
+    tower_snapshots = DictSnapshots('towers_state', encode=list, measure=len)
+
+    yield {'action': 'set_towers', 'move': start, 'total_moves': total, **tower_snapshots.record(towers), 'message_id': 'hanoi.position', 'message_args': (start, total)}
+    for k in range(start + 1, stop + 1):
+        disk, source, target = hanoi_move(n_disks, k)
+        towers[target].append(towers[source].pop())
+        yield {
+            'action': 'move_disk',
+            'move': k,
+            'disk_id': disk,
+            'from_peg': source,
+            'to_peg': target,
+            **tower_snapshots.record(towers, changed=(source, target)), # Only the two pegs that changed
+            'message_id': 'hanoi.move',
+            'message_args': (k, disk, source, target)
+        }
+    if stop == total:
+        yield {'action': 'complete', 'message_id': 'hanoi.complete', 'message_args': (n_disks, total)}
+
 def hanoi_steps(n_disks):
     """
     Generates steps for solving the Tower of Hanoi puzzle.
     """
-    if n_disks > 6: # Limit for animation sanity
-        return [{'action': 'error', 'message': 'Too many disks for animation. Please choose 6 or fewer.'}]
-        
-    steps = []
-    # Initial state of the towers
-    towers = {'A': list(range(n_disks, 0, -1)), 'B': [], 'C': []}
-
-    def _hanoi_recursive(n, source, target, auxiliary):
-        if n > 0:
-            # Move n-1 disks from source to auxiliary
-            _hanoi_recursive(n - 1, source, auxiliary, target)
-            
-            # Move the nth disk from source to target
-            disk_to_move = towers[source].pop()
-            towers[target].append(disk_to_move)
-            
-            steps.append({
-                'action': 'move_disk',
-                'disk_id': disk_to_move,
-                'from_peg': source,
-                'to_peg': target,
-                'towers_state': {k: list(v) for k, v in towers.items()}, # Deep copy
-                'message': f'Move disk {disk_to_move} from {source} to {target}.'
-            })
-            
-            # Move the n-1 disks from auxiliary to target
-            _hanoi_recursive(n - 1, auxiliary, target, source)
-
-    _hanoi_recursive(n_disks, 'A', 'C', 'B')
-    steps.append({'action': 'complete', 'message': 'Tower of Hanoi puzzle solved!'})
-    return steps
+    if not 0 <= n_disks <= HANOI_TRACE_MAX_DISKS: # Limit for animation sanity
+        yield {'action': 'error', 'message_id': 'hanoi.too_many', 'message_args': (HANOI_TRACE_MAX_DISKS,)}
+        return
+    yield from hanoi_window_steps(n_disks)
 
 
 # =================================================================
@@ -179,38 +425,35 @@ def bitwise_swap_steps(a, b):
     """
     Generates steps to visualize swapping two numbers using XOR.
     """
-    steps = []
     
     # Helper to format binary strings to a consistent length
     def bin_format(n):
         return format(n, '08b')
 
-    steps.append({'action': 'initial_state', 'a': a, 'b': b, 'bin_a': bin_format(a), 'bin_b': bin_format(b), 'message': 'Initial values.'})
+    yield {'action': 'initial_state', 'a': a, 'b': b, 'bin_a': bin_format(a), 'bin_b': bin_format(b), 'message_id': 'bitwise.initial'}
     
     # Step 1: a = a ^ b
     result1 = a ^ b
-    steps.append({'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'a', 'result_val': result1, 'result_bin': bin_format(result1), 'message': f'Step 1: a = a XOR b ({a} ^ {b}) = {result1}'})
+    yield {'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'a', 'result_val': result1, 'result_bin': bin_format(result1), 'message_id': 'bitwise.xor', 'message_args': (1, 'a', a, b, result1)}
     a = result1
     
     # Step 2: b = a ^ b
     result2 = a ^ b
-    steps.append({'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'b', 'result_val': result2, 'result_bin': bin_format(result2), 'message': f'Step 2: b = a XOR b ({a} ^ {b}) = {result2}'})
+    yield {'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'b', 'result_val': result2, 'result_bin': bin_format(result2), 'message_id': 'bitwise.xor', 'message_args': (2, 'b', a, b, result2)}
     b = result2
 
     # Step 3: a = a ^ b
     result3 = a ^ b
-    steps.append({'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'a', 'result_val': result3, 'result_bin': bin_format(result3), 'message': f'Step 3: a = a XOR b ({a} ^ {b}) = {result3}'})
+    yield {'action': 'xor_operation', 'var1': 'a', 'val1': a, 'bin1': bin_format(a), 'var2': 'b', 'val2': b, 'bin2': bin_format(b), 'result_var': 'a', 'result_val': result3, 'result_bin': bin_format(result3), 'message_id': 'bitwise.xor', 'message_args': (3, 'a', a, b, result3)}
     a = result3
 
-    steps.append({'action': 'final_state', 'a': a, 'b': b, 'bin_a': bin_format(a), 'bin_b': bin_format(b), 'message': 'Swap complete. Final values.'})
-    return steps
+    yield {'action': 'final_state', 'a': a, 'b': b, 'bin_a': bin_format(a), 'bin_b': bin_format(b), 'message_id': 'bitwise.swapped'}
 
 
 def count_set_bits_steps(n):
     """
     Generates steps to visualize counting set bits (1s) in a number's binary representation.
     """
-    steps = []
     
     def bin_format(num):
         return format(num, '08b')
@@ -218,21 +461,20 @@ def count_set_bits_steps(n):
     count = 0
     current_n = n
 
-    steps.append({'action': 'initial_state', 'n': n, 'bin_n': bin_format(n), 'count': count, 'message': f'Counting set bits for {n}.'})
+    yield {'action': 'initial_state', 'n': n, 'bin_n': bin_format(n), 'count': count, 'message_id': 'bitwise.count_start', 'message_args': (n,)}
 
     while current_n > 0:
         # Check the last bit
         last_bit = current_n & 1
-        steps.append({'action': 'check_last_bit', 'n': current_n, 'bin_n': bin_format(current_n), 'last_bit': last_bit, 'message': f'Checking the last bit of {current_n}. It is {last_bit}.'})
+        yield {'action': 'check_last_bit', 'n': current_n, 'bin_n': bin_format(current_n), 'last_bit': last_bit, 'message_id': 'bitwise.last_bit', 'message_args': (current_n, last_bit)}
         
         if last_bit == 1:
             count += 1
-            steps.append({'action': 'increment_count', 'count': count, 'message': 'Bit is 1. Incrementing count.'})
+            yield {'action': 'increment_count', 'count': count, 'message_id': 'bitwise.increment'}
 
         # Right shift
         shifted_n = current_n >> 1
-        steps.append({'action': 'right_shift', 'n_before': current_n, 'bin_before': bin_format(current_n), 'n_after': shifted_n, 'bin_after': bin_format(shifted_n), 'message': f'Right-shifting {current_n} to get {shifted_n}.'})
+        yield {'action': 'right_shift', 'n_before': current_n, 'bin_before': bin_format(current_n), 'n_after': shifted_n, 'bin_after': bin_format(shifted_n), 'message_id': 'bitwise.shift', 'message_args': (current_n, shifted_n)}
         current_n = shifted_n
 
-    steps.append({'action': 'complete', 'result': count, 'n': n, 'message': f'Finished. The number of set bits in {n} is {count}.'})
-    return steps
\ No newline at end of file
+    yield {'action': 'complete', 'result': count, 'n': n, 'message_id': 'bitwise.count_complete', 'message_args': (n, count)}
@@ -1,50 +1,59 @@
 # algorithms/searching.py
 
 import math
+from bisect import bisect_left
+
+from algorithms.instrument import ACTION_COUNTERS
+
+def is_sorted_array(data):
+    """True if `data` is in non-decreasing order; the O(n) check the sorted-input searches start with."""
+    return all(data[i] <= data[i+1] for i in range(len(data)-1))
 
 def linear_search(data, target):
     """
     Generates animation steps for Linear Search.
     Iterates through each element one by one.
     """
-    steps = []
     for i, value in enumerate(data):
         # Step: Highlight the element being compared
-        steps.append({
+        yield {
             'action': 'compare',
             'indices': [i],
-            'message': f'Comparing target ({target}) with array[{i}] which is {value}.'
-        })
+            'message_id': 'search.compare',
+            'message_args': (target, i, value)
+        }
         if value == target:
             # Step: Highlight the found element and terminate
-            steps.append({
+            yield {
                 'action': 'found',
                 'indices': [i],
-                'message': f'Target {target} found at index {i}!'
-            })
-            return steps # Exit early once found
+                'message_id': 'search.found',
+                'message_args': (target, i)
+            }
+            return # Exit early once found
 
     # Step: If the loop completes, the target was not found
-    steps.append({
+    yield {
         'action': 'not_found',
-        'message': f'Target {target} not found in the array.'
-    })
-    return steps
+        'message_id': 'search.not_found',
+        'message_args': (target,)
+    }
 
-def binary_search(data, target):
+def binary_search(data, target, is_sorted=None):
     """
     Generates animation steps for Binary Search.
-    Requires the input array to be sorted.
+    Requires the input array to be sorted. A caller that already knows whether
+    it is (a registered dataset) passes `is_sorted` to skip the check.
     """
-    steps = []
     
     # Pre-computation check: Ensure the array is sorted before starting
-    if not all(data[i] <= data[i+1] for i in range(len(data)-1)):
-        steps.append({
+    if not (is_sorted_array(data) if is_sorted is None else is_sorted):
+        yield {
             'action': 'error',
-            'message': 'Error: Binary Search requires a sorted array!'
-        })
-        return steps
+            'message_id': 'search.unsorted',
+            'message_args': ('Binary Search',)
+        }
+        return
 
     low, high = 0, len(data) - 1
     
@@ -52,116 +61,201 @@ def binary_search(data, target):
         mid = (low + high) // 2
         
         # Step: Show the current search boundaries (low, high) and the middle point
-        steps.append({
+        yield {
             'action': 'highlight_pointers',
             'pointers': {'low': low, 'high': high, 'mid': mid},
-            'message': f'Searching in range [{low}, {high}]. Middle is at index {mid}.'
-        })
+            'message_id': 'binary.range',
+            'message_args': (low, high, mid)
+        }
         
         # Step: Compare the target with the middle element
-        steps.append({
+        yield {
             'action': 'compare',
             'indices': [mid],
-            'message': f'Comparing target ({target}) with array[{mid}] which is {data[mid]}.'
-        })
+            'message_id': 'search.compare',
+            'message_args': (target, mid, data[mid])
+        }
         
         if data[mid] == target:
             # Step: Target found
-            steps.append({
+            yield {
                 'action': 'found',
                 'indices': [mid],
-                'message': f'Target {target} found at index {mid}!'
-            })
-            return steps
+                'message_id': 'search.found',
+                'message_args': (target, mid)
+            }
+            return
         elif data[mid] < target:
             # Step: Eliminate the left half
-            steps.append({
+            yield {
                 'action': 'eliminate',
                 'range': (low, mid),
-                'message': f'Target ({target}) > {data[mid]}. Discarding the left half.'
-            })
+                'message_id': 'binary.discard_left',
+                'message_args': (target, data[mid])
+            }
             low = mid + 1
         else:
             # Step: Eliminate the right half
-            steps.append({
+            yield {
                 'action': 'eliminate',
                 'range': (mid, high),
-                'message': f'Target ({target}) < {data[mid]}. Discarding the right half.'
-            })
+                'message_id': 'binary.discard_right',
+                'message_args': (target, data[mid])
+            }
             high = mid - 1
             
     # Step: If the loop finishes, the target was not found
-    steps.append({
+    yield {
         'action': 'not_found',
-        'message': f'Target {target} not found in the array.'
-    })
-    return steps
+        'message_id': 'search.not_found',
+        'message_args': (target,)
+    }
 
-def jump_search(data, target):
+def jump_search(data, target, is_sorted=None):
     """Generates animation steps for Jump Search."""
-    steps = []
     n = len(data)
     step = int(math.sqrt(n))
     prev = 0
 
-    if not all(data[i] <= data[i+1] for i in range(len(data)-1)):
-        steps.append({'action': 'error', 'message': 'Error: Jump Search requires a sorted array!'})
-        return steps
+    if not (is_sorted_array(data) if is_sorted is None else is_sorted):
+        yield {'action': 'error', 'message_id': 'search.unsorted', 'message_args': ('Jump Search',)}
+        return
 
-    steps.append({'action': 'message', 'message': f'Block size (step) is √{n} ≈ {step}.'})
+    yield {'action': 'message', 'message_id': 'jump.block_size', 'message_args': (n, step)}
 
     # Jumping ahead in blocks
     while data[min(step, n) - 1] < target:
-        steps.append({'action': 'compare_block', 'indices': list(range(prev, min(step, n))), 'message': f'Comparing target with end of block [{prev}...{min(step,n)-1}]. {data[min(step, n) - 1]} < {target}. Jumping.'})
+        yield {'action': 'compare_block', 'indices': list(range(prev, min(step, n))), 'message_id': 'jump.jump', 'message_args': (prev, min(step,n)-1, data[min(step, n) - 1], target)}
         prev = step
         step += int(math.sqrt(n))
         if prev >= n:
-            steps.append({'action': 'not_found', 'message': 'Target is larger than all elements.'})
-            return steps
+            yield {'action': 'not_found', 'message_id': 'jump.past_end'}
+            return
 
-    steps.append({'action': 'message', 'message': f'Target may be in block [{prev}...{min(step,n)-1}]. Starting linear search.'})
+    yield {'action': 'message', 'message_id': 'jump.scan_block', 'message_args': (prev, min(step,n)-1)}
 
     # Linear search within the identified block
     for i in range(prev, min(step, n)):
-        steps.append({'action': 'compare', 'indices': [i], 'message': f'Comparing target ({target}) with array[{i}] ({data[i]})'})
+        yield {'action': 'compare', 'indices': [i], 'message_id': 'search.compare_probe', 'message_args': (target, i, data[i])}
         if data[i] == target:
-            steps.append({'action': 'found', 'indices': [i], 'message': f'Target {target} found at index {i}!'})
-            return steps
+            yield {'action': 'found', 'indices': [i], 'message_id': 'search.found', 'message_args': (target, i)}
+            return
 
-    steps.append({'action': 'not_found', 'message': f'Target {target} not found in the array.'})
-    return steps
+    yield {'action': 'not_found', 'message_id': 'search.not_found', 'message_args': (target,)}
 
-def interpolation_search(data, target):
+def interpolation_search(data, target, is_sorted=None):
     """Generates animation steps for Interpolation Search."""
-    steps = []
     low, high = 0, len(data) - 1
 
-    if not all(data[i] <= data[i+1] for i in range(len(data)-1)):
-        steps.append({'action': 'error', 'message': 'Error: Interpolation Search requires a sorted array!'})
-        return steps
+    if not (is_sorted_array(data) if is_sorted is None else is_sorted):
+        yield {'action': 'error', 'message_id': 'search.unsorted', 'message_args': ('Interpolation Search',)}
+        return
 
     while low <= high and data[low] <= target <= data[high]:
         if low == high:
             if data[low] == target:
-                steps.append({'action': 'found', 'indices': [low], 'message': f'Target found at index {low}.'})
+                yield {'action': 'found', 'indices': [low], 'message_id': 'interpolation.found', 'message_args': (low,)}
             else:
-                steps.append({'action': 'not_found', 'message': 'Target not found.'})
-            return steps
+                yield {'action': 'not_found', 'message_id': 'interpolation.not_found'}
+            return
+        if data[low] == data[high]:
+            # A flat range: the formula would divide by zero, and the bounds above make every value in it the target
+            yield {'action': 'compare', 'indices': [low], 'message_id': 'search.compare_probe', 'message_args': (target, low, data[low])}
+            yield {'action': 'found', 'indices': [low], 'message_id': 'search.found', 'message_args': (target, low)}
+            return
 
         # Probing the position with interpolation formula
         pos = low + int(((float(high - low) / (data[high] - data[low])) * (target - data[low])))
-        steps.append({'action': 'probe', 'index': pos, 'message': f'Probing position {pos} based on data distribution.'})
-        steps.append({'action': 'compare', 'indices': [pos], 'message': f'Comparing target ({target}) with array[{pos}] ({data[pos]})'})
+        yield {'action': 'probe', 'index': pos, 'message_id': 'interpolation.probe', 'message_args': (pos,)}
+        yield {'action': 'compare', 'indices': [pos], 'message_id': 'search.compare_probe', 'message_args': (target, pos, data[pos])}
 
         if data[pos] == target:
-            steps.append({'action': 'found', 'indices': [pos], 'message': f'Target {target} found at index {pos}!'})
-            return steps
+            yield {'action': 'found', 'indices': [pos], 'message_id': 'search.found', 'message_args': (target, pos)}
+            return
         if data[pos] < target:
             low = pos + 1
-            steps.append({'action': 'eliminate', 'range': (0, pos), 'message': f'Target is larger. New search range is [{low}, {high}].'})
+            yield {'action': 'eliminate', 'range': (0, pos), 'message_id': 'interpolation.larger', 'message_args': (low, high)}
         else:
             high = pos - 1
-            steps.append({'action': 'eliminate', 'range': (pos, len(data)-1), 'message': f'Target is smaller. New search range is [{low}, {high}].'})
+            yield {'action': 'eliminate', 'range': (pos, len(data)-1), 'message_id': 'interpolation.smaller', 'message_args': (low, high)}
             
-    steps.append({'action': 'not_found', 'message': f'Target {target} not found.'})
-    return steps
\ No newline at end of file
+    yield {'action': 'not_found', 'message_id': 'interpolation.target_not_found', 'message_args': (target,)}
+
+
+# ==============================================================================
+# Batched searches: many targets against one array, answers only (no animation)
+# ==============================================================================
+
+def _batch_linear(data, targets, first=None):
+    """
+    Linear search stops at the first match, so one index of first occurrences
+    answers every target. A registered dataset passes the index it already has.
+    """
+    if first is None:
+        first = {}
+        for i, value in enumerate(data):
+            first.setdefault(value, i)
+    for target in targets:
+        i = first.get(target)
+        yield target, i, len(data) if i is None else i + 1, None
+
+def _batch_binary(data, targets):
+    """
+    One shared descent for all targets: the sorted targets are split at every
+    visited midpoint, so a probe shared by k targets is made once instead of
+    k times. Each target still reports the comparisons its own search makes.
+    """
+    keys = sorted(targets)
+    stack = [(0, len(data) - 1, 0, 0, len(keys))]
+    while stack:
+        low, high, depth, a, b = stack.pop()
+        if a >= b:
+            continue
+        if low > high:
+            for target in keys[a:b]:
+                yield target, None, depth, None
+            continue
+        mid = (low + high) // 2
+        value = data[mid]
+        i = bisect_left(keys, value, a, b)
+        j = i + 1 if i < b and keys[i] == value else i
+        if j > i:
+            yield value, mid, depth + 1, None
+        stack.append((mid + 1, high, depth + 1, j, b))
+        stack.append((low, mid - 1, depth + 1, a, i))
+
+def _batch_steps(func, data, targets):
+    """
+    Any other search: runs its step generator per target, tallying comparisons
+    the way the counters do. A target whose search fails reports its error
+    rather than ending the batch.
+    """
+    for target in targets:
+        index, comparisons, error = None, 0, None
+        try:
+            for step in func(data, target, is_sorted=True):
+                comparisons += ACTION_COUNTERS.get(step['action'], {}).get('comparisons', 0)
+                if step['action'] == 'found':
+                    index = step['indices'][0]
+        except Exception as e:
+            index, error = None, f'{type(e).__name__}: {e}'
+        yield target, index, comparisons, error
+
+def batch_search(func, data, targets, is_sorted=None, positions=None):
+    """
+    Searches `data` for every target with search function `func`, yielding
+    (target, index or None, comparisons, error or None) once per distinct
+    target, in no particular order. The sortedness check runs once for the
+    whole batch; `positions`, the first index of every value, spares linear
+    search from building its own.
+    """
+    distinct = list(dict.fromkeys(targets))
+    if not data:
+        return ((target, None, 0, None) for target in distinct)
+    if func is linear_search:
+        return _batch_linear(data, distinct, positions)
+    if not (is_sorted_array(data) if is_sorted is None else is_sorted):
+        raise ValueError('Array must be sorted for this search.')
+    if func is binary_search:
+        return _batch_binary(data, distinct)
+    return _batch_steps(func, data, distinct)
@@ -0,0 +1,106 @@
+# algorithms/snapshots.py
+
+# Shared snapshot policy for step generators that expose their internal state
+# (queues, stacks, distance and memo tables, Hanoi towers).
+#
+# Copying the whole state into every step makes a trace O(steps x state). Instead
+# a step carries the full state only on a keyframe and otherwise just what
+# changed, under '<field>_delta'. A keyframe is emitted on the first record and
+# then only once the deltas sent since the last one would outweigh the state
+# itself, so keyframes never cost more than the deltas they stand in for and a
+# trace stays O(steps + changes) however large the state grows. A client
+# rebuilds the state by applying deltas to the most recent keyframe; random
+# access into long traces goes through the server's checkpoints instead
+# (see trace_store.py).
+
+
+class DictSnapshots:
+    """
+    Snapshot policy for dict-shaped state. `record()` returns the fields to merge
+    into a step: `{field: full copy}` on a keyframe, otherwise
+    `{field + '_delta': {key: value}}` holding only the changed keys.
+    `encode` converts a value for the wire (e.g. infinity to None). Sizes count
+    one per key, plus `measure(value)` for container values (e.g. `len`).
+    """
+
+    def __init__(self, field, encode=None, measure=None):
+        self.field = field
+        self.delta_field = field + '_delta'
+        self.encode = encode
+        self.measure = measure
+        self.pending = None # Size of the deltas since the last keyframe; None until the first
+
+    def _size(self, state, keys):
+        if self.measure is None:
+            return len(keys)
+        return len(keys) + sum(self.measure(state[k]) for k in keys)
+
+    def record(self, state, changed=()):
+        encode = self.encode
+        cost = self._size(state, changed)
+        if self.pending is None or self.pending + cost > self._size(state, state):
+            self.pending = 0
+            if encode is None:
+                return {self.field: dict(state)}
+            return {self.field: {k: encode(v) for k, v in state.items()}}
+        if not changed:
+            return {}
+        self.pending += cost
+        if encode is None:
+            return {self.delta_field: {k: state[k] for k in changed}}
+        return {self.delta_field: {k: encode(state[k]) for k in changed}}
+
+
+class ListSnapshots:
+    """
+    Snapshot policy for queue- and stack-shaped state. Deltas are a dict of the
+    operations applied since the previous step, replayed in this order: 'shift'
+    (count removed from the front), then 'pop' (count removed from the back),
+    then 'push' (items appended at the back).
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.delta_field = field + '_delta'
+        self.pending = None # Items moved by the deltas since the last keyframe; None until the first
+
+    def record(self, state, push=(), shift=0, pop=0):
+        cost = shift + pop + len(push)
+        if self.pending is None or self.pending + cost > len(state):
+            self.pending = 0
+            return {self.field: list(state)}
+        self.pending += cost
+        delta = {}
+        if shift:
+            delta['shift'] = shift
+        if pop:
+            delta['pop'] = pop
+        if push:
+            delta['push'] = list(push)
+        return {self.delta_field: delta}
+
+
+# Every field recorded through the policies above
+SNAPSHOT_FIELDS = ('queue_state', 'stack_state', 'distances', 'memo_state', 'towers_state')
+
+
+def apply_snapshots(state, step):
+    """
+    Brings `state` ({field: value}) up to date with one step, as the client's
+    applySnapshot does: a keyframe replaces a field, a delta patches it.
+    """
+    for field in SNAPSHOT_FIELDS:
+        if field in step:
+            value = step[field]
+            state[field] = list(value) if isinstance(value, list) else dict(value)
+            continue
+        delta = step.get(field + '_delta')
+        current = state.get(field)
+        if delta is None or current is None:
+            continue
+        if isinstance(current, list):
+            del current[:delta.get('shift', 0)]
+            del current[len(current) - delta.get('pop', 0):]
+            current.extend(delta.get('push', ()))
+        else:
+            current.update(delta)
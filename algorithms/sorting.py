@@ -1,11 +1,17 @@
 # algorithms/sorting.py
 
-def bubble_sort(data):
+import random
+
+# Every generator takes `record`: with record=False it yields only the action
+# names that count_operations tallies (see algorithms/instrument.py), so a
+# counters run never builds a step dict or copies a range.
+
+
+def bubble_sort(data, record=True):
     """
     Generates animation steps for Bubble Sort.
     Compares adjacent elements and swaps them if they are in the wrong order.
     """
-    steps = []
     n = len(data)
     arr = list(data)  # Create a mutable copy to sort in-place
 
@@ -14,186 +20,451 @@ def bubble_sort(data):
         # Last i elements are already in place
         for j in range(0, n - i - 1):
             # Step: Highlight the two elements being compared
-            steps.append({
+            yield {
                 'action': 'compare',
                 'indices': [j, j + 1],
-                'message': f'Comparing {arr[j]} and {arr[j+1]}.'
-            })
+                'message_id': 'bubble.compare',
+                'message_args': (arr[j], arr[j+1])
+            } if record else 'compare'
             if arr[j] > arr[j + 1]:
                 # Step: If they need to be swapped, show the swap
-                steps.append({
+                yield {
                     'action': 'swap',
                     'indices': [j, j + 1],
-                    'message': f'{arr[j]} > {arr[j+1]}. Swapping.'
-                })
+                    'message_id': 'bubble.swap',
+                    'message_args': (arr[j], arr[j+1])
+                } if record else 'swap'
                 # Perform the swap on our local copy
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
                 swapped = True
         
         # Step: Mark the last element of this pass as sorted
-        steps.append({
+        yield {
             'action': 'sorted_element',
             'indices': [n - 1 - i],
-            'message': f'Element {arr[n-1-i]} is now in its final sorted position.'
-        })
+            'message_id': 'sort.final_position',
+            'message_args': (arr[n-1-i],)
+        } if record else 'sorted_element'
 
         # If no swaps occurred in a pass, the array is sorted
         if not swapped:
             # Mark all remaining unsorted elements as sorted
             for k in range(n - i - 1):
-                 steps.append({'action': 'sorted_element', 'indices': [k]})
+                 yield {'action': 'sorted_element', 'indices': [k]} if record else 'sorted_element'
             break
             
-    steps.append({'action': 'complete', 'message': 'Array is fully sorted.'})
-    return steps
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
 
-def selection_sort(data):
+def selection_sort(data, record=True):
     """
     Generates animation steps for Selection Sort.
     Finds the minimum element and places it at the beginning.
     """
-    steps = []
     n = len(data)
     arr = list(data) # Create a mutable copy
 
     for i in range(n):
         min_idx = i
         # Step: Highlight the start of the unsorted subarray
-        steps.append({
+        yield {
             'action': 'highlight_min',
             'indices': [min_idx],
-            'message': f'Finding the minimum in the unsorted part (from index {i}). Current minimum is {arr[min_idx]}.'
-        })
+            'message_id': 'selection.scan',
+            'message_args': (i, arr[min_idx])
+        } if record else 'highlight_min'
         
         # Find the minimum element in the remaining unsorted array
         for j in range(i + 1, n):
             # Step: Compare current element with the current minimum
-            steps.append({
+            yield {
                 'action': 'compare',
                 'indices': [j, min_idx],
-                'message': f'Comparing {arr[j]} with current minimum {arr[min_idx]}.'
-            })
+                'message_id': 'selection.compare',
+                'message_args': (arr[j], arr[min_idx])
+            } if record else 'compare'
             if arr[j] < arr[min_idx]:
                 # Step: Found a new minimum
                 old_min_idx = min_idx
                 min_idx = j
-                steps.append({
+                yield {
                     'action': 'highlight_min',
                     'indices': [min_idx],
-                    'message': f'Found a new minimum: {arr[min_idx]}.'
-                })
+                    'message_id': 'selection.new_min',
+                    'message_args': (arr[min_idx],)
+                } if record else 'highlight_min'
         
         # Step: Swap the found minimum element with the first element of the unsorted part
-        steps.append({
+        yield {
             'action': 'swap',
             'indices': [i, min_idx],
-            'message': f'Swapping minimum element {arr[min_idx]} with element at index {i} ({arr[i]}).'
-        })
+            'message_id': 'selection.swap',
+            'message_args': (arr[min_idx], i, arr[i])
+        } if record else 'swap'
         arr[i], arr[min_idx] = arr[min_idx], arr[i]
         
         # Step: Mark the element at index i as sorted
-        steps.append({
+        yield {
             'action': 'sorted_element',
             'indices': [i],
-            'message': f'Element {arr[i]} is now in its final sorted position.'
-        })
+            'message_id': 'sort.final_position',
+            'message_args': (arr[i],)
+        } if record else 'sorted_element'
 
-    steps.append({'action': 'complete', 'message': 'Array is fully sorted.'})
-    return steps
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
 
 
-def insertion_sort(data):
-    """Generates animation steps for Insertion Sort."""
-    steps = []
-    arr = list(data)
-    for i in range(1, len(arr)):
+def _insertion_steps(arr, lo, hi, record=True):
+    """Insertion-sorts arr[lo:hi] in place, yielding the steps with absolute indices."""
+    for i in range(lo + 1, hi):
         key = arr[i]
-        steps.append({'action': 'highlight_key', 'index': i, 'key': key, 'message': f'Selecting {key} as the key to insert.'})
+        yield {'action': 'highlight_key', 'index': i, 'key': key, 'message_id': 'insertion.select_key', 'message_args': (key,)} if record else 'highlight_key'
         j = i - 1
-        while j >= 0 and key < arr[j]:
-            steps.append({'action': 'compare_shift', 'indices': [j, j+1], 'message': f'{key} < {arr[j]}. Shifting {arr[j]} to the right.'})
+        while j >= lo and key < arr[j]:
+            yield {'action': 'compare_shift', 'indices': [j, j+1], 'message_id': 'insertion.shift', 'message_args': (key, arr[j])} if record else 'compare_shift'
             arr[j + 1] = arr[j]
-            steps.append({'action': 'shift_right', 'from': j, 'to': j + 1, 'value': arr[j]})
+            yield {'action': 'shift_right', 'from': j, 'to': j + 1, 'value': arr[j]} if record else 'shift_right'
             j -= 1
         arr[j + 1] = key
-        steps.append({'action': 'insert_key', 'index': j + 1, 'key': key, 'message': f'Inserting key {key} at position {j+1}.'})
-
-    steps.append({'action': 'complete', 'message': 'Array is fully sorted.'})
-    return steps
+        yield {'action': 'insert_key', 'index': j + 1, 'key': key, 'message_id': 'insertion.insert', 'message_args': (key, j+1)} if record else 'insert_key'
 
-def merge_sort(data):
-    """Generates animation steps for Merge Sort."""
-    steps = []
+def insertion_sort(data, record=True):
+    """Generates animation steps for Insertion Sort."""
     arr = list(data)
+    yield from _insertion_steps(arr, 0, len(arr), record)
 
-    def _merge_sort_recursive(sub_array, offset):
-        if len(sub_array) > 1:
-            mid = len(sub_array) // 2
-            left_half = sub_array[:mid]
-            right_half = sub_array[mid:]
-            
-            steps.append({'action': 'divide', 'range': (offset, offset + len(sub_array) - 1), 'mid': offset + mid, 'message': f'Dividing array at index {offset+mid}.'})
-            
-            _merge_sort_recursive(left_half, offset)
-            _merge_sort_recursive(right_half, offset + mid)
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
 
-            i = j = k = 0
-            steps.append({'action': 'merge_start', 'range': (offset, offset + len(sub_array) - 1), 'message': f'Merging subarrays.'})
-            
-            # Merging
-            while i < len(left_half) and j < len(right_half):
-                steps.append({'action': 'merge_compare', 'left_index': offset + i, 'right_index': offset + mid + j})
-                if left_half[i] < right_half[j]:
-                    sub_array[k] = left_half[i]
+MERGE_SORT_MODES = ('bottom_up', 'natural')
+
+def merge_sort(data, mode='bottom_up', record=True):
+    """
+    Generates animation steps for Merge Sort, iteratively (no recursion depth limit).
+    'bottom_up' merges runs of width 1, 2, 4, ...; 'natural' first splits the input
+    into its already sorted runs (reversing strictly descending ones) and merges
+    those, so presorted input needs few passes. Each pass merges from one buffer
+    into the other and then the two swap roles, so the only extra memory is a
+    single auxiliary buffer allocated up front.
+    """
+    if mode not in MERGE_SORT_MODES:
+        raise ValueError(f"Unknown merge sort mode '{mode}'.")
+    n = len(data)
+    src = list(data)
+    dst = [None] * n
+
+    # Run boundaries: run k covers [bounds[k], bounds[k + 1])
+    if mode == 'natural':
+        bounds = [0]
+        start = 0
+        while start < n:
+            end = start + 1
+            if end < n and src[end] < src[start]:
+                # Strictly descending run: reversing it keeps equal keys in order
+                while end < n and src[end] < src[end - 1]:
+                    end += 1
+                yield {'action': 'reverse_run', 'range': (start, end - 1), 'message_id': 'merge.reverse_run', 'message_args': (start, end - 1)} if record else 'reverse_run'
+                lo, hi = start, end - 1
+                while lo < hi:
+                    src[lo], src[hi] = src[hi], src[lo]
+                    lo += 1
+                    hi -= 1
+                yield {'action': 'update_range', 'range_start': start, 'values': tuple(src[start:end])} if record else ('update_range', end - start)
+            else:
+                while end < n and src[end] >= src[end - 1]:
+                    end += 1
+            yield {'action': 'run_found', 'range': (start, end - 1), 'message_id': 'merge.run', 'message_args': (start, end - 1)} if record else 'run_found'
+            bounds.append(end)
+            start = end
+    else:
+        bounds = list(range(n + 1)) if n else [0]
+
+    while len(bounds) > 2:
+        yield {'action': 'merge_pass', 'runs': len(bounds) - 1, 'message_id': 'merge.pass', 'message_args': (len(bounds) - 1,)} if record else 'merge_pass'
+        merged_bounds = [0]
+        for k in range(0, len(bounds) - 1, 2):
+            lo = bounds[k]
+            if k + 2 >= len(bounds):
+                # Odd run out: carried over to the other buffer unchanged
+                hi = bounds[k + 1]
+                for x in range(lo, hi):
+                    dst[x] = src[x]
+                merged_bounds.append(hi)
+                continue
+            mid, hi = bounds[k + 1], bounds[k + 2]
+            yield {'action': 'merge_start', 'range': (lo, hi - 1), 'mid': mid, 'message_id': 'merge.start'} if record else 'merge_start'
+            i, j = lo, mid
+            for out in range(lo, hi):
+                if i < mid and j < hi:
+                    yield {'action': 'merge_compare', 'left_index': i, 'right_index': j} if record else 'merge_compare'
+                    # Ties take the left element, which keeps the sort stable
+                    if src[i] <= src[j]:
+                        dst[out] = src[i]
+                        i += 1
+                    else:
+                        dst[out] = src[j]
+                        j += 1
+                elif i < mid:
+                    dst[out] = src[i]
                     i += 1
                 else:
-                    sub_array[k] = right_half[j]
+                    dst[out] = src[j]
                     j += 1
-                k += 1
+            # The step gets its own immutable copy of the merged run
+            yield {'action': 'update_range', 'range_start': lo, 'values': tuple(dst[lo:hi]), 'message_id': 'merge.merged'} if record else ('update_range', hi - lo)
+            merged_bounds.append(hi)
+        bounds = merged_bounds
+        src, dst = dst, src
 
-            while i < len(left_half):
-                sub_array[k] = left_half[i]
-                i += 1
-                k += 1
-            while j < len(right_half):
-                sub_array[k] = right_half[j]
-                j += 1
-                k += 1
-
-            # Update the main array visualization
-            steps.append({'action': 'update_range', 'range_start': offset, 'values': sub_array, 'message': 'Subarray sorted and merged.'})
-
-    _merge_sort_recursive(arr, 0)
-    steps.append({'action': 'complete', 'message': 'Array is fully sorted.'})
-    return steps
-
-def quick_sort(data):
-    """Generates animation steps for Quick Sort."""
-    steps = []
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+
+QUICK_SORT_PIVOTS = ('median_of_three', 'last', 'random', 'ninther')
+QUICK_SORT_PARTITIONS = ('three_way', 'lomuto')
+
+def quick_sort(data, pivot='median_of_three', partition='three_way', introsort=True, record=True):
+    """
+    Generates animation steps for Quick Sort.
+    Iterative (an explicit stack of ranges), with a selectable pivot strategy and
+    Lomuto or Dutch-flag 3-way partitioning. With `introsort`, a range nested
+    deeper than 2*log2(n) partitions is finished with heap sort instead.
+    """
+    if pivot not in QUICK_SORT_PIVOTS:
+        raise ValueError(f"Unknown pivot strategy '{pivot}'.")
+    if partition not in QUICK_SORT_PARTITIONS:
+        raise ValueError(f"Unknown partition scheme '{partition}'.")
     arr = list(data)
+    # Seeded so the same input always produces the same (cacheable) trace
+    rng = random.Random(0)
+    depth_limit = 2 * len(arr).bit_length() if introsort else None
+
+    def _median_index(a, b, c):
+        x, y, z = arr[a], arr[b], arr[c]
+        if x < y:
+            if y < z:
+                return b
+            return c if x < z else a
+        if x < z:
+            return a
+        return c if y < z else b
+
+    def _choose_pivot(low, high):
+        if pivot == 'last' or high - low < 2:
+            return high
+        if pivot == 'random':
+            candidates = [rng.randint(low, high)]
+            index = candidates[0]
+        elif pivot == 'ninther' and high - low >= 8:
+            # Median of the medians of three evenly spaced triples
+            candidates = [low + (high - low) * k // 8 for k in range(9)]
+            index = _median_index(_median_index(*candidates[0:3]), _median_index(*candidates[3:6]), _median_index(*candidates[6:9]))
+        else:
+            candidates = [low, (low + high) // 2, high]
+            index = _median_index(*candidates)
+        # Step: Show the candidates the strategy looked at
+        yield {'action': 'pivot_candidates', 'indices': candidates, 'chosen': index, 'message_id': 'quick.pivot_candidates', 'message_args': (pivot.replace('_', ' '), len(candidates), arr[index])} if record else ('pivot_candidates', len(candidates))
+        return index
 
-    def _partition(low, high):
-        pivot = arr[high]
-        steps.append({'action': 'pivot', 'index': high, 'message': f'Choosing {pivot} as pivot for range [{low}, {high}].'})
+    def _partition_lomuto(low, high, p):
+        if p != high:
+            # Step: Move the chosen pivot to the end of the range
+            yield {'action': 'swap', 'indices': [p, high], 'message_id': 'quick.move_pivot', 'message_args': (arr[p],)} if record else 'swap'
+            arr[p], arr[high] = arr[high], arr[p]
+        pivot_value = arr[high]
+        yield {'action': 'pivot', 'index': high, 'message_id': 'quick.pivot', 'message_args': (pivot_value, low, high)} if record else 'pivot'
         i = low - 1
         for j in range(low, high):
-            steps.append({'action': 'compare', 'indices': [j, high], 'message': f'Comparing {arr[j]} with pivot {pivot}.'})
-            if arr[j] < pivot:
+            yield {'action': 'compare', 'indices': [j, high], 'message_id': 'quick.compare', 'message_args': (arr[j], pivot_value)} if record else 'compare'
+            if arr[j] < pivot_value:
                 i += 1
-                steps.append({'action': 'swap', 'indices': [i, j], 'message': f'{arr[j]} < {pivot}. Swapping {arr[i]} and {arr[j]}.'})
+                yield {'action': 'swap', 'indices': [i, j], 'message_id': 'quick.swap', 'message_args': (arr[j], pivot_value, arr[i])} if record else 'swap'
                 arr[i], arr[j] = arr[j], arr[i]
         
-        steps.append({'action': 'swap', 'indices': [i + 1, high], 'message': f'Placing pivot. Swapping {arr[i+1]} and {arr[high]}.'})
+        yield {'action': 'swap', 'indices': [i + 1, high], 'message_id': 'quick.place_pivot', 'message_args': (arr[i+1], arr[high])} if record else 'swap'
         arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        steps.append({'action': 'sorted_element', 'indices': [i + 1]})
-        return i + 1
-
-    def _quick_sort_recursive(low, high):
-        if low < high:
-            pi = _partition(low, high)
-            _quick_sort_recursive(low, pi - 1)
-            _quick_sort_recursive(pi + 1, high)
-
-    _quick_sort_recursive(0, len(arr) - 1)
-    steps.append({'action': 'complete', 'message': 'Array is fully sorted.'})
-    return steps
\ No newline at end of file
+        yield {'action': 'sorted_element', 'indices': [i + 1]} if record else 'sorted_element'
+        return i + 1, i + 1
+
+    def _partition_three_way(low, high, p):
+        # Dutch national flag: [low, lt) < pivot, [lt, i) == pivot, (gt, high] > pivot
+        pivot_value = arr[p]
+        yield {'action': 'pivot', 'index': p, 'message_id': 'quick.pivot', 'message_args': (pivot_value, low, high)} if record else 'pivot'
+        lt, i, gt = low, low, high
+        while i <= gt:
+            yield {'action': 'compare', 'indices': [i], 'message_id': 'quick.compare', 'message_args': (arr[i], pivot_value)} if record else 'compare'
+            if arr[i] < pivot_value:
+                if lt != i:
+                    yield {'action': 'swap', 'indices': [lt, i], 'message_id': 'quick.swap_less', 'message_args': (arr[i], pivot_value)} if record else 'swap'
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                lt += 1
+                i += 1
+            elif arr[i] > pivot_value:
+                # Skip the right-end elements already greater than the pivot, so presorted runs stay in order
+                while gt > i and arr[gt] > pivot_value:
+                    yield {'action': 'compare', 'indices': [gt], 'message_id': 'quick.compare', 'message_args': (arr[gt], pivot_value)} if record else 'compare'
+                    gt -= 1
+                if i != gt:
+                    yield {'action': 'swap', 'indices': [i, gt], 'message_id': 'quick.swap_greater', 'message_args': (arr[i], pivot_value)} if record else 'swap'
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                gt -= 1
+            else:
+                i += 1
+        # Step: Every copy of the pivot is now in its final place
+        yield {'action': 'sorted_element', 'indices': list(range(lt, gt + 1)), 'message_id': 'quick.equal_block', 'message_args': (pivot_value, lt, gt)} if record else 'sorted_element'
+        return lt, gt
+
+    def _heap_sort(low, high):
+        yield {'action': 'heap_fallback', 'range': (low, high), 'message_id': 'quick.heap_fallback', 'message_args': (low, high, depth_limit)} if record else 'heap_fallback'
+        size = high - low + 1
+
+        def _sift_down(root, end):
+            while 2 * root + 1 < end:
+                child = 2 * root + 1
+                if child + 1 < end:
+                    yield {'action': 'compare', 'indices': [low + child, low + child + 1], 'message_id': 'heap.compare_children', 'message_args': (arr[low + child], arr[low + child + 1])} if record else 'compare'
+                    if arr[low + child] < arr[low + child + 1]:
+                        child += 1
+                yield {'action': 'compare', 'indices': [low + root, low + child], 'message_id': 'heap.compare_parent', 'message_args': (arr[low + root], arr[low + child])} if record else 'compare'
+                if arr[low + root] >= arr[low + child]:
+                    return
+                yield {'action': 'swap', 'indices': [low + root, low + child], 'message_id': 'heap.sift', 'message_args': (arr[low + root], arr[low + child])} if record else 'swap'
+                arr[low + root], arr[low + child] = arr[low + child], arr[low + root]
+                root = child
+
+        for start in range(size // 2 - 1, -1, -1):
+            yield from _sift_down(start, size)
+        for end in range(size - 1, 0, -1):
+            yield {'action': 'swap', 'indices': [low, low + end], 'message_id': 'heap.extract', 'message_args': (arr[low], low + end)} if record else 'swap'
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            yield {'action': 'sorted_element', 'indices': [low + end]} if record else 'sorted_element'
+            yield from _sift_down(0, end)
+        yield {'action': 'sorted_element', 'indices': [low]} if record else 'sorted_element'
+
+    # Explicit stack of (low, high, depth) ranges instead of recursion
+    stack = [(0, len(arr) - 1, 0)]
+    while stack:
+        low, high, depth = stack.pop()
+        if low >= high:
+            if low == high:
+                yield {'action': 'sorted_element', 'indices': [low]} if record else 'sorted_element'
+            continue
+        if depth_limit is not None and depth > depth_limit:
+            yield from _heap_sort(low, high)
+            continue
+        p = yield from _choose_pivot(low, high)
+        if partition == 'three_way':
+            lt, gt = yield from _partition_three_way(low, high, p)
+        else:
+            lt, gt = yield from _partition_lomuto(low, high, p)
+        # Push the larger side first so the smaller one is handled next and the stack stays O(log n)
+        left, right = (low, lt - 1, depth + 1), (gt + 1, high, depth + 1)
+        stack += [left, right] if lt - low > high - gt else [right, left]
+
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+
+
+# Widest value range counting sort will allocate counters for
+COUNTING_SORT_MAX_RANGE = 1 << 16
+RADIX_SORT_BASES = (10, 2, 16)
+
+def _counting_pass(arr, keys, size, record=True):
+    """
+    One stable counting pass shared by counting and radix sort: a histogram of
+    `keys` over `size` buckets, its prefix sums, then placement from the right.
+    Returns the reordered values.
+    """
+    counts = [0] * size
+    for i, key in enumerate(keys):
+        counts[key] += 1
+        # Step: Histogram phase
+        yield {'action': 'count', 'index': i, 'bucket': key, 'count': counts[key], 'message_id': 'counting.count', 'message_args': (arr[i], counts[key])} if record else 'count'
+    total = 0
+    for bucket in range(size):
+        total += counts[bucket]
+        counts[bucket] = total
+        # Step: Prefix-sum phase; each counter becomes the end position of its bucket
+        yield {'action': 'prefix_sum', 'bucket': bucket, 'total': total, 'message_id': 'counting.prefix', 'message_args': (bucket, total)} if record else 'prefix_sum'
+    output = [None] * len(arr)
+    # Right to left, so equal keys keep their order (the sort is stable)
+    for i in range(len(arr) - 1, -1, -1):
+        key = keys[i]
+        counts[key] -= 1
+        output[counts[key]] = arr[i]
+        yield {'action': 'place', 'index': i, 'to': counts[key], 'bucket': key, 'count': counts[key], 'message_id': 'counting.place', 'message_args': (arr[i], counts[key])} if record else 'place'
+    return output
+
+def counting_sort(data, record=True):
+    """
+    Generates animation steps for Counting Sort.
+    Counts how often each value occurs, turns the counts into positions with a
+    prefix sum and writes every value straight to its place: O(n + k) for k
+    possible values.
+    """
+    arr = list(data)
+    if not arr:
+        yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+        return
+    low, high = min(arr), max(arr)
+    size = high - low + 1
+    if size > COUNTING_SORT_MAX_RANGE:
+        yield {'action': 'error', 'message_id': 'counting.range_too_large', 'message_args': (size, COUNTING_SORT_MAX_RANGE)} if record else 'error'
+        return
+
+    yield {'action': 'init_counts', 'labels': list(range(low, high + 1)), 'message_id': 'counting.init', 'message_args': (size, low, high)} if record else 'init_counts'
+    arr = yield from _counting_pass(arr, [v - low for v in arr], size, record)
+    yield {'action': 'update_range', 'range_start': 0, 'values': tuple(arr), 'message_id': 'counting.output'} if record else ('update_range', len(arr))
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+
+def radix_sort(data, base=10, record=True):
+    """
+    Generates animation steps for LSD Radix Sort.
+    Runs one stable counting pass per digit, least significant first, so the
+    cost is O(d * (n + base)) for d-digit keys. Negative inputs are shifted by
+    the minimum so every key is non-negative.
+    """
+    if base not in RADIX_SORT_BASES:
+        raise ValueError(f'Unsupported radix base {base}.')
+    arr = list(data)
+    low = min(arr, default=0)
+    largest = max(arr, default=0) - low
+    exp, digit = 1, 0
+    while True:
+        yield {'action': 'radix_pass', 'digit': digit, 'exp': exp, 'message_id': 'radix.pass', 'message_args': (digit + 1, exp, base)} if record else 'radix_pass'
+        yield {'action': 'init_counts', 'labels': list(range(base)), 'message_id': 'counting.init', 'message_args': (base, 0, base - 1)} if record else 'init_counts'
+        arr = yield from _counting_pass(arr, [(v - low) // exp % base for v in arr], base, record)
+        yield {'action': 'update_range', 'range_start': 0, 'values': tuple(arr), 'message_id': 'radix.pass_done', 'message_args': (digit + 1,)} if record else ('update_range', len(arr))
+        exp *= base
+        digit += 1
+        if exp > largest:
+            break
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+
+def bucket_sort(data, record=True):
+    """
+    Generates animation steps for Bucket Sort.
+    Spreads the values over n equal-width buckets, writes the buckets back in
+    order and insertion-sorts each one in place. Expected O(n) for evenly spread
+    values, whatever their range; O(n^2) if they all land in one bucket.
+    """
+    arr = list(data)
+    n = len(arr)
+    if n == 0:
+        yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
+        return
+    low, high = min(arr), max(arr)
+    width = (high - low) / n or 1
+    labels = [f'{low + b * width:g}-{low + (b + 1) * width:g}' for b in range(n)]
+    yield {'action': 'init_buckets', 'labels': labels, 'message_id': 'bucket.init', 'message_args': (n, round(width, 2))} if record else 'init_buckets'
+
+    buckets = [[] for _ in range(n)]
+    for i, value in enumerate(arr):
+        b = min(int((value - low) / width), n - 1)
+        buckets[b].append(value)
+        yield {'action': 'scatter', 'index': i, 'bucket': b, 'value': value, 'message_id': 'bucket.scatter', 'message_args': (value, labels[b])} if record else 'scatter'
+
+    start = 0
+    for b, bucket in enumerate(buckets):
+        if not bucket:
+            continue
+        arr[start:start + len(bucket)] = bucket
+        yield {'action': 'update_range', 'range_start': start, 'values': tuple(bucket), 'bucket': b, 'message_id': 'bucket.gather', 'message_args': (labels[b], start)} if record else ('update_range', len(bucket))
+        yield from _insertion_steps(arr, start, start + len(bucket), record)
+        start += len(bucket)
+    yield {'action': 'complete', 'message_id': 'sort.complete'} if record else 'complete'
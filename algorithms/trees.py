@@ -1,28 +1,39 @@
 # algorithms/trees.py
+from array import array
+from collections import deque
 
-def bst_build_steps(values):
+from algorithms.snapshots import ListSnapshots
+
+
+def bst_build_steps(values, mode='insert'):
     """
     Generates animation steps to build a Binary Search Tree from a list of values.
     The frontend will be responsible for calculating node positions. This function
     only provides the logical steps of comparison and insertion.
+    With mode='bulk_load' the values are instead sorted once and laid out as a
+    perfectly balanced tree (see bst_bulk_load_steps).
     """
     if not values:
-        return [{'action': 'error', 'message': 'Cannot build a tree from an empty list.'}]
-    
-    steps = []
+        yield {'action': 'error', 'message_id': 'bst.empty'}
+        return
+    if mode == 'bulk_load':
+        yield from bst_bulk_load_steps(values)
+        return
+
     # Use a dictionary to simulate the tree structure on the backend to track connections
     # Format: {node_value: {'left': child_value, 'right': child_value}}
     tree = {} 
     
     # First value becomes the root
     root_val = values[0]
-    steps.append({
+    yield {
         'action': 'insert',
         'value': root_val,
         'parent': None,
         'direction': 'root',
-        'message': f'Tree is empty. Inserting {root_val} as the root.'
-    })
+        'message_id': 'bst.insert_root',
+        'message_args': (root_val,)
+    }
     tree[root_val] = {'left': None, 'right': None}
 
     # Insert remaining values
@@ -33,36 +44,38 @@ def bst_build_steps(values):
         while current is not None:
             parent = current
             # Step: Compare the new value with the current node
-            steps.append({
+            yield {
                 'action': 'compare',
                 'value': current,
                 'newValue': val,
-                'message': f'Comparing new value {val} with node {current}.'
-            })
+                'message_id': 'bst.compare',
+                'message_args': (val, current)
+            }
             if val < current:
                 # Go left
-                steps.append({'action': 'traverse', 'from': parent, 'direction': 'left', 'message': f'{val} < {current}. Moving left.'})
+                yield {'action': 'traverse', 'from': parent, 'direction': 'left', 'message_id': 'bst.go_left', 'message_args': (val, current)}
                 current = tree[current]['left']
             elif val > current:
                 # Go right
-                steps.append({'action': 'traverse', 'from': parent, 'direction': 'right', 'message': f'{val} > {current}. Moving right.'})
+                yield {'action': 'traverse', 'from': parent, 'direction': 'right', 'message_id': 'bst.go_right', 'message_args': (val, current)}
                 current = tree[current]['right']
             else:
                 # Value already exists
-                steps.append({'action': 'duplicate', 'value': val, 'message': f'Value {val} already exists. No insertion.'})
+                yield {'action': 'duplicate', 'value': val, 'message_id': 'bst.duplicate', 'message_args': (val,)}
                 parent = None # Signal that no insertion should happen
                 break
         
         if parent is not None:
             direction = 'left' if val < parent else 'right'
             # Step: Insert the new node
-            steps.append({
+            yield {
                 'action': 'insert',
                 'value': val,
                 'parent': parent,
                 'direction': direction,
-                'message': f'Found empty spot. Inserting {val} as the {direction} child of {parent}.'
-            })
+                'message_id': 'bst.insert',
+                'message_args': (val, direction, parent)
+            }
             # Update our backend tree model
             tree[val] = {'left': None, 'right': None}
             if direction == 'left':
@@ -70,5 +83,504 @@ def bst_build_steps(values):
             else:
                 tree[parent]['right'] = val
                 
-    steps.append({'action': 'complete', 'message': 'BST build process complete.'})
-    return steps
\ No newline at end of file
+    yield {'action': 'complete', 'message_id': 'bst.complete'}
+
+
+# ==============================================================================
+# Self-balancing trees (AVL, red-black) on an array-backed node store
+# ==============================================================================
+
+NIL = -1
+TREE_DELETE_MODES = ('none', 'half', 'all')
+TRAVERSAL_ORDERS = ('in_order', 'pre_order', 'post_order', 'level_order')
+
+
+def _balanced_order(n):
+    """
+    Lays n sorted keys out as a perfectly balanced tree whose node ids are the
+    keys' ranks: yields (node, parent, direction, depth, subtree size) in
+    pre-order, so a parent always comes before its children. O(n), no recursion.
+    """
+    stack = [(0, n, NIL, 'root', 0)] if n else []
+    while stack:
+        lo, hi, parent, direction, depth = stack.pop()
+        mid = (lo + hi) // 2
+        yield mid, parent, direction, depth, hi - lo
+        if mid + 1 < hi:
+            stack.append((mid + 1, hi, mid, 'right', depth + 1))
+        if lo < mid:
+            stack.append((lo, mid, mid, 'left', depth + 1))
+
+
+class TreeStore:
+    """
+    Binary search tree nodes kept in parallel arrays: node `i` has key `keys[i]`,
+    children `left[i]` / `right[i]` and `parent[i]` (NIL when absent). `height`
+    (AVL) and `red` (red-black) hold the balancing bookkeeping. Steps name nodes
+    by id rather than by key, so equal keys can coexist; an equal key goes right.
+    """
+
+    __slots__ = ('keys', 'left', 'right', 'parent', 'height', 'red', 'root', 'size')
+
+    def __init__(self):
+        self.keys = []
+        self.left, self.right, self.parent, self.height = array('l'), array('l'), array('l'), array('l')
+        self.red = bytearray()
+        self.root = NIL
+        self.size = 0
+
+    @classmethod
+    def from_sorted(cls, keys):
+        """
+        Builds a perfectly balanced tree over already sorted `keys` in O(n),
+        one level at a time: the middle of every range is a node, its halves
+        are the next level's ranges. Node ids are the keys' ranks. Heights are
+        exact and the deepest level is red, the rest black, so the result is a
+        valid AVL tree and a valid red-black tree at once.
+        """
+        store = cls()
+        n = store.size = len(keys)
+        store.keys = list(keys)
+        left, right, parent = array('l', [NIL]) * n, array('l', [NIL]) * n, array('l', [NIL]) * n
+        height, red = array('l', [0]) * n, bytearray(n)
+        store.left, store.right, store.parent, store.height, store.red = left, right, parent, height, red
+        store.root = n // 2 if n else NIL
+        ranges, depth, deepest = [(0, n, NIL)] if n else [], 0, n.bit_length() - 1
+        while ranges:
+            next_ranges = []
+            for lo, hi, up in ranges:
+                mid = (lo + hi) >> 1
+                parent[mid] = up
+                height[mid] = (hi - lo).bit_length()
+                if lo < mid:
+                    left[mid] = (lo + mid) >> 1
+                    next_ranges.append((lo, mid, mid))
+                if mid + 1 < hi:
+                    right[mid] = (mid + 1 + hi) >> 1
+                    next_ranges.append((mid + 1, hi, mid))
+                if depth == deepest and depth:
+                    red[mid] = 1
+            ranges = next_ranges
+            depth += 1
+        return store
+
+    def add(self, key, parent, direction):
+        """Creates a red leaf of height 1 and hangs it under `parent` on side `direction`."""
+        node = len(self.keys)
+        self.keys.append(key)
+        self.left.append(NIL)
+        self.right.append(NIL)
+        self.parent.append(parent)
+        self.height.append(1)
+        self.red.append(1)
+        if parent == NIL:
+            self.root = node
+        elif direction == 'left':
+            self.left[parent] = node
+        else:
+            self.right[parent] = node
+        self.size += 1
+        return node
+
+    def links(self, *nodes):
+        """[id, left, right] of each (non-NIL) node: the shape change a step carries for the frontend."""
+        return [[n, self.left[n], self.right[n]] for n in dict.fromkeys(nodes) if n != NIL]
+
+    def is_red(self, node):
+        return node != NIL and self.red[node] == 1
+
+    def get_height(self, node):
+        return self.height[node] if node != NIL else 0
+
+    def update_height(self, node):
+        self.height[node] = 1 + max(self.get_height(self.left[node]), self.get_height(self.right[node]))
+
+    def balance(self, node):
+        return self.get_height(self.left[node]) - self.get_height(self.right[node])
+
+    def replace_child(self, parent, old, new):
+        """Puts `new` where `old` hung under `parent` (or at the root)."""
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+        if new != NIL:
+            self.parent[new] = parent
+
+    def rotate(self, node, direction):
+        """Rotates the subtree at `node` left or right; returns the child that takes its place."""
+        if direction == 'left':
+            pivot = self.right[node]
+            inner = self.right[node] = self.left[pivot]
+            self.left[pivot] = node
+        else:
+            pivot = self.left[node]
+            inner = self.left[node] = self.right[pivot]
+            self.right[pivot] = node
+        if inner != NIL:
+            self.parent[inner] = node
+        self.replace_child(self.parent[node], node, pivot)
+        self.parent[node] = pivot
+        return pivot
+
+    def minimum(self, node):
+        while self.left[node] != NIL:
+            node = self.left[node]
+        return node
+
+    def depth(self):
+        """Number of levels, found with an explicit stack."""
+        deepest, stack = 0, [(self.root, 1)] if self.root != NIL else []
+        while stack:
+            node, level = stack.pop()
+            deepest = max(deepest, level)
+            stack.extend((child, level + 1) for child in (self.left[node], self.right[node]) if child != NIL)
+        return deepest
+
+
+def _descend(store, value):
+    """Walks from the root to the empty spot for `value`; returns (parent, direction)."""
+    node, parent, direction = store.root, NIL, 'root'
+    while node != NIL:
+        key = store.keys[node]
+        yield {'action': 'compare_node', 'node': node, 'value': key, 'newValue': value, 'message_id': 'bst.compare', 'message_args': (value, key)}
+        parent = node
+        if value < key:
+            yield {'action': 'traverse', 'from': node, 'direction': 'left', 'message_id': 'bst.go_left', 'message_args': (value, key)}
+            node, direction = store.left[node], 'left'
+        else:
+            yield {'action': 'traverse', 'from': node, 'direction': 'right', 'message_id': 'bst.go_right' if key < value else 'tree.go_right_equal', 'message_args': (value, key)}
+            node, direction = store.right[node], 'right'
+    return parent, direction
+
+def _find(store, value):
+    """Walks from the root to a node holding `value`; returns it, or NIL."""
+    node = store.root
+    while node != NIL:
+        key = store.keys[node]
+        yield {'action': 'compare_node', 'node': node, 'value': key, 'newValue': value, 'message_id': 'bst.compare', 'message_args': (value, key)}
+        if value < key:
+            node = store.left[node]
+        elif key < value:
+            node = store.right[node]
+        else:
+            yield {'action': 'found_node', 'node': node, 'message_id': 'tree.found', 'message_args': (value,)}
+            return node
+    yield {'action': 'missing_value', 'message_id': 'tree.not_found', 'message_args': (value,)}
+    return NIL
+
+def _insert(store, value, **fields):
+    """Descends and attaches a new leaf for `value`; returns its id."""
+    parent, direction = yield from _descend(store, value)
+    node = store.add(value, parent, direction)
+    if parent == NIL:
+        message_id, message_args = 'bst.insert_root', (value,)
+    else:
+        message_id, message_args = 'bst.insert', (value, direction, store.keys[parent])
+    yield {'action': 'insert_node', 'node': node, 'value': value, 'parent': parent, 'direction': direction, **fields,
+           'links': store.links(parent, node), 'root': store.root, 'message_id': message_id, 'message_args': message_args}
+    return node
+
+def _unlink(store, value):
+    """
+    Finds `value` and removes a node with at most one child in its place: the
+    node itself, or its in-order successor whose key is first copied up.
+    Returns (removed node, its child that moved up, that child's new parent),
+    or None when `value` is absent.
+    """
+    node = yield from _find(store, value)
+    if node == NIL:
+        return None
+    if store.left[node] != NIL and store.right[node] != NIL:
+        successor = store.minimum(store.right[node])
+        store.keys[node] = store.keys[successor]
+        yield {'action': 'replace_key', 'node': node, 'from': successor, 'value': store.keys[node], 'message_id': 'tree.successor', 'message_args': (value, store.keys[node])}
+        node = successor
+    child = store.left[node] if store.left[node] != NIL else store.right[node]
+    parent = store.parent[node]
+    store.replace_child(parent, node, child)
+    store.size -= 1
+    yield {'action': 'delete_node', 'node': node, 'links': store.links(parent, child), 'root': store.root, 'message_id': 'tree.remove', 'message_args': (store.keys[node],)}
+    return node, child, parent
+
+def _rotate(store, node, direction, heights=False):
+    """Rotates at `node`, yielding the step; returns the subtree's new root."""
+    parent = store.parent[node]
+    pivot = store.rotate(node, direction)
+    if heights:
+        store.update_height(node)
+        store.update_height(pivot)
+    yield {'action': 'rotate', 'node': node, 'pivot': pivot, 'direction': direction, 'links': store.links(parent, pivot, node),
+           'root': store.root, 'message_id': 'tree.rotate', 'message_args': (store.keys[node], direction, store.keys[pivot])}
+    return pivot
+
+def _deletions(values, mode):
+    if mode not in TREE_DELETE_MODES:
+        raise ValueError(f"Unknown delete mode '{mode}'.")
+    return values[::2] if mode == 'half' else values if mode == 'all' else []
+
+def _complete(store):
+    return {'action': 'complete', 'message_id': 'tree.complete', 'message_args': (store.size, store.depth())}
+
+
+# --- AVL ---
+
+def _avl_rebalance(store, node):
+    """
+    Walks from `node` towards the root, refreshing heights and rotating wherever
+    the balance factor reaches ±2. Stops as soon as a subtree's height is what
+    it was before, since nothing above it can have changed.
+    """
+    while node != NIL:
+        before = store.height[node]
+        store.update_height(node)
+        balance = store.balance(node)
+        yield {'action': 'check_balance', 'node': node, 'height': store.height[node], 'balance': balance, 'message_id': 'avl.balance', 'message_args': (store.keys[node], store.height[node], balance)}
+        if balance > 1:
+            if store.balance(store.left[node]) < 0:
+                yield from _rotate(store, store.left[node], 'left', heights=True)
+            node = yield from _rotate(store, node, 'right', heights=True)
+        elif balance < -1:
+            if store.balance(store.right[node]) > 0:
+                yield from _rotate(store, store.right[node], 'right', heights=True)
+            node = yield from _rotate(store, node, 'left', heights=True)
+        if store.height[node] == before:
+            return
+        node = store.parent[node]
+
+def avl_tree_steps(values, delete='none'):
+    """
+    Generates animation steps for building an AVL tree from `values`, then
+    deleting some of them again ('half' removes every other value, 'all' every
+    value). Rotations keep the two subtrees of every node within one level of
+    each other, so each insert or delete costs O(log n) steps even on sorted input.
+    """
+    store = TreeStore()
+    for value in values:
+        node = yield from _insert(store, value)
+        yield from _avl_rebalance(store, store.parent[node])
+    for value in _deletions(values, delete):
+        yield {'action': 'message', 'message_id': 'tree.delete', 'message_args': (value,)}
+        removed = yield from _unlink(store, value)
+        if removed is not None:
+            yield from _avl_rebalance(store, removed[2])
+    yield _complete(store)
+
+
+# --- Red-black ---
+
+def _paint(store, changes, message_id, message_args):
+    """Sets each (node, is_red) in `changes`; returns the one recolor step describing them all."""
+    for node, red in changes:
+        store.red[node] = red
+    return {'action': 'recolor', 'colors': [[node, 'red' if red else 'black'] for node, red in changes], 'message_id': message_id, 'message_args': message_args}
+
+def _rb_insert_fixup(store, node):
+    """Restores the red-black rules after `node` was added red (CLRS insert fixup)."""
+    keys = store.keys
+    while store.is_red(store.parent[node]):
+        parent = store.parent[node]
+        grand = store.parent[parent]
+        parent_is_left = parent == store.left[grand]
+        uncle = store.right[grand] if parent_is_left else store.left[grand]
+        if store.is_red(uncle):
+            yield _paint(store, [(parent, 0), (uncle, 0), (grand, 1)], 'rb.recolor_uncle', (keys[parent], keys[uncle], keys[grand]))
+            node = grand
+            continue
+        inward, outward = ('left', 'right') if parent_is_left else ('right', 'left')
+        if node == (store.right[parent] if parent_is_left else store.left[parent]):
+            # Inner grandchild: rotate it into the outer position first
+            node = parent
+            yield from _rotate(store, node, inward)
+            parent = store.parent[node]
+        yield _paint(store, [(parent, 0), (grand, 1)], 'rb.recolor_rotate', (keys[parent], keys[grand]))
+        yield from _rotate(store, grand, outward)
+    if store.is_red(store.root):
+        yield _paint(store, [(store.root, 0)], 'rb.root_black', (keys[store.root],))
+
+def _rb_delete_fixup(store, node, parent):
+    """
+    Restores equal black heights after a black node was removed; `node` (maybe
+    NIL) carries the extra black and `parent` is its parent (CLRS delete fixup).
+    """
+    keys = store.keys
+    while node != store.root and not store.is_red(node):
+        node_is_left = node == store.left[parent]
+        near_side, far_side = (store.left, store.right) if node_is_left else (store.right, store.left)
+        toward, away = ('left', 'right') if node_is_left else ('right', 'left')
+        sibling = far_side[parent]
+        if store.is_red(sibling):
+            yield _paint(store, [(sibling, 0), (parent, 1)], 'rb.sibling_red', (keys[sibling], keys[parent]))
+            yield from _rotate(store, parent, toward)
+            sibling = far_side[parent]
+        if not store.is_red(near_side[sibling]) and not store.is_red(far_side[sibling]):
+            yield _paint(store, [(sibling, 1)], 'rb.push_up', (keys[sibling], keys[parent]))
+            node, parent = parent, store.parent[parent]
+            continue
+        if not store.is_red(far_side[sibling]):
+            yield _paint(store, [(near_side[sibling], 0), (sibling, 1)], 'rb.sibling_inner', (keys[sibling],))
+            yield from _rotate(store, sibling, away)
+            sibling = far_side[parent]
+        yield _paint(store, [(sibling, store.red[parent]), (parent, 0), (far_side[sibling], 0)], 'rb.sibling_outer', (keys[sibling], keys[parent]))
+        yield from _rotate(store, parent, toward)
+        node = store.root
+    if store.is_red(node):
+        yield _paint(store, [(node, 0)], 'rb.absorb_black', (keys[node],))
+
+def red_black_tree_steps(values, delete='none'):
+    """
+    Generates animation steps for building a red-black tree from `values`, then
+    deleting some of them again ('half' removes every other value, 'all' every
+    value). Recoloring and at most three rotations per operation keep every
+    root-to-leaf path within twice the shortest one: O(log n) steps per operation.
+    """
+    store = TreeStore()
+    for value in values:
+        node = yield from _insert(store, value, color='red')
+        yield from _rb_insert_fixup(store, node)
+    for value in _deletions(values, delete):
+        yield {'action': 'message', 'message_id': 'tree.delete', 'message_args': (value,)}
+        removed = yield from _unlink(store, value)
+        if removed is not None and not store.red[removed[0]]:
+            yield from _rb_delete_fixup(store, removed[1], removed[2])
+    yield _complete(store)
+
+
+# --- Bulk load and traversals ---
+
+def bst_bulk_load_steps(values):
+    """
+    Generates animation steps for bulk-loading a BST: the values are sorted once
+    (skipped when they already are), then the middle value of every range
+    becomes the root of that range. Each node is placed without a single
+    comparison, so the build is O(n) steps and the tree has minimal height.
+    """
+    if all(a <= b for a, b in zip(values, values[1:])):
+        keys = list(values)
+    else:
+        keys = sorted(values)
+        yield {'action': 'message', 'message_id': 'bulk.sorted', 'message_args': (len(keys),)}
+    store = TreeStore.from_sorted(keys)
+    # Replay the layout, showing each node with only the links that already exist
+    shown = TreeStore()
+    n = len(keys)
+    shown.keys, shown.size = keys, n
+    shown.left, shown.right = array('l', [NIL]) * n, array('l', [NIL]) * n
+    for node, parent, direction, depth, size in _balanced_order(n):
+        if parent == NIL:
+            shown.root = node
+            message_id, message_args = 'bulk.root', (keys[node],)
+        else:
+            (shown.left if direction == 'left' else shown.right)[parent] = node
+            message_id, message_args = 'bulk.place', (keys[node], direction, keys[parent], size)
+        yield {'action': 'insert_node', 'node': node, 'value': keys[node], 'parent': parent, 'direction': direction,
+               'links': shown.links(parent, node), 'root': shown.root, 'message_id': message_id, 'message_args': message_args}
+    yield _complete(store)
+
+def _insertion_store(values):
+    """A plain (unbalanced) BST built by inserting `values` in order, without steps."""
+    store = TreeStore()
+    keys, left, right = store.keys, store.left, store.right
+    for value in values:
+        node, parent, direction = store.root, NIL, 'root'
+        while node != NIL:
+            parent = node
+            node, direction = (left[node], 'left') if value < keys[node] else (right[node], 'right')
+        store.add(value, parent, direction)
+    return store
+
+def tree_traversal_steps(values, order='in_order', build='bulk_load'):
+    """
+    Generates animation steps for an iterative depth-first (in-, pre-, post-order)
+    or level-order traversal. The tree is built from `values` first, either
+    bulk-loaded (balanced) or by plain insertion, which can make it as deep as
+    it is long; an explicit stack or queue replaces recursion either way.
+    """
+    if order not in TRAVERSAL_ORDERS:
+        raise ValueError(f"Unknown traversal order '{order}'.")
+    store = TreeStore.from_sorted(sorted(values)) if build == 'bulk_load' else _insertion_store(values)
+    keys, left, right = store.keys, store.left, store.right
+    yield {'action': 'load_tree', 'nodes': [[n, keys[n], left[n], right[n]] for n in range(len(keys))], 'root': store.root,
+           'message_id': 'traversal.loaded', 'message_args': (store.size, store.depth())}
+
+    snapshots = ListSnapshots('queue_state' if order == 'level_order' else 'stack_state')
+    shown = deque()
+    visited = 0
+
+    def push(node):
+        shown.append(keys[node])
+        if order == 'level_order':
+            return {'action': 'enqueue', 'node': node, **snapshots.record(shown, push=[keys[node]]), 'message_id': 'traversal.enqueue', 'message_args': (keys[node],)}
+        return {'action': 'push', 'node': node, **snapshots.record(shown, push=[keys[node]]), 'message_id': 'traversal.push', 'message_args': (keys[node],)}
+
+    def pop(node):
+        if order == 'level_order':
+            shown.popleft()
+            return {'action': 'dequeue', 'node': node, **snapshots.record(shown, shift=1), 'message_id': 'traversal.dequeue', 'message_args': (keys[node],)}
+        shown.pop()
+        return {'action': 'pop', 'node': node, **snapshots.record(shown, pop=1), 'message_id': 'traversal.pop', 'message_args': (keys[node],)}
+
+    def visit(node):
+        nonlocal visited
+        visited += 1
+        return {'action': 'visit_node', 'node': node, 'value': keys[node], 'position': visited, 'message_id': 'traversal.visit', 'message_args': (keys[node], visited)}
+
+    root = store.root
+    if order == 'in_order':
+        stack, node = [], root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                yield push(node)
+                node = left[node]
+            node = stack.pop()
+            yield pop(node)
+            yield visit(node)
+            node = right[node]
+    elif order == 'pre_order':
+        stack = []
+        if root != NIL:
+            stack.append(root)
+            yield push(root)
+        while stack:
+            node = stack.pop()
+            yield pop(node)
+            yield visit(node)
+            for child in (right[node], left[node]):
+                if child != NIL:
+                    stack.append(child)
+                    yield push(child)
+    elif order == 'post_order':
+        # A node is visited once its right subtree is done, i.e. right after it
+        stack, node, last = [], root, NIL
+        while stack or node != NIL:
+            if node != NIL:
+                stack.append(node)
+                yield push(node)
+                node = left[node]
+                continue
+            top = stack[-1]
+            if right[top] != NIL and last != right[top]:
+                node = right[top]
+            else:
+                stack.pop()
+                yield pop(top)
+                yield visit(top)
+                last = top
+    else:
+        queue = deque()
+        if root != NIL:
+            queue.append(root)
+            yield push(root)
+        while queue:
+            node = queue.popleft()
+            yield pop(node)
+            yield visit(node)
+            for child in (left[node], right[node]):
+                if child != NIL:
+                    queue.append(child)
+                    yield push(child)
+
+    yield {'action': 'complete', 'message_id': 'traversal.complete', 'message_args': (visited,)}
@@ -1,99 +1,627 @@
 # app.py (FINAL, CLEANED, AND CORRECTED)
 
+import atexit
+import json
 import random
-import math
-from flask import Flask, render_template, jsonify, request
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
 
 # Import all necessary algorithm functions
-from algorithms.searching import linear_search, binary_search, jump_search, interpolation_search
-from algorithms.sorting import bubble_sort, selection_sort, insertion_sort, merge_sort, quick_sort
-from algorithms.trees import bst_build_steps
-from algorithms.graphs import bfs, dfs, dijkstra_steps
-from algorithms.other_algorithms import fib_dp_steps
+from algorithms.searching import linear_search, binary_search, jump_search, interpolation_search, batch_search
+from algorithms.sorting import bubble_sort, selection_sort, insertion_sort, merge_sort, quick_sort, counting_sort, radix_sort, bucket_sort
+from algorithms.trees import bst_build_steps, avl_tree_steps, red_black_tree_steps, tree_traversal_steps
+from algorithms.graphs import bfs, dfs, dijkstra_steps, astar_steps, bidirectional_dijkstra_steps, shortest_path_tree
+from algorithms.other_algorithms import fib_dp_steps, fib_tabulation_steps, fib_matrix_steps, fib_fast_doubling_steps, knapsack_01_steps, validate_knapsack, KNAPSACK_MAX_ITEMS
+from algorithms.other_algorithms import hanoi_steps, hanoi_window_steps, HANOI_MAX_DISKS
+from algorithms.instrument import count_operations
+from algorithms.graph_model import CSRGraph
 
 # Import the validated content dictionaries
-from content import ALGORITHM_CONTENT, DATA_STRUCTURE_INFO
+from content import ALGORITHM_CONTENT, DATA_STRUCTURE_INFO, MESSAGE_TEMPLATES
+import trace_format
+from graph_generator import generate_graph
+from trace_cache import TraceCache, ShortestPathTree, ShortestPathTreeCache, input_digest, trace_handle
+from trace_store import STEP_SEPARATOR, DiskTrace, TraceStore, write_trace
+from datasets import DATASET_KINDS, DatasetRegistry, validate as validate_dataset
+from executor import AlgorithmExecutor, DeadlineExceeded, PoolSaturated, deadline_guard
+from payloads import Payload
 
 app = Flask(__name__)
+# Byte budget for the in-process cache of serialized /run_algorithm responses
+app.config.setdefault('TRACE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+app.config.setdefault('TRACE_CACHE_MAX_ENTRY_BYTES', app.config['TRACE_CACHE_MAX_BYTES'] // 4)
+TRACE_CACHE = TraceCache(app.config['TRACE_CACHE_MAX_BYTES'], app.config['TRACE_CACHE_MAX_ENTRY_BYTES'])
+# Paginated runs: traces written to disk once and served in windows by /traces/<id>/steps.
+# Bounded by disk bytes; without a directory a temporary one is used and removed at exit.
+app.config.setdefault('TRACE_STORE_MAX_BYTES', 4 * 1024 ** 3)
+app.config.setdefault('TRACE_STORE_DIR', None)
+# Most traces kept, however small, and most kept mapped (two file descriptors each) for window reads
+app.config.setdefault('TRACE_STORE_MAX_TRACES', 10_000)
+app.config.setdefault('TRACE_STORE_MAX_OPEN', 32)
+app.config.setdefault('TRACE_WINDOW_MAX_STEPS', 5_000)
+TRACE_STORE = TraceStore(app.config['TRACE_STORE_MAX_BYTES'], app.config['TRACE_STORE_DIR'],
+                         app.config['TRACE_STORE_MAX_TRACES'], app.config['TRACE_STORE_MAX_OPEN'])
+atexit.register(TRACE_STORE.close)
+# Completed shortest-path trees for /shortest_paths, bounded by the total nodes they hold
+app.config.setdefault('TREE_CACHE_MAX_NODES', 5_000_000)
+TREE_CACHE = ShortestPathTreeCache(app.config['TREE_CACHE_MAX_NODES'])
+# Algorithm runs go to a bounded process pool (0 workers runs them inline, e.g. for debugging)
+app.config.setdefault('ALGORITHM_WORKERS', os.cpu_count() or 1)
+app.config.setdefault('ALGORITHM_MAX_QUEUED', app.config['ALGORITHM_WORKERS'])
+# Seconds a run may take, with per-algorithm overrides keyed like ALGORITHM_FUNCTIONS
+app.config.setdefault('ALGORITHM_DEADLINE_S', 10.0)
+app.config.setdefault('ALGORITHM_DEADLINES', {})
+# Extra wait for a worker's answer on top of its deadline before the request gives up
+app.config.setdefault('ALGORITHM_DEADLINE_GRACE_S', 2.0)
+# Largest graph /generate_data will build
+app.config.setdefault('GRAPH_MAX_NODES', 1_000_000)
+# Registered datasets, bounded by their total elements (array items plus distinct values, graph nodes plus edges)
+app.config.setdefault('DATASET_MAX_ITEMS', 20_000_000)
+DATASETS = DatasetRegistry(app.config['DATASET_MAX_ITEMS'])
+# Most targets one /batch_search call may carry, and most of them that get a full step trace
+app.config.setdefault('BATCH_SEARCH_MAX_TARGETS', 100_000)
+app.config.setdefault('BATCH_SEARCH_MAX_TRACES', 20)
+# Most moves one /hanoi_window call returns
+app.config.setdefault('HANOI_WINDOW_MAX_MOVES', 10_000)
+EXECUTOR = AlgorithmExecutor(app.config['ALGORITHM_WORKERS'], app.config['ALGORITHM_MAX_QUEUED'])
 
 # This dictionary maps algorithm keys to their implementation functions
 ALGORITHM_FUNCTIONS = {
     'linear_search': linear_search, 'binary_search': binary_search, 'jump_search': jump_search, 'interpolation_search': interpolation_search,
     'bubble_sort': bubble_sort, 'selection_sort': selection_sort, 'insertion_sort': insertion_sort, 'merge_sort': merge_sort, 'quick_sort': quick_sort,
-    'bst_build': bst_build_steps,
-    'bfs': bfs, 'dfs': dfs, 'dijkstra': dijkstra_steps,
-    'fib_dp': fib_dp_steps,
+    'counting_sort': counting_sort, 'radix_sort': radix_sort, 'bucket_sort': bucket_sort,
+    'bst_build': bst_build_steps, 'avl_tree': avl_tree_steps, 'red_black_tree': red_black_tree_steps, 'tree_traversal': tree_traversal_steps,
+    'bfs': bfs, 'dfs': dfs, 'dijkstra': dijkstra_steps, 'astar': astar_steps, 'bidirectional_dijkstra': bidirectional_dijkstra_steps,
+    'fib_dp': fib_dp_steps, 'fib_tabulation': fib_tabulation_steps, 'fib_matrix': fib_matrix_steps, 'fib_fast_doubling': fib_fast_doubling_steps,
+    'knapsack_01': knapsack_01_steps, 'hanoi': hanoi_steps,
 }
+# Searches that check their input is sorted; a registered dataset already knows
+SORTED_SEARCHES = ('binary_search', 'jump_search', 'interpolation_search')
+# Sorts that index their buckets by value, so they only take integers
+INTEGER_ALGORITHMS = ('counting_sort', 'radix_sort')
+# Conceptual algorithms that take a knapsack instance (capacity, items) instead of n
+KNAPSACK_ALGORITHMS = ('knapsack_01',)
+# Generators that can run headless with record=False for counters mode (see algorithms/instrument.py)
+COUNTED_ALGORITHMS = ('bubble_sort', 'selection_sort', 'insertion_sort', 'merge_sort', 'quick_sort', 'counting_sort', 'radix_sort', 'bucket_sort',
+                      'bfs', 'dfs', 'dijkstra', 'astar', 'bidirectional_dijkstra')
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+# The catalogue is fixed for the life of the process, so its responses are built once.
+# The default /get_content only lists what the menus need; the rest comes per algorithm.
+app.config.setdefault('CONTENT_CACHE_CONTROL', 'public, max-age=300')
+CATALOGUE_FIELDS = ('name', 'category', 'ds', 'options')
+CONTENT_PAYLOADS = {
+    'summary': Payload({
+        "algorithms": {key: {field: info[field] for field in CATALOGUE_FIELDS if field in info} for key, info in ALGORITHM_CONTENT.items()},
+        "data_structures": DATA_STRUCTURE_INFO, "message_templates": MESSAGE_TEMPLATES}),
+    'full': Payload({"algorithms": ALGORITHM_CONTENT, "data_structures": DATA_STRUCTURE_INFO, "message_templates": MESSAGE_TEMPLATES}),
+}
+ALGORITHM_PAYLOADS = {key: Payload(info) for key, info in ALGORITHM_CONTENT.items()}
+
 @app.route('/get_content')
 def get_content():
-    return jsonify({"algorithms": ALGORITHM_CONTENT, "data_structures": DATA_STRUCTURE_INFO})
+    """Names, categories and options of every algorithm ('?detail=full' for the whole catalogue)."""
+    payload = CONTENT_PAYLOADS['full' if request.args.get('detail') == 'full' else 'summary']
+    return payload.response(request, app.config['CONTENT_CACHE_CONTROL'])
+
+@app.route('/algorithms/<key>')
+def algorithm_detail(key):
+    """Everything content.py holds for one algorithm: idea, pseudocode, complexity."""
+    payload = ALGORITHM_PAYLOADS.get(key)
+    if payload is None:
+        return jsonify({'error': f"Algorithm '{key}' not found."}), 404
+    return payload.response(request, app.config['CONTENT_CACHE_CONTROL'])
 
 @app.route('/generate_data', methods=['POST'])
 def generate_data():
     data = request.get_json()
-    size = int(data.get('size', 12))
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send a {'dtype', 'size', ...} object."}), 400
+    try:
+        size = int(data.get('size', 12))
+        if size < 0:
+            raise ValueError(size)
+    except (TypeError, ValueError):
+        return jsonify({'error': "'size' must be a non-negative integer."}), 400
     dtype = data.get('dtype', 'array')
     if dtype == 'array':
         is_sorted = data.get('sorted', False)
         arr = [random.randint(1, 100) for _ in range(size)]
         if is_sorted: arr.sort()
-        return jsonify(arr)
+        return _registered(jsonify(arr), 'array', arr)
     elif dtype == 'tree':
-        return jsonify(random.sample(range(1, 100), k=min(size, 99)))
+        values = random.sample(range(1, 100), k=min(size, 99))
+        return _registered(jsonify(values), 'tree', values)
     elif dtype == 'graph':
-        num_nodes = min(size, 26)
-        nodes, node_ids = {}, [chr(65 + i) for i in range(num_nodes)]
-        width, height, center_x, center_y = 700, 350, 350, 175
-        radius = min(center_x, center_y) * 0.8
-        for i, node_id in enumerate(node_ids):
-            angle = (2 * math.pi / num_nodes) * i
-            nodes[node_id] = {"x": center_x + radius * math.cos(angle), "y": center_y + radius * math.sin(angle)}
-        adj_list = {node_id: [] for node_id in node_ids}
-        num_edges = int(num_nodes * 1.5)
-        # Use a set to prevent trying to add duplicate edges
-        existing_edges = set()
-        for _ in range(num_edges * 5): # More attempts to connect graph
-             u, v = random.sample(node_ids, 2)
-             edge = tuple(sorted((u,v)))
-             if u != v and edge not in existing_edges:
-                weight = random.randint(1, 10)
-                adj_list[u].append({"node": v, "weight": weight})
-                adj_list[v].append({"node": u, "weight": weight})
-                existing_edges.add(edge)
-        return jsonify({"nodes": nodes, "adjacency_list": adj_list})
+        size = min(size, app.config['GRAPH_MAX_NODES'])
+        try:
+            graph = generate_graph(size, family=data.get('family', 'random'), seed=data.get('seed'),
+                                   density=float(data.get('density', 1.5)), labels=data.get('labels', 'auto'),
+                                   weights=data.get('weights', 'random'))
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        return _registered(jsonify(graph), 'graph', graph)
     return jsonify([])
 
+def _registered(response, kind, data):
+    """Registers generated data as a dataset and names it in the X-Dataset-Id header, if the registry kept it."""
+    dataset = DATASETS.register(kind, data)
+    if dataset.id in DATASETS:
+        response.headers['X-Dataset-Id'] = dataset.id
+    return response
+
+@app.route('/datasets', methods=['POST'])
+def upload_dataset():
+    """Registers an uploaded {'kind', 'data'} input, so later runs can send its 'dataset_id' instead."""
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send a {'kind', 'data'} object."}), 400
+    try:
+        dataset = DATASETS.register(data.get('kind', 'array'), data.get('data'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if dataset.id not in DATASETS:
+        return jsonify({'error': f'Dataset of {dataset.size} elements exceeds the registry budget of {DATASETS.max_items}.'}), 413
+    return jsonify(dataset.describe()), 201
+
+@app.route('/datasets/stats')
+def dataset_stats():
+    return jsonify(DATASETS.stats())
+
+@app.route('/datasets/<dataset_id>')
+def describe_dataset(dataset_id):
+    dataset = DATASETS.get(dataset_id)
+    if dataset is None:
+        return jsonify({'error': f"Unknown or expired dataset '{dataset_id}'."}), 404
+    return jsonify(dataset.describe())
+
+# Streaming encodings for /run_algorithm, picked by the 'stream' field or the Accept header
+STREAM_MIMETYPES = {'ndjson': 'application/x-ndjson', 'sse': 'text/event-stream'}
+# Opt-in compact encoding, only chosen through the Accept header
+COLUMNAR_MIMETYPE = trace_format.MIMETYPE
+
+def algorithm_options(key, data):
+    """Returns the request's 'options', checked against those content.py declares for `key`."""
+    declared = ALGORITHM_CONTENT[key].get('options', {})
+    options = dict(data.get('options') or {})
+    for name, value in options.items():
+        if name not in declared:
+            raise ValueError(f"Unknown option '{name}' for {key}.")
+        if value not in declared[name]:
+            raise ValueError(f"Option '{name}' must be one of: {', '.join(map(str, declared[name]))}.")
+    return options
+
+def knapsack_input(data):
+    """
+    Returns the request's (capacity, items), checked. Without 'items', `n` random
+    items are generated from 'seed' (n itself by default, so a request always
+    names the same instance) and the capacity defaults to half their weight.
+    """
+    items = data.get('items')
+    capacity = data.get('capacity')
+    if items is None:
+        n = int(data.get('n', 5))
+        if not 0 <= n <= KNAPSACK_MAX_ITEMS:
+            # Checked before the items are generated, which would otherwise take the time and memory
+            raise ValueError(f"'n' must be between 0 and {KNAPSACK_MAX_ITEMS}.")
+        rng = random.Random(data.get('seed', n))
+        items = [{'weight': rng.randint(1, 20), 'value': rng.randint(1, 50)} for _ in range(n)]
+        if capacity is None:
+            capacity = sum(item['weight'] for item in items) // 2
+    validate_knapsack(capacity, items)
+    return capacity, items
+
+def build_steps(key, data, source=None, record=True):
+    """
+    Returns the step generator for `key`, called with the request fields its category expects.
+    `source` is a registered dataset's `run_input()`, used in place of the request's input_data.
+    Without `record`, generators that support it yield only what count_operations tallies.
+    """
+    func = ALGORITHM_FUNCTIONS[key]
+    options = algorithm_options(key, data)
+    if not record and key in COUNTED_ALGORITHMS:
+        options['record'] = False
+    input_data, is_sorted = source if source is not None else (data.get('input_data'), None)
+    # Use the robust 'category' and 'ds' keys from content.py for routing
+    algo_info = ALGORITHM_CONTENT[key]
+    if algo_info['category'] == 'Searching':
+        if is_sorted is not None and key in SORTED_SEARCHES:
+            options['is_sorted'] = is_sorted
+        return func(input_data, int(data.get('target')), **options)
+    elif algo_info['ds'] == 'graph':
+        # The compact graph is built once here (or at registration) and shared by the whole run
+        graph = CSRGraph.from_graph_data(input_data)
+        if algo_info['category'] == 'Shortest Path':
+            return func(graph, data.get('start_node'), data.get('end_node'), **options)
+        return func(graph, data.get('start_node'), **options)
+    elif key in KNAPSACK_ALGORITHMS:
+        return func(*knapsack_input(data), **options)
+    elif algo_info['ds'] == 'conceptual':
+        return func(int(data.get('n', 5)), **options)
+    else: # Covers all other cases like sorting, bst_build
+        return func(input_data, **options)
+
+def render_messages(steps):
+    """Fills in each step's 'message' from its template, for clients that do not render them."""
+    for step in steps:
+        if 'message_id' in step:
+            step['message'] = MESSAGE_TEMPLATES[step['message_id']].format(*step.get('message_args', ()))
+        yield step
+
+def _deadline_for(key):
+    return app.config['ALGORITHM_DEADLINES'].get(key, app.config['ALGORITHM_DEADLINE_S'])
+
+def _serialize_trace(key, data, fmt, deadline, source=None):
+    """Pool job: builds the whole trace for `key` and returns its serialized (body, mimetype)."""
+    steps = deadline_guard(build_steps(key, data, source), deadline)
+    if data.get('render_messages'):
+        steps = render_messages(steps)
+    if fmt == 'columnar':
+        return trace_format.encode_columnar(steps), COLUMNAR_MIMETYPE
+    return (app.json.dumps({'steps': list(steps)}) + '\n').encode('utf-8'), 'application/json'
+
+def _record_trace(key, data, deadline, path, source=None):
+    """Pool job: runs `key` once, writing its trace to `path`; returns the DiskTrace that reads it."""
+    steps = deadline_guard(build_steps(key, data, source), deadline)
+    if data.get('render_messages'):
+        steps = render_messages(steps)
+    return write_trace(steps, path)
+
+def _count_trace(key, data, deadline, source=None):
+    """Pool job: tallies the operation counters for `key` without keeping the trace."""
+    return count_operations(deadline_guard(build_steps(key, data, source, record=False), deadline))
+
+def _build_tree(graph_data, start_node, deadline):
+    """Pool job: the full shortest-path tree from `start_node`, under the same deadline as a run."""
+    graph = CSRGraph.from_graph_data(graph_data)
+    distances, predecessors = shortest_path_tree(graph, graph.index[start_node], guard=lambda nodes: deadline_guard(nodes, deadline))
+    return ShortestPathTree(start_node, graph.labels, distances, predecessors)
+
+def _response_format(data):
+    """Returns 'json' (the default), 'ndjson', 'sse' or 'columnar' for this request."""
+    if data.get('stream') in STREAM_MIMETYPES:
+        return data['stream']
+    best = request.accept_mimetypes.best_match(['application/json', *STREAM_MIMETYPES.values(), COLUMNAR_MIMETYPE])
+    if best == COLUMNAR_MIMETYPE:
+        return 'columnar'
+    for fmt, mimetype in STREAM_MIMETYPES.items():
+        if best == mimetype:
+            return fmt
+    return 'json'
+
+def _stream_chunks(key, data, fmt, deadline, source=None):
+    """Pool job for a streamed run: serializes each step as soon as the generator produces it."""
+    template = 'data: {}\n\n' if fmt == 'sse' else '{}\n'
+    steps = deadline_guard(build_steps(key, data, source), deadline)
+    if data.get('render_messages'):
+        steps = render_messages(steps)
+    for step in steps:
+        yield template.format(json.dumps(step, separators=(',', ':')))
+
+def _stream_steps(key, chunks, fmt, deadline, cache_key=None):
+    """Relays a streamed run's chunks as they arrive from its worker, caching the full body if it fits."""
+    template = 'data: {}\n\n' if fmt == 'sse' else '{}\n'
+    kept, size = [], 0
+    try:
+        for chunk in chunks:
+            if kept is not None:
+                kept.append(chunk)
+                size += len(chunk)
+                if size > TRACE_CACHE.max_entry_bytes:
+                    kept = None # Too big to cache; stop holding on to the trace
+            yield chunk
+    except Exception as e:
+        # Headers are already sent, so the failure is reported as a final step
+        error = {'action': 'error', 'message': str(e)}
+        if isinstance(e, DeadlineExceeded):
+            error['partial_steps'] = e.steps
+        elif isinstance(e, FutureTimeoutError):
+            error.update(message=f'Algorithm did not finish within {deadline:g}s.', timeout=True)
+        else:
+            app.logger.exception('Streaming %s failed', key)
+        yield template.format(json.dumps(error))
+        return
+    if cache_key is not None and kept is not None:
+        TRACE_CACHE.put(cache_key, ''.join(kept).encode('utf-8'), STREAM_MIMETYPES[fmt])
+
 @app.route('/run_algorithm', methods=['POST'])
 def run_algorithm():
     data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send an {'algorithm', ...} object."}), 400
     key = data.get('algorithm')
     if not key or key not in ALGORITHM_FUNCTIONS:
         return jsonify({'error': f"Algorithm '{key}' not found or is not implemented."}), 400
+    try:
+        algorithm_options(key, data)
+        if key in KNAPSACK_ALGORITHMS:
+            knapsack_input(data)
+        elif data.get('dataset_id') is None and ALGORITHM_CONTENT[key]['ds'] in DATASET_KINDS:
+            # Checked here, so a malformed input is a 400 rather than a TypeError in the worker
+            validate_dataset(ALGORITHM_CONTENT[key]['ds'], data.get('input_data'))
+            if key in INTEGER_ALGORITHMS and not all(type(value) is int for value in data['input_data']):
+                raise ValueError(f'{ALGORITHM_CONTENT[key]["name"]} only sorts integers.')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    source = None
+    if data.get('dataset_id') is not None:
+        dataset = DATASETS.get(data['dataset_id'])
+        if dataset is None:
+            return jsonify({'error': f"Unknown or expired dataset '{data['dataset_id']}'. Send input_data or register it again."}), 404
+        if dataset.kind != ALGORITHM_CONTENT[key]['ds']:
+            return jsonify({'error': f"{key} runs on {ALGORITHM_CONTENT[key]['ds']} data, but dataset '{dataset.id}' holds {dataset.kind} data."}), 400
+        if key in INTEGER_ALGORITHMS and not dataset.integers:
+            return jsonify({'error': f"{ALGORITHM_CONTENT[key]['name']} only sorts integers, but dataset '{dataset.id}' holds other numbers."}), 400
+        source = dataset.run_input()
     
-    func = ALGORITHM_FUNCTIONS[key]
+    deadline = _deadline_for(key)
+    timeout = deadline + app.config['ALGORITHM_DEADLINE_GRACE_S']
     try:
-        # Use the robust 'category' and 'ds' keys from content.py for routing
-        algo_info = ALGORITHM_CONTENT[key]
-        if algo_info['category'] == 'Searching':
-            return jsonify({'steps': func(data.get('input_data'), int(data.get('target')))})
-        elif key == 'dijkstra':
-            return jsonify({'steps': func(data.get('input_data'), data.get('start_node'), data.get('end_node'))})
-        elif algo_info['category'] in ['Graph Traversal', 'Shortest Path']:
-            return jsonify({'steps': func(data.get('input_data'), data.get('start_node'))})
-        elif algo_info['ds'] == 'conceptual':
-            return jsonify({'steps': func(int(data.get('n', 5)))})
-        else: # Covers all other cases like sorting, bst_build
-            return jsonify({'steps': func(data.get('input_data'))})
+        if data.get('instrument') == 'counters':
+            # Headless run for large inputs: operation counters and wall time, no trace
+            return jsonify({'algorithm': key, **EXECUTOR.run(_count_trace, key, data, deadline, source, timeout=timeout)})
+
+        if data.get('paginate'):
+            # Only a handle goes back; the client pages through /traces/<id>/steps
+            trace_id = trace_handle(key, data)
+            trace = TRACE_STORE.get(trace_id)
+            if trace is None:
+                # A recording that finishes after the timeout is deleted rather than left on disk
+                trace = EXECUTOR.run(_record_trace, key, data, deadline, TRACE_STORE.new_path(), source, timeout=timeout, abandoned=DiskTrace.remove)
+                if not TRACE_STORE.put(trace_id, trace):
+                    return jsonify({'error': f'Trace of {trace.size} bytes exceeds the trace store budget of {TRACE_STORE.max_bytes}.'}), 413
+            return jsonify({'algorithm': key, 'trace_id': trace_id, 'total_steps': trace.total, 'checkpoint_interval': trace.interval})
+
+        fmt = _response_format(data)
+        # The stored bytes depend on the encoding as well as on the inputs
+        cache_key = (key, input_digest(data), fmt, bool(data.get('render_messages')))
+        cached = TRACE_CACHE.get(cache_key)
+        if cached is not None:
+            body, mimetype = cached
+            return Response(body, mimetype=mimetype, headers={'X-Trace-Cache': 'hit'})
+
+        if fmt in STREAM_MIMETYPES:
+            # A pool worker serializes the steps and sends them over as they are produced; this thread only relays them
+            chunks = EXECUTOR.stream(_stream_chunks, key, data, fmt, deadline, source, timeout=timeout)
+            response = Response(stream_with_context(_stream_steps(key, chunks, fmt, deadline, cache_key)), mimetype=STREAM_MIMETYPES[fmt])
+        else:
+            body, mimetype = EXECUTOR.run(_serialize_trace, key, data, fmt, deadline, source, timeout=timeout)
+            response = Response(body, mimetype=mimetype)
+            TRACE_CACHE.put(cache_key, body, mimetype)
+        response.headers['X-Trace-Cache'] = 'miss'
+        return response
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True, 'partial_steps': e.steps, 'deadline_s': e.deadline}), 504
+    except FutureTimeoutError:
+        # The worker did not even report back; no step count is known
+        return jsonify({'error': f'Algorithm did not finish within {deadline:g}s.', 'timeout': True,
+                        'partial_steps': None, 'deadline_s': deadline}), 504
+    except PoolSaturated as e:
+        return jsonify({'error': str(e), 'executor': EXECUTOR.stats()}), 503, {'Retry-After': '1'}
     except Exception as e:
-        print(f"ERROR executing {key}: {e}")
+        app.logger.exception('Running %s failed', key)
         return jsonify({'error': str(e)}), 500
 
-if __name__ == '__main__': jsonify({'error': 'Server error during algorithm execution.'}), 500
+@app.route('/traces/<trace_id>/steps')
+def trace_window(trace_id):
+    """
+    Steps from..from+count-1 of a paginated run, with 'snapshots': the snapshot
+    state just before 'from', so playback can start there.
+    """
+    try:
+        start, count = int(request.args.get('from', 0)), int(request.args.get('count', 500))
+    except ValueError:
+        return jsonify({'error': "'from' and 'count' must be integers."}), 400
+    if start < 0 or not 0 <= count <= app.config['TRACE_WINDOW_MAX_STEPS']:
+        return jsonify({'error': f"'from' must be non-negative and 'count' between 0 and {app.config['TRACE_WINDOW_MAX_STEPS']}."}), 400
+    trace = TRACE_STORE.open(trace_id)
+    try:
+        if trace is None:
+            raise FileNotFoundError(trace_id)
+        lines, snapshots = trace.window(start, count)
+    except FileNotFoundError:
+        # Unknown, or closed to make room for other reads and then evicted in between
+        return jsonify({'error': f"Unknown or expired trace '{trace_id}'. Run the algorithm again."}), 404
+    # The stored lines are already JSON array items and `lines` is a view of the mapping: they are neither
+    # decoded nor re-encoded, and joining them into the body (WSGI only carries bytes) is their one copy
+    head = app.json.dumps({'trace_id': trace_id, 'from': start, 'total_steps': trace.total, 'snapshots': snapshots})
+    body = b''.join((head[:-1].encode('utf-8'), b',"steps":[', lines[:-len(STEP_SEPARATOR)], b']}\n'))
+    return Response(body, mimetype='application/json')
+
+@app.route('/traces/stats')
+def trace_stats():
+    return jsonify(TRACE_STORE.stats())
+
+def _batch_search(key, values, targets, is_sorted, positions, traced, rendered, deadline):
+    """Pool job: answers every target, then builds the full traces of the `traced` ones."""
+    answers, errors = {}, {}
+    answered = batch_search(ALGORITHM_FUNCTIONS[key], values, targets, is_sorted, positions)
+    for target, index, comparisons, error in deadline_guard(answered, deadline):
+        answers[target] = (index, comparisons)
+        if error is not None:
+            errors[target] = error
+    indices = [answers[t][0] for t in targets]
+    comparisons = [answers[t][1] for t in targets]
+    # Failed targets are reported under 'errors' and left out of the statistics
+    kept = [k for k, t in enumerate(targets) if t not in errors]
+    summary = _comparison_summary([indices[k] for k in kept], [comparisons[k] for k in kept])
+    traces = []
+    for target in traced:
+        trace = {'target': target, 'steps': []}
+        try:
+            steps = build_steps(key, {'target': target}, (values, True))
+            trace['steps'].extend(render_messages(steps) if rendered else steps)
+        except Exception as e:
+            trace['error'] = f'{type(e).__name__}: {e}'
+        traces.append(trace)
+    return {'indices': indices, 'comparisons': comparisons, 'errors': [{'target': t, 'error': e} for t, e in errors.items()],
+            'summary': summary, 'traces': traces}
+
+def _comparison_summary(indices, comparisons):
+    """Aggregate comparison statistics over a batch, split by found and not-found targets."""
+    def describe(counts):
+        if not counts:
+            return None
+        ordered = sorted(counts)
+        return {'total': sum(ordered), 'mean': sum(ordered) / len(ordered), 'min': ordered[0],
+                'median': ordered[len(ordered) // 2], 'max': ordered[-1]}
+    found = [c for i, c in zip(indices, comparisons) if i is not None]
+    missing = [c for i, c in zip(indices, comparisons) if i is None]
+    return {'targets': len(comparisons), 'found': len(found), 'not_found': len(missing),
+            'comparisons': describe(comparisons), 'comparisons_found': describe(found), 'comparisons_not_found': describe(missing)}
+
+@app.route('/batch_search', methods=['POST'])
+def batch_search_route():
+    """
+    Runs one Searching algorithm for many targets against the same array. Returns,
+    aligned with 'targets', the found index (or null) and comparison count of
+    each, aggregate statistics, and full step traces for up to 'trace_sample'
+    randomly chosen targets ('seed' makes the choice repeatable).
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send an {'algorithm', 'targets', ...} object."}), 400
+    key = data.get('algorithm')
+    if key not in ALGORITHM_FUNCTIONS or ALGORITHM_CONTENT[key]['category'] != 'Searching':
+        return jsonify({'error': f"'{key}' is not a searching algorithm."}), 400
+    try:
+        targets = [int(t) for t in data.get('targets') or []]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Targets must be integers.'}), 400
+    if not targets or len(targets) > app.config['BATCH_SEARCH_MAX_TARGETS']:
+        return jsonify({'error': f"Send between 1 and {app.config['BATCH_SEARCH_MAX_TARGETS']} targets."}), 400
+    if data.get('dataset_id') is not None:
+        dataset = DATASETS.get(data['dataset_id'])
+        if dataset is None or dataset.kind != 'array':
+            return jsonify({'error': f"Unknown or expired array dataset '{data['dataset_id']}'."}), 404
+        values, is_sorted = dataset.run_input()
+        # Only linear search reads the first-index map, so only it pays to send it to the worker
+        positions = dataset.positions if key == 'linear_search' else None
+    else:
+        values, is_sorted, positions = data.get('input_data') or [], None, None
+        try:
+            validate_dataset('array', values)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    try:
+        sample = min(int(data.get('trace_sample', 0)), app.config['BATCH_SEARCH_MAX_TRACES'], len(targets))
+        traced = [targets[i] for i in sorted(random.Random(data.get('seed')).sample(range(len(targets)), sample))]
+    except (TypeError, ValueError):
+        return jsonify({'error': "'trace_sample' must be a non-negative integer and 'seed' a number or string."}), 400
+
+    deadline = _deadline_for(key)
+    try:
+        result = EXECUTOR.run(_batch_search, key, values, targets, is_sorted, positions, traced, bool(data.get('render_messages')),
+                              deadline, timeout=deadline + app.config['ALGORITHM_DEADLINE_GRACE_S'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True, 'deadline_s': e.deadline}), 504
+    except FutureTimeoutError:
+        return jsonify({'error': f'Batch did not finish within {deadline:g}s.', 'timeout': True, 'deadline_s': deadline}), 504
+    except PoolSaturated as e:
+        return jsonify({'error': str(e), 'executor': EXECUTOR.stats()}), 503, {'Retry-After': '1'}
+    except Exception as e:
+        app.logger.exception('Batch search with %s failed', key)
+        return jsonify({'error': str(e)}), 500
+    return jsonify({'algorithm': key, 'targets': targets, **result})
+
+@app.route('/hanoi_window', methods=['POST'])
+def hanoi_window():
+    """
+    Moves start+1..start+count of the n-disk Tower of Hanoi solution, after a
+    step that sets up the towers as they stand at move 'start'. Moves are
+    computed from their numbers, so scrubbing anywhere in a solution of up to
+    HANOI_MAX_DISKS disks costs O(n + count).
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send an {'n', 'start', 'count'} object."}), 400
+    try:
+        n, start, count = int(data.get('n', 3)), int(data.get('start', 0)), int(data.get('count', 100))
+    except (TypeError, ValueError):
+        return jsonify({'error': "'n', 'start' and 'count' must be integers."}), 400
+    if not 0 <= n <= HANOI_MAX_DISKS:
+        return jsonify({'error': f'Choose between 0 and {HANOI_MAX_DISKS} disks.'}), 400
+    total = (1 << n) - 1
+    if not 0 <= start <= total:
+        return jsonify({'error': f'Start must be a move between 0 and {total}.'}), 400
+    if not 0 <= count <= app.config['HANOI_WINDOW_MAX_MOVES']:
+        return jsonify({'error': f"Count must be between 0 and {app.config['HANOI_WINDOW_MAX_MOVES']}."}), 400
+    steps = hanoi_window_steps(n, start, count)
+    if data.get('render_messages'):
+        steps = render_messages(steps)
+    return jsonify({'n': n, 'start': start, 'total_moves': total, 'steps': list(steps)})
+
+@app.route('/shortest_paths', methods=['POST'])
+def shortest_paths():
+    """
+    Answers many (start_node, end_node) queries on one graph without animation.
+    The first query from a source stores its whole shortest-path tree; later ones
+    from the same source just walk its predecessor map.
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': "Send an {'input_data', 'start_node', 'end_nodes'} object."}), 400
+    graph_data, start_node = data.get('input_data'), data.get('start_node')
+    end_nodes = data.get('end_nodes') or [data.get('end_node')]
+    if not isinstance(end_nodes, list) or not all(isinstance(node, str) for node in end_nodes):
+        return jsonify({'error': "Send 'end_node' or 'end_nodes' as node labels."}), 400
+    if data.get('dataset_id') is not None:
+        dataset = DATASETS.get(data['dataset_id'])
+        if dataset is None or dataset.kind != 'graph':
+            return jsonify({'error': f"Unknown or expired graph dataset '{data['dataset_id']}'."}), 404
+        # A registered graph is already compact, and its id already identifies it
+        graph_data, graph_digest = dataset.graph, dataset.id
+        nodes = graph_data
+    else:
+        if not isinstance(graph_data, dict) or not isinstance(graph_data.get('adjacency_list'), dict):
+            return jsonify({'error': "'input_data' must be a graph with an 'adjacency_list'."}), 400
+        graph_digest = input_digest(data, fields=('input_data',))
+        nodes = graph_data['adjacency_list']
+    try:
+        if start_node not in nodes:
+            return jsonify({'error': f"Start node '{start_node}' not in graph."}), 400
+        tree = TREE_CACHE.get(graph_digest, start_node)
+        cache_status = 'hit' if tree is not None else 'miss'
+        if tree is None:
+            deadline = _deadline_for('dijkstra')
+            tree = EXECUTOR.run(_build_tree, graph_data, start_node, deadline, timeout=deadline + app.config['ALGORITHM_DEADLINE_GRACE_S'])
+            TREE_CACHE.put(graph_digest, tree)
+        paths = {}
+        for end_node in end_nodes:
+            # Unknown and unreachable end nodes both come back as null
+            distance, path = tree.path_to(end_node) if end_node in tree.index else (None, None)
+            paths[end_node] = None if path is None else {'distance': distance, 'path': path}
+    except (KeyError, TypeError, ValueError) as e:
+        # Malformed adjacency entries, non-numeric weights or unhashable node labels
+        return jsonify({'error': f'Malformed graph or query: {e}'}), 400
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True, 'deadline_s': e.deadline}), 504
+    except FutureTimeoutError:
+        return jsonify({'error': 'Shortest-path tree did not finish in time.', 'timeout': True}), 504
+    except PoolSaturated as e:
+        return jsonify({'error': str(e), 'executor': EXECUTOR.stats()}), 503, {'Retry-After': '1'}
+
+    response = jsonify({'start_node': start_node, 'paths': paths})
+    response.headers['X-Tree-Cache'] = cache_status
+    return response
+
+@app.route('/tree_cache/stats')
+def tree_cache_stats():
+    return jsonify(TREE_CACHE.stats())
+
+@app.route('/trace_cache/stats')
+def trace_cache_stats():
+    return jsonify(TRACE_CACHE.stats())
+
+@app.route('/executor/stats')
+def executor_stats():
+    return jsonify(EXECUTOR.stats())
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,317 @@
+# benchmark.py
+#
+# Empirical complexity benchmark for every entry of ALGORITHM_FUNCTIONS.
+# Each algorithm is run over doubling input sizes and several input
+# distributions; wall time, step count and peak traced memory are recorded,
+# the growth exponent is fitted on a log-log scale (log2 against n for
+# exponential bounds) and compared with the complexity declared in
+# content.py. Results are printed as JSON.
+#
+#   python benchmark.py --max-size 4096 --output bench.json
+#   python benchmark.py --baseline bench.json      # flag regressions against a previous run
+
+import argparse
+import heapq
+import json
+import math
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+from app import ALGORITHM_FUNCTIONS, KNAPSACK_ALGORITHMS, build_steps
+from content import ALGORITHM_CONTENT
+from algorithms.other_algorithms import FIB_DP_MAX_N, FIB_BIG_MAX_N, HANOI_TRACE_MAX_DISKS
+
+DISTRIBUTIONS = ('random', 'sorted', 'reversed', 'few_unique')
+
+# Slack around the declared exponent. A log factor over doubling sizes shows up
+# as a slightly larger slope, so declarations with a log get extra headroom.
+EXPONENT_TOLERANCE = 0.2
+LOG_TOLERANCE = 0.35
+
+# Largest n the conceptual algorithms accept
+SIZE_CAPS = {
+    'fib_dp': FIB_DP_MAX_N,
+    'fib_tabulation': FIB_BIG_MAX_N,
+    'fib_matrix': FIB_BIG_MAX_N,
+    'fib_fast_doubling': FIB_BIG_MAX_N,
+    'hanoi': HANOI_TRACE_MAX_DISKS,
+}
+# Searches that stop once their frontiers meet. On the generated graphs the two
+# balls of radius d/2 hold about √V nodes, so only the declared worst case bounds
+# the fitted exponent; there is no lower bound to hold them to
+UPPER_BOUND_ONLY = {'bidirectional_dijkstra'}
+# Exponential bounds are fitted as log2(value) against n itself; the slope is log2 of the base
+EXPONENTIAL_BASES = {'2^n': 2}
+# Knapsack runs keep W fixed, so their O(nW) bound grows with n alone
+KNAPSACK_CAPACITY = 1_000
+
+
+def parse_complexity(notation):
+    """Turns 'O(n log n)', 'O(n^2)', 'O(√n)', 'O(V+E)', 'O(n + k)' ... into (exponent, has_log)."""
+    body = notation.strip()[2:-1].replace(' ', '')
+    if body == '1':
+        return 0.0, False
+    # Exponential bounds have no log-log slope to compare against; see EXPONENTIAL_BASES
+    if body in EXPONENTIAL_BASES:
+        return None, False
+    if re.fullmatch(r'(log)+n', body) or body == 'loglogn':
+        return 0.0, True
+    if body == '√n':
+        return 0.5, False
+    match = re.fullmatch(r'n(\^(\d+))?(logn)?', body)
+    if match:
+        return float(match.group(2) or 1), bool(match.group(3))
+    # Integer sorts: the value range k and base b stay within a constant factor
+    # of n on generated arrays, and the digit count d grows like log n
+    if body == 'n+k':
+        return 1.0, False
+    if body == 'd(n+b)':
+        return 1.0, True
+    if body == 'nW':
+        return 1.0, False
+    # Graph bounds: V and E both grow linearly with the node count we double
+    if 'V' in body or 'E' in body:
+        return 1.0, 'log' in body
+    raise ValueError(f'Unrecognised complexity notation: {notation}')
+
+
+def make_array(size, distribution, rng):
+    if distribution == 'few_unique':
+        return [rng.randint(1, 4) for _ in range(size)]
+    # The value range grows with n, so the k of the integer sorts stays proportional to it
+    arr = [rng.randint(1, 4 * size) for _ in range(size)]
+    if distribution == 'sorted':
+        arr.sort()
+    elif distribution == 'reversed':
+        arr.sort(reverse=True)
+    return arr
+
+
+def make_graph(size, rng):
+    """A connected random graph with `size` nodes and about 1.5 * size weighted edges."""
+    labels = [str(i) for i in range(size)]
+    adjacency = {label: [] for label in labels}
+    edges = set()
+    # A random spanning tree first, so every node is reachable from node 0
+    for i in range(1, size):
+        edges.add((rng.randrange(i), i))
+    while len(edges) < min(int(size * 1.5), size * (size - 1) // 2):
+        u, v = sorted(rng.sample(range(size), 2))
+        edges.add((u, v))
+    for u, v in edges:
+        weight = rng.randint(1, 10)
+        adjacency[labels[u]].append({'node': labels[v], 'weight': weight})
+        adjacency[labels[v]].append({'node': labels[u], 'weight': weight})
+    nodes = {label: {'x': rng.random() * 700, 'y': rng.random() * 350} for label in labels}
+    return {'nodes': nodes, 'adjacency_list': adjacency}
+
+
+def farthest_node(graph, start):
+    """The node with the largest weighted distance from `start`, so searches that stop at their goal still cover the graph."""
+    adjacency = graph['adjacency_list']
+    distances, pq = {start: 0}, [(0, start)]
+    while pq:
+        distance, u = heapq.heappop(pq)
+        if distance > distances[u]:
+            continue
+        for edge in adjacency[u]:
+            candidate = distance + edge['weight']
+            if candidate < distances.get(edge['node'], math.inf):
+                distances[edge['node']] = candidate
+                heapq.heappush(pq, (candidate, edge['node']))
+    return max(distances, key=distances.get)
+
+
+def make_request(key, size, distribution, rng):
+    """Builds the /run_algorithm payload for one benchmark run."""
+    info = ALGORITHM_CONTENT[key]
+    if info['ds'] == 'graph':
+        graph = make_graph(size, rng)
+        return {'algorithm': key, 'input_data': graph, 'start_node': '0', 'end_node': farthest_node(graph, '0')}
+    if key in KNAPSACK_ALGORITHMS:
+        return {'algorithm': key, 'n': size, 'capacity': KNAPSACK_CAPACITY}
+    if info['ds'] == 'conceptual':
+        return {'algorithm': key, 'n': size}
+    arr = make_array(size, distribution, rng)
+    if info['category'] == 'Searching':
+        # Searching for the largest value keeps the probe count deterministic
+        arr.sort()
+        return {'algorithm': key, 'input_data': arr, 'target': arr[-1]}
+    return {'algorithm': key, 'input_data': arr}
+
+
+def measure(data, track_memory):
+    """Runs one request, returning its step count, wall time and traced peak memory."""
+    start = time.perf_counter()
+    steps = sum(1 for _ in build_steps(data['algorithm'], data))
+    wall_time = time.perf_counter() - start
+    result = {'steps': steps, 'wall_time_s': wall_time}
+    if track_memory:
+        # A second, traced run; the trace is materialized as the JSON response path does
+        tracemalloc.start()
+        trace = list(build_steps(data['algorithm'], data))
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del trace
+    return result
+
+
+def fit_exponent(points, exponential=False):
+    """Least-squares slope of log(value) against log(size), or of log2(value) against size when `exponential`."""
+    points = [(n if exponential else math.log(n), math.log2(v) if exponential else math.log(v)) for n, v in points if n > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def check_declared(key, distribution, exponent):
+    """Compares a fitted step-count exponent with the complexity declared in content.py."""
+    complexity = ALGORITHM_CONTENT[key]['complexity']
+    base = exponential_base(key)
+    if base is not None:
+        expected = math.log2(base)
+        low, high = expected - EXPONENT_TOLERANCE, expected + EXPONENT_TOLERANCE
+        return {'declared': complexity['time_worst'], 'expected_range': [round(low, 2), round(high, 2)],
+                'status': 'ok' if low <= exponent <= high else 'mismatch'}
+    best, best_log = parse_complexity(complexity['time_best'])
+    worst, worst_log = parse_complexity(complexity['time_worst'])
+    declared = complexity['time_avg'] if distribution == 'random' else f"{complexity['time_best']} .. {complexity['time_worst']}"
+    if distribution == 'random':
+        best, best_log = worst, worst_log = parse_complexity(complexity['time_avg'])
+        # A random input may still land between the best and the average case
+        best = min(best, parse_complexity(complexity['time_best'])[0])
+    high = worst + EXPONENT_TOLERANCE + (LOG_TOLERANCE if worst_log else 0)
+    if key in UPPER_BOUND_ONLY:
+        return {'declared': declared, 'expected_range': [None, round(high, 2)],
+                'status': 'ok' if exponent <= high else 'mismatch'}
+    low = best - EXPONENT_TOLERANCE
+    return {'declared': declared, 'expected_range': [round(low, 2), round(high, 2)],
+            'status': 'ok' if low <= exponent <= high else 'mismatch'}
+
+
+def exponential_base(key):
+    """The base b of a declared O(b^n) worst case, or None for polynomial bounds."""
+    notation = ALGORITHM_CONTENT[key]['complexity']['time_worst'].strip()[2:-1].replace(' ', '')
+    return EXPONENTIAL_BASES.get(notation)
+
+
+def sizes_for(key, min_size, max_size):
+    cap = SIZE_CAPS.get(key)
+    if exponential_base(key) is not None:
+        # Doubling n would square the run time; step n by one from 1 instead
+        return list(range(1, min(max_size, cap or max_size) + 1))
+    sizes, size = [], min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 2
+    if cap is not None:
+        sizes = [s for s in sizes if s <= cap] or [min(min_size, cap)]
+    return sizes
+
+
+def run_benchmark(keys, min_size, max_size, max_seconds, seed, track_memory):
+    report = {'seed': seed, 'min_size': min_size, 'max_size': max_size, 'python': sys.version.split()[0],
+              'runs': [], 'fits': []}
+    for key in keys:
+        info = ALGORITHM_CONTENT[key]
+        # Searches always run on sorted input, so only sorts and trees vary the distribution
+        varies = info['ds'] == 'tree' or info['category'] == 'Sorting'
+        distributions = DISTRIBUTIONS if varies else ('random',)
+        for distribution in distributions:
+            rng = random.Random(f'{seed}:{key}:{distribution}')
+            points, error = [], None
+            for size in sizes_for(key, min_size, max_size):
+                data = make_request(key, size, distribution, rng)
+                try:
+                    result = measure(data, track_memory)
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                    report['runs'].append({'algorithm': key, 'distribution': distribution, 'size': size, 'error': error})
+                    break
+                report['runs'].append({'algorithm': key, 'distribution': distribution, 'size': size, **result})
+                points.append((size, result))
+                # Quadratic algorithms get slow quickly; stop doubling once a run is too long
+                if result['wall_time_s'] > max_seconds:
+                    break
+
+            fit = {'algorithm': key, 'distribution': distribution, 'sizes': [n for n, _ in points]}
+            exponential = exponential_base(key) is not None
+            steps_exponent = fit_exponent([(n, r['steps']) for n, r in points], exponential)
+            time_exponent = fit_exponent([(n, r['wall_time_s']) for n, r in points], exponential)
+            fit['steps_exponent'] = None if steps_exponent is None else round(steps_exponent, 3)
+            fit['time_exponent'] = None if time_exponent is None else round(time_exponent, 3)
+            if error:
+                fit['status'] = 'error'
+                fit['error'] = error
+            elif steps_exponent is None:
+                fit['status'] = 'insufficient_data'
+            else:
+                fit.update(check_declared(key, distribution, steps_exponent))
+            report['fits'].append(fit)
+    return report
+
+
+def compare_with_baseline(report, baseline, time_tolerance):
+    """Flags runs whose step count changed or whose wall time grew beyond the tolerance."""
+    previous = {(r['algorithm'], r['distribution'], r['size']): r for r in baseline['runs'] if 'steps' in r}
+    regressions = []
+    for run in report['runs']:
+        old = previous.get((run['algorithm'], run['distribution'], run['size']))
+        if old is None or 'steps' not in run:
+            continue
+        if run['steps'] != old['steps']:
+            regressions.append({**{k: run[k] for k in ('algorithm', 'distribution', 'size')},
+                                'metric': 'steps', 'baseline': old['steps'], 'current': run['steps']})
+        if run['wall_time_s'] > old['wall_time_s'] * (1 + time_tolerance) and run['wall_time_s'] > 0.01:
+            regressions.append({**{k: run[k] for k in ('algorithm', 'distribution', 'size')},
+                                'metric': 'wall_time_s', 'baseline': old['wall_time_s'], 'current': run['wall_time_s']})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark step generators against their declared complexity.')
+    parser.add_argument('--algorithms', nargs='*', default=list(ALGORITHM_FUNCTIONS), help='Algorithm keys to run (default: all).')
+    parser.add_argument('--min-size', type=int, default=16)
+    parser.add_argument('--max-size', type=int, default=2048)
+    parser.add_argument('--max-seconds', type=float, default=2.0, help='Stop doubling once a single run takes longer than this.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass.')
+    parser.add_argument('--baseline', help='A previous JSON report to compare against.')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='Allowed relative wall-time growth against the baseline.')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    args = parser.parse_args(argv)
+
+    unknown = [key for key in args.algorithms if key not in ALGORITHM_FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown algorithm(s): {', '.join(unknown)}")
+
+    report = run_benchmark(args.algorithms, args.min_size, args.max_size, args.max_seconds, args.seed, not args.no_memory)
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = compare_with_baseline(report, json.load(f), args.time_tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Non-zero exit so CI can fail on a complexity mismatch or a regression, and a
+    # separate code when some fit had too few sizes to say either way
+    failed = any(fit['status'] in ('mismatch', 'error') for fit in report['fits']) or report.get('regressions')
+    if failed:
+        return 1
+    return 2 if any(fit['status'] == 'insufficient_data' for fit in report['fits']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -102,28 +102,80 @@ ALGORITHM_CONTENT = {
     },
     "merge_sort": {
         "name": "Merge Sort", "category": "Sorting", "ds": "array",
-        "idea": "A 'Divide and Conquer' algorithm. It divides the array into halves, recursively sorts them, and then merges them.",
+        "idea": "A 'Divide and Conquer' algorithm, run bottom-up: sorted runs (single elements, or the input's own presorted runs in natural mode) are merged pairwise, pass after pass, until one run is left.",
         "pseudocode": """function mergeSort(array):
-    if length(array) > 1:
-        mid = length(array)//2
-        left = array[0:mid]
-        right = array[mid:]
-
-        mergeSort(left)
-        mergeSort(right)
-
-        merge(array, left, right)""",
-        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n log n)", "space": "O(n)" }
+    runs = [[i, i + 1] for each index i]   # natural mode: the presorted runs
+    while more than one run:
+        for each neighbouring pair (left, right) of runs:
+            merge(array -> buffer, left, right)
+        swap(array, buffer)""",
+        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n log n)", "space": "O(n)" },
+        "options": {
+            "mode": ["bottom_up", "natural"]
+        }
     },
     "quick_sort": {
         "name": "Quick Sort", "category": "Sorting", "ds": "array",
-        "idea": "A 'Divide and Conquer' algorithm that picks a 'pivot' and partitions the array around it.",
-        "pseudocode": """function quickSort(array, low, high):
-    if low < high:
-        pivotIndex = partition(array, low, high)
-        quickSort(array, low, pivotIndex - 1)
-        quickSort(array, pivotIndex + 1, high)""",
-        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n^2)", "space": "O(log n)" }
+        "idea": "A 'Divide and Conquer' algorithm that picks a 'pivot' and partitions the array around it. Ranges wait on an explicit stack, and a range that partitions too deeply is finished with heap sort (introsort). The bounds below are plain quick sort's; with introsort on (the default) the worst case is O(n log n), and three-way partitioning (the default) sorts an array of equal keys in O(n).",
+        "pseudocode": """function quickSort(array):
+    stack = [(0, n - 1, 0)]
+    while stack not empty:
+        (low, high, depth) = stack.pop()
+        if low >= high: continue
+        if depth > 2 * log2(n):
+            heapSort(array, low, high)
+            continue
+        pivot = choosePivot(array, low, high)
+        (lt, gt) = partition3(array, low, high, pivot)
+        stack.push((low, lt - 1, depth + 1))
+        stack.push((gt + 1, high, depth + 1))""",
+        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n^2)", "space": "O(log n)" },
+        "options": {
+            "pivot": ["median_of_three", "last", "random", "ninther"],
+            "partition": ["three_way", "lomuto"],
+            "introsort": [True, False]
+        }
+    },
+    "counting_sort": {
+        "name": "Counting Sort", "category": "Sorting", "ds": "array",
+        "idea": "A non-comparison sort for small integer ranges: count how often each value occurs, turn the counts into end positions with a prefix sum, then write every element straight into its place.",
+        "pseudocode": """function countingSort(array):
+    low, high = min(array), max(array)
+    count = [0] * (high - low + 1)
+    for value in array:
+        count[value - low] += 1
+    for k from 1 to high - low:
+        count[k] += count[k - 1]
+    for i from n - 1 down to 0:
+        count[array[i] - low] -= 1
+        output[count[array[i] - low]] = array[i]""",
+        "complexity": { "time_best": "O(n + k)", "time_avg": "O(n + k)", "time_worst": "O(n + k)", "space": "O(n + k)" }
+    },
+    "radix_sort": {
+        "name": "Radix Sort (LSD)", "category": "Sorting", "ds": "array",
+        "idea": "Sorts integers digit by digit, least significant digit first. Each pass is a stable counting sort on one digit, so the order from earlier passes survives among equal digits.",
+        "pseudocode": """function radixSort(array, base):
+    exp = 1
+    repeat:
+        countingSortBy(array, (value / exp) % base)   # stable
+        exp = exp * base
+    until exp > max(array)""",
+        "complexity": { "time_best": "O(d(n + b))", "time_avg": "O(d(n + b))", "time_worst": "O(d(n + b))", "space": "O(n + b)" },
+        "options": {
+            "base": [10, 2, 16]
+        }
+    },
+    "bucket_sort": {
+        "name": "Bucket Sort", "category": "Sorting", "ds": "array",
+        "idea": "Spreads the values over n equal-width buckets spanning [min, max], writes the buckets back in order and insertion-sorts each one. Fast when values are spread evenly, whatever their range.",
+        "pseudocode": """function bucketSort(array):
+    width = (max - min) / n
+    for value in array:
+        buckets[(value - min) / width].append(value)
+    array = concatenate(buckets)
+    for each bucket segment of array:
+        insertionSort(segment)""",
+        "complexity": { "time_best": "O(n)", "time_avg": "O(n + k)", "time_worst": "O(n^2)", "space": "O(n + k)" }
     },
     
     # 3. GRAPH ALGORITHMS
@@ -169,11 +221,47 @@ ALGORITHM_CONTENT = {
                 pq.push((dist[v], v))""",
         "complexity": { "time_best": "O(E + V log V)", "time_avg": "O(E + V log V)", "time_worst": "O(E + V log V)", "space": "O(V)" }
     },
+    "astar": {
+        "name": "A* Search", "category": "Shortest Path", "ds": "graph",
+        "idea": "Dijkstra guided by a straight-line estimate of the remaining distance, so nodes toward the goal are expanded first and the search stops once the goal is reached.",
+        "pseudocode": """function aStar(graph, source, goal):
+    g[source] = 0
+    pq = priorityQueue()
+    pq.push((h(source), source))
+
+    while pq not empty:
+        (f, u) = pq.pop()
+        if u == goal:
+            return path to goal
+        for (v, weight) in graph[u]:
+            if g[u] + weight < g[v]:
+                g[v] = g[u] + weight
+                pq.push((g[v] + h(v), v))""",
+        "complexity": { "time_best": "O(V+E)", "time_avg": "O(E + V log V)", "time_worst": "O(E + V log V)", "space": "O(V)" }
+    },
+
+    "bidirectional_dijkstra": {
+        "name": "Bidirectional Dijkstra", "category": "Shortest Path", "ds": "graph",
+        "idea": "Runs Dijkstra forward from the start and backward from the goal at the same time, stopping when the two searches meet.",
+        "pseudocode": """function bidirectionalDijkstra(graph, source, goal):
+    distF[source] = 0; distB[goal] = 0
+    best = ∞
+    while both queues not empty:
+        if minF + minB >= best:
+            break
+        expand the side with the smaller queue:
+            (d, u) = pq.pop()
+            for (v, weight) in edges(u):
+                relax(v, d + weight)
+                best = min(best, distF[v] + distB[v])
+    return best""",
+        "complexity": { "time_best": "O(V+E)", "time_avg": "O(E + V log V)", "time_worst": "O(E + V log V)", "space": "O(V)" }
+    },
 
     # 4. TREE ALGORITHMS
     "bst_build": {
         "name": "BST Build", "category": "Tree Operations", "ds": "tree",
-        "idea": "Build a Binary Search Tree by inserting elements one by one.",
+        "idea": "Build a Binary Search Tree by inserting elements one by one. Bulk-load mode instead sorts the values once and makes the middle value of every range its root, giving a perfectly balanced tree in O(n) steps.",
         "pseudocode": """function insert(node, value):
     if value < node.value:
         if node.left is null:
@@ -185,7 +273,64 @@ ALGORITHM_CONTENT = {
             node.right = new Node(value)
         else:
             insert(node.right, value)""",
-        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n^2)", "space": "O(n)" }
+        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n^2)", "space": "O(n)" },
+        "options": {
+            "mode": ["insert", "bulk_load"]
+        }
+    },
+    "tree_traversal": {
+        "name": "Tree Traversals", "category": "Tree Operations", "ds": "tree",
+        "idea": "Visits every node of a BST in in-order (sorted), pre-order, post-order or level order. An explicit stack (or queue, for level order) replaces recursion, so even a tree as deep as it is long is walked safely.",
+        "pseudocode": """function inOrder(root):
+    stack = []; node = root
+    while stack not empty or node is not null:
+        while node is not null:
+            stack.push(node); node = node.left
+        node = stack.pop()
+        visit(node)
+        node = node.right""",
+        "complexity": { "time_best": "O(n)", "time_avg": "O(n)", "time_worst": "O(n)", "space": "O(h)" },
+        "options": {
+            "order": ["in_order", "pre_order", "post_order", "level_order"],
+            "build": ["bulk_load", "insertion"]
+        }
+    },
+    "avl_tree": {
+        "name": "AVL Tree", "category": "Tree Operations", "ds": "tree",
+        "idea": "A self-balancing BST: every node's two subtrees differ in height by at most one. After each insert or delete, heights are refreshed on the way back up and single or double rotations restore the balance, so even sorted input builds a tree of height O(log n).",
+        "pseudocode": """function insert(tree, value):
+    node = bstInsert(tree, value)
+    for each ancestor a of node, bottom-up:
+        updateHeight(a)
+        if balance(a) > 1:
+            if balance(a.left) < 0: rotateLeft(a.left)
+            rotateRight(a)
+        else if balance(a) < -1:
+            if balance(a.right) > 0: rotateRight(a.right)
+            rotateLeft(a)""",
+        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n log n)", "space": "O(n)" },
+        "options": {
+            "delete": ["none", "half", "all"]
+        }
+    },
+    "red_black_tree": {
+        "name": "Red-Black Tree", "category": "Tree Operations", "ds": "tree",
+        "idea": "A self-balancing BST whose nodes are red or black: red nodes have black children and every root-to-leaf path holds the same number of black nodes. Recoloring plus at most a few rotations per operation keep the height within 2 log n.",
+        "pseudocode": """function insert(tree, value):
+    node = bstInsert(tree, value); node.color = RED
+    while node.parent is RED:
+        if uncle(node) is RED:
+            recolor parent, uncle BLACK and grandparent RED
+            node = grandparent
+        else:
+            if node is an inner grandchild: rotate(parent)
+            recolor parent BLACK, grandparent RED
+            rotate(grandparent)
+    tree.root.color = BLACK""",
+        "complexity": { "time_best": "O(n log n)", "time_avg": "O(n log n)", "time_worst": "O(n log n)", "space": "O(n)" },
+        "options": {
+            "delete": ["none", "half", "all"]
+        }
     },
 
     # 5. CONCEPTUAL ALGORITHMS
@@ -200,6 +345,67 @@ ALGORITHM_CONTENT = {
     memo[n] = fib(n-1, memo) + fib(n-2, memo)
     return memo[n]""",
         "complexity": { "time_best": "O(n)", "time_avg": "O(n)", "time_worst": "O(n)", "space": "O(n)" }
+    },
+    "fib_tabulation": {
+        "name": "Fibonacci (Tabulation)", "category": "Dynamic Programming", "ds": "conceptual",
+        "idea": "Builds Fibonacci numbers bottom-up from fib(0) and fib(1). Only the last two values are ever needed, so a two-value window slides forward instead of filling a table.",
+        "pseudocode": """function fib(n):
+    previous, current = 0, 1
+    for i from 2 to n:
+        previous, current = current, previous + current
+    return n == 0 ? 0 : current""",
+        "complexity": { "time_best": "O(n)", "time_avg": "O(n)", "time_worst": "O(n)", "space": "O(1)" }
+    },
+    "fib_matrix": {
+        "name": "Fibonacci (Matrix Power)", "category": "Dynamic Programming", "ds": "conceptual",
+        "idea": "[[1, 1], [1, 0]] raised to the n-th power holds fib(n) off its diagonal. Exponentiation by squaring computes that power with O(log n) 2x2 matrix products.",
+        "pseudocode": """function fib(n):
+    result = identity
+    for each bit of n, from the highest:
+        result = result * result
+        if bit == 1:
+            result = result * [[1, 1], [1, 0]]
+    return result[0][1]""",
+        "complexity": { "time_best": "O(log n)", "time_avg": "O(log n)", "time_worst": "O(log n)", "space": "O(1)" }
+    },
+    "fib_fast_doubling": {
+        "name": "Fibonacci (Fast Doubling)", "category": "Dynamic Programming", "ds": "conceptual",
+        "idea": "The matrix-power identities reduced to two formulas: fib(2k) = fib(k)(2fib(k+1) - fib(k)) and fib(2k+1) = fib(k)^2 + fib(k+1)^2. Walking the bits of n doubles k (and adds one for 1 bits) in O(log n) steps.",
+        "pseudocode": """function fib(n):
+    a, b = 0, 1            # fib(k), fib(k+1), k = 0
+    for each bit of n, from the highest:
+        a, b = a * (2b - a), a^2 + b^2     # k = 2k
+        if bit == 1:
+            a, b = b, a + b                  # k = k + 1
+    return a""",
+        "complexity": { "time_best": "O(log n)", "time_avg": "O(log n)", "time_worst": "O(log n)", "space": "O(1)" }
+    },
+    "knapsack_01": {
+        "name": "0/1 Knapsack (DP)", "category": "Dynamic Programming", "ds": "conceptual",
+        "idea": "Finds the most valuable set of items that fits a weight capacity W. best[w] is the best value within weight w using the items seen so far; each item updates it from the top down, so it is counted at most once. One row of W + 1 values is enough for the answer, and splitting the items in half and finding how the halves share the capacity recovers the chosen items without keeping the n x W table.",
+        "pseudocode": """function knapsack(items, W):
+    best = array of W + 1 zeros
+    for each item (weight, value):
+        for w from W down to weight:
+            best[w] = max(best[w], best[w - weight] + value)
+    return best[W]""",
+        "complexity": { "time_best": "O(nW)", "time_avg": "O(nW)", "time_worst": "O(nW)", "space": "O(W)" },
+        "options": {
+            "mode": ["rolling", "hirschberg", "table"]
+        }
+    },
+    "hanoi": {
+        "name": "Tower of Hanoi", "category": "Recursion", "ds": "conceptual",
+        "idea": "Moves a stack of n disks from peg A to peg C, one disk at a time and never a larger disk on a smaller one: move n-1 disks out of the way, move the largest, move the n-1 back on top. The 2^n - 1 moves follow the binary digits of the move number (move k moves the disk of k's lowest set bit, each disk cycling through the pegs in a fixed direction), so any move or position can be computed directly.",
+        "pseudocode": """function hanoi(n, source, target, spare):
+    if n > 0:
+        hanoi(n-1, source, spare, target)
+        move disk n from source to target
+        hanoi(n-1, spare, target, source)
+
+# Move k directly: disk = lowest set bit of k,
+# its (k >> disk)-th move in that disk's direction""",
+        "complexity": { "time_best": "O(2^n)", "time_avg": "O(2^n)", "time_worst": "O(2^n)", "space": "O(n)" }
     }
 }
 
@@ -208,4 +414,195 @@ DATA_STRUCTURE_INFO = {
     "tree": { "name": "Tree (BST)", "description": "A hierarchical data structure with a root node and child nodes." },
     "graph": { "name": "Graph", "description": "A collection of nodes (vertices) connected by edges." },
     "conceptual": { "name": "Conceptual", "description": "Algorithms that demonstrate a concept like recursion or dynamic programming." }
-}
\ No newline at end of file
+}
+
+# Step messages are sent as a template id plus positional arguments and only
+# rendered into text when they are displayed (animator.js, or the server when
+# /run_algorithm is called with render_messages=true).
+MESSAGE_TEMPLATES = {
+    # Sorting
+    "bubble.compare": "Comparing {0} and {1}.",
+    "bubble.swap": "{0} > {1}. Swapping.",
+    "selection.scan": "Finding the minimum in the unsorted part (from index {0}). Current minimum is {1}.",
+    "selection.compare": "Comparing {0} with current minimum {1}.",
+    "selection.new_min": "Found a new minimum: {0}.",
+    "selection.swap": "Swapping minimum element {0} with element at index {1} ({2}).",
+    "insertion.select_key": "Selecting {0} as the key to insert.",
+    "insertion.shift": "{0} < {1}. Shifting {1} to the right.",
+    "insertion.insert": "Inserting key {0} at position {1}.",
+    "merge.divide": "Dividing array at index {0}.",
+    "merge.start": "Merging subarrays.",
+    "merge.merged": "Subarray sorted and merged.",
+    "merge.pass": "New pass: merging {0} sorted runs in neighbouring pairs.",
+    "merge.run": "Found an already sorted run [{0}, {1}].",
+    "merge.reverse_run": "Run [{0}, {1}] is strictly descending. Reversing it.",
+    "quick.pivot": "Choosing {0} as pivot for range [{1}, {2}].",
+    "quick.compare": "Comparing {0} with pivot {1}.",
+    "quick.swap": "{0} < {1}. Swapping {2} and {0}.",
+    "quick.place_pivot": "Placing pivot. Swapping {0} and {1}.",
+    "quick.pivot_candidates": "Choosing a pivot by {0}: looked at {1} candidate(s), picked {2}.",
+    "quick.move_pivot": "Moving pivot {0} to the end of the range.",
+    "quick.swap_less": "{0} < {1}. Moving it to the 'less than pivot' block.",
+    "quick.swap_greater": "{0} > {1}. Moving it to the 'greater than pivot' block.",
+    "quick.equal_block": "All copies of pivot {0} are in their final positions [{1}, {2}].",
+    "quick.heap_fallback": "Range [{0}, {1}] is nested deeper than {2} partitions. Switching to heap sort.",
+    "heap.compare_children": "Comparing children {0} and {1}.",
+    "heap.compare_parent": "Comparing parent {0} with larger child {1}.",
+    "heap.sift": "Sifting {0} down below {1}.",
+    "heap.extract": "Moving the maximum {0} to position {1}.",
+    "counting.init": "Creating {0} counters for the values {1} to {2}.",
+    "counting.count": "Counting {0}: seen {1} time(s) so far.",
+    "counting.prefix": "Prefix sum: values up to bucket {0} fill the first {1} positions.",
+    "counting.place": "Placing {0} at position {1}.",
+    "counting.output": "Copying the output back into the array.",
+    "counting.range_too_large": "The values span {0} different numbers, more than the {1} counters Counting Sort will allocate. Try Radix or Bucket Sort.",
+    "radix.pass": "Pass {0}: sorting by the digit worth {1} in base {2}.",
+    "radix.pass_done": "Pass {0} done: the array is sorted by its lowest {0} digit(s).",
+    "bucket.init": "Creating {0} buckets, each {1} wide.",
+    "bucket.scatter": "Dropping {0} into bucket {1}.",
+    "bucket.gather": "Writing bucket {0} back from position {1} and sorting it.",
+    "sort.final_position": "Element {0} is now in its final sorted position.",
+    "sort.complete": "Array is fully sorted.",
+
+    # Searching
+    "search.compare": "Comparing target ({0}) with array[{1}] which is {2}.",
+    "search.found": "Target {0} found at index {1}!",
+    "search.not_found": "Target {0} not found in the array.",
+    "search.unsorted": "Error: {0} requires a sorted array!",
+    "search.compare_probe": "Comparing target ({0}) with array[{1}] ({2})",
+    "binary.range": "Searching in range [{0}, {1}]. Middle is at index {2}.",
+    "binary.discard_left": "Target ({0}) > {1}. Discarding the left half.",
+    "binary.discard_right": "Target ({0}) < {1}. Discarding the right half.",
+    "jump.block_size": "Block size (step) is √{0} ≈ {1}.",
+    "jump.jump": "Comparing target with end of block [{0}...{1}]. {2} < {3}. Jumping.",
+    "jump.past_end": "Target is larger than all elements.",
+    "jump.scan_block": "Target may be in block [{0}...{1}]. Starting linear search.",
+    "interpolation.found": "Target found at index {0}.",
+    "interpolation.not_found": "Target not found.",
+    "interpolation.probe": "Probing position {0} based on data distribution.",
+    "interpolation.larger": "Target is larger. New search range is [{0}, {1}].",
+    "interpolation.smaller": "Target is smaller. New search range is [{0}, {1}].",
+    "interpolation.target_not_found": "Target {0} not found.",
+
+    # Graphs
+    "graph.bad_start": "Start node \"{0}\" not in graph.",
+    "graph.bad_endpoints": "Start or end node not in graph.",
+    "bfs.start": "Starting BFS at node {0}. Add it to the queue.",
+    "bfs.dequeue": "Dequeueing and visiting node {0}.",
+    "bfs.explore_edge": "Exploring edge from {0} to {1}.",
+    "bfs.enqueue": "Node {0} is unvisited. Add to queue.",
+    "bfs.visited": "Node {0} has already been visited. Skipping.",
+    "bfs.complete": "BFS complete. All reachable nodes visited.",
+    "dfs.start": "Starting DFS at node {0}. Push it to the stack.",
+    "dfs.pop": "Popping node {0} from the stack to visit.",
+    "dfs.skip_visited": "Node {0} already visited. Skipping.",
+    "dfs.visit": "Visiting node {0} for the first time.",
+    "dfs.explore_edge": "Checking neighbor {0} of {1}.",
+    "dfs.push": "Pushing unvisited neighbor {0} to stack.",
+    "dfs.complete": "DFS complete. All reachable nodes visited.",
+    "dijkstra.complete": "Dijkstra's algorithm complete.",
+    "dijkstra.init": "Initializing all distances to infinity, source {0} to 0.",
+    "dijkstra.visit": "Visiting node {0}, current shortest distance is {1}.",
+    "dijkstra.explore_edge": "Exploring edge from {0} to {1} with weight {2}.",
+    "dijkstra.relax": "Found shorter path to {0}! New distance: {1}.",
+    "dijkstra.no_relax": "Path to {0} via {1} is not shorter.",
+    "dijkstra.path": "Shortest path found! Total distance: {0}.",
+    "dijkstra.no_path": "No path found from {0} to {1}.",
+    "bidijkstra.init": "Searching forward from {0} and backward from {1} at the same time.",
+    "bidijkstra.visit": "Settling node {0} ({1} search), distance {2}.",
+    "bidijkstra.meet": "The searches meet at {0}: a path of length {1}.",
+    "bidijkstra.path": "Shortest path found! Total distance: {0}, after settling {1} nodes.",
+    "bidijkstra.complete": "Bidirectional Dijkstra complete.",
+    "astar.init": "Initializing distances; searching from {0} towards {1}.",
+    "astar.visit": "Expanding node {0}: distance so far {1}, estimated total {2}.",
+    "astar.explore_edge": "Exploring edge from {0} to {1} with weight {2}.",
+    "astar.relax": "Found shorter path to {0}! New distance: {1}.",
+    "astar.path": "Goal reached! Total distance: {0}, after expanding {1} nodes.",
+    "astar.complete": "A* search complete.",
+
+    # Trees
+    "bst.empty": "Cannot build a tree from an empty list.",
+    "bst.insert_root": "Tree is empty. Inserting {0} as the root.",
+    "bst.compare": "Comparing new value {0} with node {1}.",
+    "bst.go_left": "{0} < {1}. Moving left.",
+    "bst.go_right": "{0} > {1}. Moving right.",
+    "bst.duplicate": "Value {0} already exists. No insertion.",
+    "bst.insert": "Found empty spot. Inserting {0} as the {1} child of {2}.",
+    "bst.complete": "BST build process complete.",
+    "tree.go_right_equal": "{0} = {1}. Equal values go right.",
+    "tree.found": "Found {0}.",
+    "tree.not_found": "{0} is not in the tree. Nothing to delete.",
+    "tree.delete": "Deleting {0}.",
+    "tree.successor": "{0} has two children. Copying its in-order successor {1} into it and removing the successor instead.",
+    "tree.remove": "Removing node {0}; its child (if any) takes its place.",
+    "tree.rotate": "Rotating {0} {1}: {2} moves up into its place.",
+    "tree.complete": "Done: {0} nodes, {1} levels.",
+    "bulk.sorted": "Sorting the {0} values once.",
+    "bulk.root": "The middle value {0} becomes the root.",
+    "bulk.place": "{0}, the middle of a range of {3}, becomes the {1} child of {2}.",
+    "traversal.loaded": "Built a tree of {0} nodes and {1} levels.",
+    "traversal.push": "Pushing {0} onto the stack.",
+    "traversal.pop": "Popping {0} from the stack.",
+    "traversal.enqueue": "Adding {0} to the queue.",
+    "traversal.dequeue": "Taking {0} from the queue.",
+    "traversal.visit": "Visiting {0} (node {1} of the traversal).",
+    "traversal.complete": "Traversal complete: visited {0} nodes.",
+    "avl.balance": "Node {0}: height {1}, balance factor {2}.",
+    "rb.recolor_uncle": "Parent {0} and uncle {1} are both red. Recoloring them black and grandparent {2} red.",
+    "rb.recolor_rotate": "Uncle is black. Recoloring {0} black and {1} red, then rotating.",
+    "rb.root_black": "The root {0} must be black.",
+    "rb.sibling_red": "Sibling {0} is red. Recoloring it black and parent {1} red, then rotating.",
+    "rb.push_up": "Sibling {0} and its children are black. Recoloring {0} red and moving the missing black up to {1}.",
+    "rb.sibling_inner": "Sibling {0} has a red near child only. Rotating that child up first.",
+    "rb.sibling_outer": "Sibling {0} has a red far child. Recoloring and rotating around {1} restores the black heights.",
+    "rb.absorb_black": "Recoloring {0} black.",
+
+    # Dynamic Programming
+    "fib.too_large": "Input is too large for animation. Please choose a number <= {0}.",
+    "fib.call": "Calling fib({0}).",
+    "fib.check_memo": "Is fib({0}) in memo table?",
+    "fib.memo_hit": "Yes! fib({0}) = {1}. Returning stored value.",
+    "fib.base_case": "Base case reached. fib({0}) = {0}.",
+    "fib.store_memo": "Storing result fib({0}) = {1} in memo.",
+    "fib.calculate": "Calculating fib({0}) = {1} + {2} = {3}.",
+    "fib.complete": "Final result for fib({0}) is {1}.",
+    "fib.negative": "Fibonacci numbers are only computed for n >= 0.",
+    "fib.window": "Starting the window at fib(0) = {0} and fib(1) = {1}.",
+    "fib.add": "fib({0}) = {1}. Sliding the window forward.",
+    "fib.matrix_square": "Squaring the matrix: it now holds fib({0}) = {1}.",
+    "fib.matrix_multiply": "Bit is 1. Multiplying by [[1, 1], [1, 0]]: fib({0}) = {1}.",
+    "fib.double": "Doubling k: fib({0}) = {1}.",
+    "fib.increment": "Bit is 1. Advancing k by one: fib({0}) = {1}.",
+    "knapsack.init": "Initializing DP table for Knapsack problem.",
+    "knapsack.highlight": "Calculating value for item {0} (w:{1}, v:{2}) at capacity {3}.",
+    "knapsack.too_heavy": "Item {0} is too heavy. Value is same as above: {1}.",
+    "knapsack.compare": "Choose max between excluding ({0}) and including ({1}). Max is {2}.",
+    "knapsack.table_too_large": "A table of {0} cells is too large to animate cell by cell (limit {1}). Use the rolling or hirschberg mode.",
+    "knapsack.row": "Item {0} (w:{1}, v:{2}) added. Best value at full capacity is now {3}.",
+    "knapsack.pass_row": "Item {0} added to the pass over items {1}..{2}: best value {4} within capacity {3}.",
+    "knapsack.split": "Items {0}..{1}, capacity {2}: items {0}..{4} get {3} and the rest get {5}, for a best value of {6}.",
+    "knapsack.take": "Taking item {0} (w:{1}, v:{2}).",
+    "knapsack.complete": "Knapsack calculation complete. Maximum value is {0}.",
+    "hanoi.too_many": "Too many disks for a full animation. Please choose {0} or fewer.",
+    "hanoi.position": "Towers after move {0} of {1}.",
+    "hanoi.move": "Move {0}: disk {1} from {2} to {3}.",
+    "hanoi.complete": "Tower of Hanoi with {0} disks solved in {1} moves!",
+    "knapsack.complete_items": "Knapsack calculation complete. Maximum value is {0}, from {1} items weighing {2}.",
+    # Greedy
+    "greedy.ratios": "Calculated value-to-weight ratio for each item.",
+    "greedy.sorted": "Sorted items by ratio in descending order.",
+    "greedy.consider": "Considering item {0} (w:{1}, v:{2})",
+    "greedy.full": "Knapsack is full. Cannot add more items.",
+    "greedy.take_whole": "Took all of item {0}. Capacity left: {1}.",
+    "greedy.take_fraction": "Took {0}% of item {1}. Knapsack is now full.",
+    "greedy.complete": "Greedy knapsack complete. Total value is {0}.",
+    # Bitwise
+    "bitwise.initial": "Initial values.",
+    "bitwise.xor": "Step {0}: {1} = a XOR b ({2} ^ {3}) = {4}",
+    "bitwise.swapped": "Swap complete. Final values.",
+    "bitwise.count_start": "Counting set bits for {0}.",
+    "bitwise.last_bit": "Checking the last bit of {0}. It is {1}.",
+    "bitwise.increment": "Bit is 1. Incrementing count.",
+    "bitwise.shift": "Right-shifting {0} to get {1}.",
+    "bitwise.count_complete": "Finished. The number of set bits in {0} is {1}.",
+}
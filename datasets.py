@@ -0,0 +1,171 @@
+# datasets.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from algorithms.graph_model import CSRGraph
+
+DATASET_KINDS = ('array', 'tree', 'graph')
+
+
+class Dataset:
+    """
+    An input registered once and then referred to by `id` in /run_algorithm.
+    Facts the algorithms would otherwise re-derive on every run are computed at
+    registration: for arrays (and tree insertion sequences) whether they are
+    sorted and all integers, their min/max and the first index of every value
+    (which linear batch searches read); for graphs the compact CSRGraph. `size`
+    counts everything held, so the first-index map is part of the budget.
+    """
+
+    __slots__ = ('id', 'kind', 'data', 'size', 'is_sorted', 'integers', 'low', 'high', 'positions', 'graph')
+
+    def __init__(self, dataset_id, kind, data):
+        self.id = dataset_id
+        self.kind = kind
+        self.data = data
+        self.is_sorted = self.integers = self.low = self.high = self.positions = self.graph = None
+        if kind == 'graph':
+            self.graph = CSRGraph.from_graph_data(data)
+            self.size = self.graph.node_count + self.graph.edge_count
+            return
+        self.is_sorted = all(a <= b for a, b in zip(data, data[1:]))
+        self.integers = all(type(value) is int for value in data)
+        if data:
+            self.low, self.high = (data[0], data[-1]) if self.is_sorted else (min(data), max(data))
+        self.positions = {}
+        for i, value in enumerate(data):
+            self.positions.setdefault(value, i)
+        self.size = len(data) + len(self.positions)
+
+    def run_input(self):
+        """(input, is_sorted) for an algorithm run: just what a worker needs, cheap to pickle."""
+        return (self.graph if self.kind == 'graph' else self.data), self.is_sorted
+
+    def describe(self):
+        """The JSON-friendly facts about this dataset, without the data itself."""
+        info = {'dataset_id': self.id, 'kind': self.kind, 'size': self.size}
+        if self.kind == 'graph':
+            info.update(nodes=self.graph.node_count, edges=self.graph.edge_count)
+        else:
+            info.update(sorted=self.is_sorted, integers=self.integers, min=self.low, max=self.high, distinct=len(self.positions))
+        return info
+
+
+def _is_number(value):
+    # bool is an int subclass, but not a weight or a coordinate
+    return type(value) in (int, float)
+
+
+def _validate_graph(data):
+    """Checks every field CSRGraph.from_graph_data reads, so a bad graph is a ValueError rather than a KeyError or TypeError."""
+    if not isinstance(data, dict) or not isinstance(data.get('adjacency_list'), dict):
+        raise ValueError("A graph dataset needs an 'adjacency_list' object.")
+    for node, neighbors in data['adjacency_list'].items():
+        if not isinstance(neighbors, list):
+            raise ValueError(f"The neighbors of '{node}' must be a list.")
+        for neighbor in neighbors:
+            if isinstance(neighbor, dict):
+                if not isinstance(neighbor.get('node'), str):
+                    raise ValueError(f"Every neighbor of '{node}' needs a 'node' label.")
+                if not _is_number(neighbor.get('weight', 1)):
+                    raise ValueError(f"Edge '{node}' -> '{neighbor['node']}' has a non-numeric weight.")
+            elif not isinstance(neighbor, str):
+                raise ValueError(f"Neighbors of '{node}' must be labels or {{'node', 'weight'}} objects.")
+    positions = data.get('nodes')
+    if positions is not None:
+        if not isinstance(positions, dict):
+            raise ValueError("'nodes' must map labels to {'x', 'y'} positions.")
+        for node, position in positions.items():
+            if not isinstance(position, dict) or not _is_number(position.get('x')) or not _is_number(position.get('y')):
+                raise ValueError(f"Node '{node}' needs numeric 'x' and 'y' coordinates.")
+
+
+def validate(kind, data):
+    """Raises ValueError unless `data` is a well-formed input of `kind`."""
+    if kind not in DATASET_KINDS:
+        raise ValueError(f"Unknown dataset kind '{kind}'. Choose one of: {', '.join(DATASET_KINDS)}.")
+    if kind == 'graph':
+        _validate_graph(data)
+        return
+    if not isinstance(data, list) or not all(map(_is_number, data)):
+        raise ValueError('Array and tree inputs must be lists of numbers.')
+
+
+def dataset_id(kind, data):
+    """Content address of a dataset, so uploading the same data twice yields the same id."""
+    canonical = json.dumps([kind, data], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+class DatasetRegistry:
+    """
+    In-process LRU store of registered datasets, bounded by the total number of
+    elements (array items plus their first-index entries, or graph nodes plus
+    edges) it holds. A dataset larger
+    than the whole budget is still returned by `register`, just not kept.
+    """
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._datasets = OrderedDict()
+        self._lock = threading.Lock()
+        self.items = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def register(self, kind, data):
+        """Validates and stores `data`, returning its Dataset (the existing one if already registered)."""
+        validate(kind, data)
+        key = dataset_id(kind, data)
+        with self._lock:
+            existing = self._datasets.get(key)
+            if existing is not None:
+                self._datasets.move_to_end(key)
+                return existing
+        dataset = Dataset(key, kind, data)
+        if dataset.size > self.max_items:
+            return dataset
+        with self._lock:
+            if key not in self._datasets:
+                self._datasets[key] = dataset
+                self.items += dataset.size
+            while self.items > self.max_items:
+                _, evicted = self._datasets.popitem(last=False)
+                self.items -= evicted.size
+                self.evictions += 1
+        return dataset
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._datasets
+
+    def get(self, key):
+        """Returns the Dataset registered under `key` and marks it recently used, or None."""
+        with self._lock:
+            dataset = self._datasets.get(key)
+            if dataset is None:
+                self.misses += 1
+                return None
+            self._datasets.move_to_end(key)
+            self.hits += 1
+            return dataset
+
+    def clear(self):
+        with self._lock:
+            self._datasets.clear()
+            self.items = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'datasets': len(self._datasets),
+                'items': self.items,
+                'max_items': self.max_items,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,207 @@
+# executor.py
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Steps consumed between two deadline checks; a step is cheap, a clock read is not free
+DEADLINE_CHECK_INTERVAL = 256
+# Items a streaming job sends per message, and messages it may run ahead of the reader
+STREAM_BATCH_ITEMS = 256
+STREAM_MAX_PENDING = 64
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a step generator runs past its deadline. Carries the steps produced so far."""
+
+    def __init__(self, steps, deadline):
+        super().__init__(steps, deadline)
+        self.steps = steps
+        self.deadline = deadline
+
+    def __str__(self):
+        return f'Algorithm exceeded its {self.deadline:g}s deadline after {self.steps} steps.'
+
+
+class PoolSaturated(Exception):
+    """Raised by `AlgorithmExecutor.run` when every worker is busy and the queue is full."""
+
+
+def deadline_guard(steps, deadline):
+    """
+    Re-yields `steps`, raising DeadlineExceeded once `deadline` seconds have passed.
+    The check is cooperative: it runs between steps, every DEADLINE_CHECK_INTERVAL steps.
+    """
+    expires = time.monotonic() + deadline
+    count = 0
+    for step in steps:
+        count += 1
+        if count % DEADLINE_CHECK_INTERVAL == 0 and time.monotonic() > expires:
+            raise DeadlineExceeded(count, deadline)
+        yield step
+    if time.monotonic() > expires:
+        raise DeadlineExceeded(count, deadline)
+
+
+def _pump(channel, func, args, timeout, reraise=True):
+    """
+    Pool job behind `AlgorithmExecutor.stream`: iterates `func(*args)` and puts
+    its items on `channel` in batches, the first one alone so the reader can
+    start at once. Ends with ('end', None), or ('error', exception) before
+    re-raising it (unless `reraise` is false: nothing collects a thread's
+    exception). A reader that stops reading makes `put` time out, which
+    ends the job instead of holding the worker.
+    """
+    batch, first = [], True
+    try:
+        for item in func(*args):
+            batch.append(item)
+            if first or len(batch) >= STREAM_BATCH_ITEMS:
+                channel.put(('items', batch), timeout=timeout)
+                batch, first = [], False
+        if batch:
+            channel.put(('items', batch), timeout=timeout)
+        channel.put(('end', None), timeout=timeout)
+    except BaseException as e:
+        try:
+            channel.put(('error', e), timeout=timeout)
+        except queue.Full:
+            pass
+        if reraise:
+            raise
+
+
+class AlgorithmExecutor:
+    """
+    Bounded process pool for algorithm runs, so a long run never holds a web
+    worker's CPU. At most `max_workers` jobs run at once and `max_queued` more
+    may wait; past that `run` raises PoolSaturated instead of queueing
+    without bound. With `max_workers=0` jobs run inline on the calling thread.
+    The pool itself is only started by the first run.
+    """
+
+    def __init__(self, max_workers=None, max_queued=None):
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.max_queued = self.max_workers if max_queued is None else max_queued
+        self._pool = None
+        self._manager = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = self.failed = self.timeouts = self.rejected = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _finished(self, future):
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None:
+                self.completed += 1
+            elif isinstance(error, DeadlineExceeded):
+                self.timeouts += 1
+            else:
+                self.failed += 1
+
+    def submit(self, func, *args):
+        """
+        Queues `func(*args)` in the pool and returns its future, counted against
+        the in-flight limit until it finishes; raises PoolSaturated past it.
+        """
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise PoolSaturated(f'All {self.max_workers} workers are busy and {self.max_queued} jobs are queued.')
+            self.in_flight += 1
+        try:
+            future = self._get_pool().submit(func, *args)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def run(self, func, *args, timeout=None, abandoned=None):
+        """
+        Runs `func(*args)` in the pool and waits up to `timeout` seconds for its result.
+        Exceptions raised by `func` (DeadlineExceeded included) propagate to the caller;
+        a worker that does not answer in time raises concurrent.futures.TimeoutError.
+        If the job still completes after that, its result goes to `abandoned`, so
+        one that holds resources (files, say) can release them.
+        """
+        if self.max_workers == 0:
+            return func(*args)
+        future = self.submit(func, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # A queued job is dropped; a running one keeps its slot until it hits its own deadline
+            if not future.cancel() and abandoned is not None:
+                future.add_done_callback(lambda done: done.exception() is None and abandoned(done.result()))
+            raise
+
+    def stream(self, func, *args, timeout=None):
+        """
+        Runs the generator function `func(*args)` in the pool and returns an
+        iterator over its items as they arrive. The job takes a pool slot like
+        `run` (PoolSaturated is raised here, before anything is sent). An
+        exception raised by `func` is re-raised by the iterator; waiting more
+        than `timeout` seconds for the next items raises
+        concurrent.futures.TimeoutError. With no workers the job runs on a
+        thread instead.
+        """
+        if self.max_workers == 0:
+            channel = queue.Queue(STREAM_MAX_PENDING)
+            threading.Thread(target=_pump, args=(channel, func, args, timeout, False), daemon=True).start()
+        else:
+            with self._lock:
+                if self._manager is None:
+                    self._manager = multiprocessing.Manager()
+                channel = self._manager.Queue(STREAM_MAX_PENDING)
+            self.submit(_pump, channel, func, args, timeout)
+        return self._drain(channel, timeout)
+
+    @staticmethod
+    def _drain(channel, timeout):
+        while True:
+            try:
+                kind, payload = channel.get(timeout=timeout)
+            except queue.Empty:
+                raise FutureTimeoutError() from None
+            if kind == 'end':
+                return
+            if kind == 'error':
+                raise payload
+            yield from payload
+
+    def stats(self):
+        with self._lock:
+            capacity = self.max_workers + self.max_queued
+            return {
+                'workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'in_flight': self.in_flight,
+                'running': min(self.in_flight, self.max_workers),
+                'queued': max(0, self.in_flight - self.max_workers),
+                'saturation': self.in_flight / capacity if capacity else 0.0,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
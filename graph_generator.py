@@ -0,0 +1,170 @@
+# graph_generator.py
+
+import math
+import random
+from itertools import repeat
+from operator import add, mul
+
+# Random graph families for /generate_data. Every generator returns the same
+# {'nodes': {id: {x, y}}, 'adjacency_list': {id: [{node, weight}]}} payload the
+# graph algorithms consume, and is reproducible for a given `seed`. Edge
+# generation is near-linear in the number of edges, so graphs with millions of
+# nodes are practical for load tests and traversal benchmarks.
+GRAPH_FAMILIES = ('random', 'grid', 'geometric', 'barabasi_albert')
+
+# Canvas the frontend draws on
+WIDTH, HEIGHT, MARGIN = 700, 350, 20
+MAX_WEIGHT = 10
+GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+def node_labels(n, style='auto'):
+    """Letters A..Z for small graphs (as the UI has always shown), decimal ids otherwise."""
+    if style == 'letters' or (style == 'auto' and n <= 26):
+        if n > 26:
+            raise ValueError('Letter labels only go up to 26 nodes.')
+        return [chr(65 + i) for i in range(n)]
+    return [str(i) for i in range(n)]
+
+
+# ==============================================================================
+# Edge generators: each returns (edges as (u, v) index pairs, positions or None)
+# ==============================================================================
+
+def _erdos_renyi(n, rng, density):
+    """G(n, m) with m = density * n distinct edges, drawn by hashing index pairs into a set."""
+    m = min(int(n * density), n * (n - 1) // 2)
+    seen = set()
+    randrange = rng.randrange
+    while len(seen) < m:
+        u, v = randrange(n), randrange(n)
+        if u != v:
+            seen.add(u * n + v if u < v else v * n + u)
+    return [divmod(code, n) for code in seen], None
+
+
+def _grid(n, rng, density):
+    """A near-square grid: each node links to its right and lower neighbor."""
+    cols = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    edges = [(i, i + 1) for i in range(n - 1) if (i + 1) % cols]
+    edges += [(i, i + cols) for i in range(n - cols)]
+    step_x = (WIDTH - 2 * MARGIN) / max(cols - 1, 1)
+    step_y = (HEIGHT - 2 * MARGIN) / max(rows - 1, 1)
+    positions = [(MARGIN + (i % cols) * step_x, MARGIN + (i // cols) * step_y) for i in range(n)]
+    return edges, positions
+
+
+def _geometric(n, rng, density):
+    """
+    Random geometric graph: uniform points in the unit square, linked when closer
+    than r. r is picked for an average degree of 2 * density, and points are
+    bucketed into r-sized cells so only neighboring cells are compared.
+    """
+    r = min(1.0, math.sqrt(2 * density / (math.pi * max(n, 1))))
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    cells_per_side = max(1, int(1 / r))
+    cells = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((min(int(x * cells_per_side), cells_per_side - 1),
+                          min(int(y * cells_per_side), cells_per_side - 1)), []).append(i)
+    r2 = r * r
+    edges = []
+    for (cx, cy), members in cells.items():
+        # Half of the 8 neighboring cells, so each pair of cells is compared once
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1), (1, -1)):
+            others = cells.get((cx + dx, cy + dy))
+            if not others:
+                continue
+            for a_pos, a in enumerate(members):
+                ax, ay = points[a]
+                for b in (members[a_pos + 1:] if dx == dy == 0 else others):
+                    bx, by = points[b]
+                    if (ax - bx) ** 2 + (ay - by) ** 2 <= r2:
+                        edges.append((a, b))
+    width, height = WIDTH - 2 * MARGIN, HEIGHT - 2 * MARGIN
+    return edges, [(MARGIN + x * width, MARGIN + y * height) for x, y in points]
+
+
+def _barabasi_albert(n, rng, density):
+    """
+    Preferential attachment: each new node links to k = round(density) existing
+    nodes picked proportionally to degree, sampled from the list of edge endpoints.
+    """
+    k = max(1, min(round(density), n - 1))
+    edges = [(i, k) for i in range(k)] if n > k else []
+    endpoints = [v for edge in edges for v in edge]
+    for new in range(k + 1, n):
+        targets = set()
+        while len(targets) < k:
+            targets.add(endpoints[rng.randrange(len(endpoints))])
+        for t in targets:
+            edges.append((t, new))
+            endpoints += (t, new)
+    return edges, None
+
+
+GENERATORS = {
+    'random': _erdos_renyi,
+    'grid': _grid,
+    'geometric': _geometric,
+    'barabasi_albert': _barabasi_albert,
+}
+
+
+# ==============================================================================
+# Layout and assembly
+# ==============================================================================
+
+def layout(n):
+    """
+    Positions for families without a natural embedding: a circle for small
+    graphs, a sunflower (Vogel) spiral for large ones, which spreads any number
+    of nodes evenly over the canvas.
+    """
+    center_x, center_y = WIDTH / 2, HEIGHT / 2
+    if n <= 26:
+        radius = min(center_x, center_y) * 0.8
+        step = 2 * math.pi / max(n, 1)
+        return [(center_x + radius * math.cos(step * i), center_y + radius * math.sin(step * i)) for i in range(n)]
+    scale_x, scale_y = center_x - MARGIN, center_y - MARGIN
+    root = math.sqrt(n)
+    # The square roots, angles and trigonometry run as whole-array map() passes;
+    # only the final scaling into pairs is a Python-level loop
+    radii = map(math.sqrt, map(add, range(n), repeat(0.5)))
+    angles = list(map(mul, range(n), repeat(GOLDEN_ANGLE)))
+    return [(center_x + scale_x * r / root * cos, center_y + scale_y * r / root * sin)
+            for r, cos, sin in zip(radii, map(math.cos, angles), map(math.sin, angles))]
+
+
+def generate_graph(size, family='random', seed=None, density=1.5, labels='auto', weights='random'):
+    """
+    Generates a weighted undirected graph with `size` nodes from one of
+    GRAPH_FAMILIES. `density` is roughly the number of edges per node.
+    `weights` is 'random' (1..MAX_WEIGHT) or 'distance' (the rounded on-screen
+    edge length, which gives A* an informative heuristic).
+    """
+    if family not in GENERATORS:
+        raise ValueError(f"Unknown graph family '{family}'. Choose one of: {', '.join(GRAPH_FAMILIES)}.")
+    if weights not in ('random', 'distance'):
+        raise ValueError("Edge weights must be 'random' or 'distance'.")
+    if size < 1:
+        raise ValueError('A graph needs at least one node.')
+    rng = random.Random(seed)
+    ids = node_labels(size, labels)
+    edges, positions = GENERATORS[family](size, rng, density)
+    if positions is None:
+        positions = layout(size)
+
+    nodes = {node_id: {'x': x, 'y': y} for node_id, (x, y) in zip(ids, positions)}
+    adj_list = {node_id: [] for node_id in ids}
+    randint = rng.randint
+    for u, v in edges:
+        if weights == 'distance':
+            (ux, uy), (vx, vy) = positions[u], positions[v]
+            weight = max(1, round(math.hypot(ux - vx, uy - vy)))
+        else:
+            weight = randint(1, MAX_WEIGHT)
+        adj_list[ids[u]].append({'node': ids[v], 'weight': weight})
+        adj_list[ids[v]].append({'node': ids[u], 'weight': weight})
+    return {'nodes': nodes, 'adjacency_list': adj_list}
@@ -0,0 +1,46 @@
+# payloads.py
+#
+# JSON responses that cannot change while the server runs (the algorithm
+# catalogue from content.py) are serialized and compressed once, at startup,
+# and served with a strong ETag: a revalidating client gets a bodiless 304,
+# any other gets the pre-compressed bytes for its Accept-Encoding.
+
+import gzip
+import hashlib
+import json
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError: # In requirements.txt, but still optional: without it only gzip and identity are offered
+    brotli = None
+
+
+class Payload:
+    """One JSON document, kept as its identity, gzip and (if available) brotli encodings."""
+
+    __slots__ = ('body', 'etag', 'encodings')
+
+    def __init__(self, document):
+        self.body = json.dumps(document, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        # mtime=0 keeps the gzip bytes, and so their ETag, identical across restarts
+        self.encodings = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encodings['br'] = brotli.compress(self.body)
+
+    def response(self, request, cache_control):
+        """
+        The response for `request`. Each encoding is a different byte sequence,
+        so each gets its own strong ETag; a matching If-None-Match for the
+        chosen one is answered with 304.
+        """
+        encoding = request.accept_encodings.best_match(list(self.encodings))
+        etag = self.etag if encoding is None else f'{self.etag}-{encoding}'
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+        if encoding is not None:
+            headers['Content-Encoding'] = encoding
+        return Response(self.body if encoding is None else self.encodings[encoding], mimetype='application/json', headers=headers)
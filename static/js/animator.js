@@ -1,5 +1,9 @@
 // static/js/animator.js
 
+// Step fields that are delta-encoded between keyframes by algorithms/snapshots.py
+const SNAPSHOT_FIELDS = ['queue_state', 'stack_state', 'distances', 'memo_state', 'towers_state'];
+const HANOI_PEGS = ['A', 'B', 'C'];
+
 class Animator {
     constructor(containerId, auxContainerId, logId, speedSliderId) {
         this.container = document.getElementById(containerId);
@@ -13,6 +17,9 @@ class Animator {
         this.linkElements = {};
         this.distanceLabels = {};
         this.treeData = {};
+        this.treeShape = { nodes: {}, root: -1 }; // Balanced trees: node id -> {value, left, right, color}
+        this.messageTemplates = {};
+        this.snapshots = {};
     }
 
     // =================================================================
@@ -30,6 +37,14 @@ class Animator {
         return new Promise(resolve => setTimeout(resolve, this.getAnimationSpeed()));
     }
 
+    // Steps carry a template id and arguments; the text is only built when shown
+    formatMessage(step) {
+        const template = this.messageTemplates[step.message_id];
+        if (template === undefined) return step.message;
+        const args = step.message_args || [];
+        return template.replace(/\{(\d+)\}/g, (_, i) => args[i]);
+    }
+
     updateLog(message) {
         this.log.innerHTML = `<p>${message}</p>`;
     }
@@ -41,6 +56,26 @@ class Animator {
         this.linkElements = {};
         this.distanceLabels = {};
         this.treeData = {};
+        this.treeShape = { nodes: {}, root: -1 };
+        this.snapshots = {};
+    }
+
+    // Rebuilds snapshotted state (see algorithms/snapshots.py): a keyframe replaces it, a delta patches it
+    applySnapshot(step, field) {
+        const delta = step[`${field}_delta`];
+        if (step[field] !== undefined) {
+            this.snapshots[field] = Array.isArray(step[field]) ? [...step[field]] : { ...step[field] };
+        } else if (delta !== undefined && this.snapshots[field] !== undefined) {
+            const state = this.snapshots[field];
+            if (Array.isArray(state)) {
+                state.splice(0, delta.shift || 0);
+                state.splice(state.length - (delta.pop || 0), delta.pop || 0);
+                state.push(...(delta.push || []));
+            } else {
+                Object.assign(state, delta);
+            }
+        }
+        return this.snapshots[field];
     }
 
     createSvgElement(tag, attrs) {
@@ -197,6 +232,97 @@ class Animator {
         this.nodeElements[value] = group;
     }
 
+    // Balanced-tree steps carry the [id, left, right] links they changed and the root
+    applyTreeLinks(step) {
+        (step.links || []).forEach(([id, left, right]) => Object.assign(this.treeShape.nodes[id], { left, right }));
+        this.treeShape.root = step.root;
+    }
+
+    // Redraws the whole balanced tree: x from the in-order rank, y from the depth
+    drawTreeShape() {
+        const svg = this.container.querySelector('#svg-vis');
+        if (!svg) return;
+        if (!svg.viewBox.baseVal.width) {
+            svg.setAttribute('viewBox', `0 0 ${this.container.clientWidth} ${this.container.clientHeight}`);
+        }
+        svg.innerHTML = '';
+        this.nodeElements = {};
+        this.linkElements = {};
+        const { nodes, root } = this.treeShape;
+        const width = svg.viewBox.baseVal.width;
+        const margin = 30, y_spacing = 60;
+        const order = [];
+        const stack = [];
+        let current = root;
+        while (stack.length || current !== -1) {
+            while (current !== -1) { stack.push(current); current = nodes[current].left; }
+            current = stack.pop();
+            order.push(current);
+            current = nodes[current].right;
+        }
+        const x_step = (width - 2 * margin) / Math.max(order.length - 1, 1);
+        const positions = {};
+        order.forEach((id, rank) => { positions[id] = { x: margin + rank * x_step }; });
+        const levels = root === -1 ? [] : [[root, 0]];
+        while (levels.length) {
+            const [id, depth] = levels.pop();
+            positions[id].y = 50 + depth * y_spacing;
+            [nodes[id].left, nodes[id].right].forEach(child => {
+                if (child === -1) return;
+                levels.push([child, depth + 1]);
+            });
+        }
+        order.forEach(id => {
+            [nodes[id].left, nodes[id].right].forEach(child => {
+                if (child === -1) return;
+                const line = this.createSvgElement('line', { x1: positions[id].x, y1: positions[id].y, x2: positions[child].x, y2: positions[child].y, class: 'link' });
+                svg.insertBefore(line, svg.firstChild);
+                this.linkElements[`${id}-${child}`] = line;
+            });
+        });
+        order.forEach(id => {
+            const { x, y } = positions[id];
+            const group = this.createSvgElement('g', { class: nodes[id].color ? `node rb-${nodes[id].color}` : 'node', id: `node-${id}` });
+            const circle = this.createSvgElement('circle', { cx: x, cy: y, r: 20 });
+            const text = this.createSvgElement('text', { x: x, y: y });
+            text.textContent = nodes[id].value;
+            group.appendChild(circle);
+            group.appendChild(text);
+            svg.appendChild(group);
+            this.nodeElements[id] = group;
+        });
+    }
+
+    drawAuxiliary(type, items) {
+        this.auxContainer.innerHTML = `<div class="aux-title">${type === 'queue' ? 'Queue' : 'Stack'}</div>`;
+        (items || []).forEach(item => {
+            const element = document.createElement('div');
+            element.classList.add(`${type}-element`);
+            element.textContent = item;
+            this.auxContainer.appendChild(element);
+        });
+    }
+
+    // One box per bucket: its label on top, then a count (counting/radix sort) or the values dropped in (bucket sort)
+    drawBuckets(title, labels, initial) {
+        this.auxContainer.innerHTML = `<div class="aux-title">${title}</div>`;
+        labels.forEach((label, i) => {
+            const element = document.createElement('div');
+            element.classList.add('bucket-element');
+            element.id = `bucket-${i}`;
+            element.innerHTML = `<span class="bucket-label">${label}</span><span class="bucket-content">${initial}</span>`;
+            this.auxContainer.appendChild(element);
+        });
+    }
+
+    setBucket(index, text, append = false) {
+        const bucket = document.getElementById(`bucket-${index}`);
+        if (!bucket) return;
+        const content = bucket.querySelector('.bucket-content');
+        content.textContent = append && content.textContent ? `${content.textContent} ${text}` : text;
+        bucket.classList.add('processing');
+    }
+
     drawDPTable(rows, cols, weights, values) {
         this.auxContainer.innerHTML = '';
         const table = document.createElement('table');
@@ -235,18 +361,120 @@ class Animator {
     // 4. THE MAIN ANIMATION LOOP
     // =================================================================
 
+    // Yields steps from an NDJSON response body as each line arrives
+    async *streamSteps(response) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffered += decoder.decode(value, { stream: true });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            for (const line of lines) {
+                if (line.trim()) yield JSON.parse(line);
+            }
+        }
+        if (buffered.trim()) yield JSON.parse(buffered);
+    }
+
+    // Decodes the columnar binary trace format produced by trace_format.py
+    decodeTrace(buffer) {
+        const view = new DataView(buffer);
+        const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+        if (magic !== 'AMT1') throw new Error('Unknown trace format.');
+        const headerLength = view.getUint32(4, true);
+        const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+        const bodyStart = 8 + headerLength;
+        const arrayTypes = { i1: Int8Array, i2: Int16Array, i4: Int32Array };
+        const ints = (desc, length) => new arrayTypes[desc.dtype](buffer, bodyStart + desc.offset, length);
+
+        // Each shape owns one column per field; a cursor per column hands out its next value
+        const column = (desc, length) => {
+            let i = 0;
+            if (desc.type === 'int') {
+                const values = ints(desc, length);
+                return () => values[i++];
+            }
+            if (desc.type === 'int_list') {
+                const flat = ints(desc.values, desc.values.length);
+                const offsets = desc.width === null ? ints(desc.offsets, length + 1) : null;
+                return () => {
+                    const start = offsets ? offsets[i] : i * desc.width;
+                    const end = offsets ? offsets[i + 1] : start + desc.width;
+                    i++;
+                    return Array.from(flat.subarray(start, end));
+                };
+            }
+            if (desc.type === 'str') {
+                const codes = ints(desc, length);
+                return () => { const code = codes[i++]; return code < 0 ? null : header.strings[code]; };
+            }
+            return () => desc.values[i++];
+        };
+        const shapes = header.shapes.map(([actionCode, fields, descs, length]) => ({
+            action: header.actions[actionCode],
+            fields,
+            readers: descs.map(desc => column(desc, length)),
+        }));
+
+        const shapeIds = ints(header.shape_column, header.count);
+        const steps = new Array(header.count);
+        for (let s = 0; s < header.count; s++) {
+            const shape = shapes[shapeIds[s]];
+            const step = { action: shape.action };
+            for (let f = 0; f < shape.fields.length; f++) step[shape.fields[f]] = shape.readers[f]();
+            steps[s] = step;
+        }
+        return steps;
+    }
+
+    // Picks the reader that matches whatever encoding the server chose for /run_algorithm
+    async readSteps(response) {
+        const contentType = response.headers.get('Content-Type') || '';
+        if (contentType.startsWith('application/vnd.algomirror.trace')) return this.decodeTrace(await response.arrayBuffer());
+        if (contentType.startsWith('application/x-ndjson')) return this.streamSteps(response);
+        const result = await response.json();
+        return result.trace_id ? this.pagedSteps(result) : result.steps;
+    }
+
+    async fetchWindow(traceId, from, count) {
+        const response = await fetch(`/traces/${traceId}/steps?from=${from}&count=${count}`);
+        const result = await response.json();
+        if (!response.ok) throw new Error(result.error || `HTTP error! status: ${response.status}`);
+        return result;
+    }
+
+    // Plays a paginated run from step `from`, holding one window and prefetching the next.
+    // The first window carries the snapshot state at `from`, so playback can start anywhere.
+    async *pagedSteps(trace, from = 0, pageSize = 500) {
+        let next = this.fetchWindow(trace.trace_id, from, pageSize);
+        for (let start = from; start < trace.total_steps; start += pageSize) {
+            const page = await next;
+            if (start === from) this.snapshots = page.snapshots;
+            if (start + pageSize < trace.total_steps) next = this.fetchWindow(trace.trace_id, start + pageSize, pageSize);
+            yield* page.steps;
+        }
+    }
+
+    // Accepts a plain array of steps or an async iterable such as streamSteps()
     async runAnimation(steps) {
-        for (const step of steps) {
+        this.snapshots = {};
+        for await (const step of steps) {
+            SNAPSHOT_FIELDS.forEach(field => this.applySnapshot(step, field));
+
             // Reset transient highlights from previous step
-            document.querySelectorAll('.comparing, .min-element, .exploring, .visiting, .dp-highlight, .dp-referenced, .updated, .faded')
-                .forEach(el => el.classList.remove('comparing', 'min-element', 'exploring', 'visiting', 'dp-highlight', 'dp-referenced', 'updated', 'faded'));
+            document.querySelectorAll('.comparing, .min-element, .exploring, .visiting, .dp-highlight, .dp-referenced, .updated, .faded, .processing')
+                .forEach(el => el.classList.remove('comparing', 'min-element', 'exploring', 'visiting', 'dp-highlight', 'dp-referenced', 'updated', 'faded', 'processing'));
             
-            this.updateLog(step.message);
+            const message = this.formatMessage(step);
+            this.updateLog(message);
 
             // --- Main Action Switch ---
             switch (step.action) {
                 // Common Actions
-                case 'error': this.updateLog(`Error: ${step.message}`); return;
+                case 'error': this.updateLog(`Error: ${message}`); return;
                 case 'complete': break;
 
                 // Array Actions
@@ -263,11 +491,32 @@ class Animator {
                 case 'found': step.indices.forEach(i => document.getElementById(`el-${i}`)?.classList.add('found')); await this.sleep(); return;
                 case 'sorted_element': step.indices.forEach(i => document.getElementById(`el-${i}`)?.classList.add('sorted')); break;
                 case 'highlight_min': step.indices.forEach(i => document.getElementById(`el-${i}`)?.classList.add('min-element')); break;
+                case 'update_range':
+                    step.values.forEach((value, k) => {
+                        const el = document.getElementById(`el-${step.range_start + k}`);
+                        if (el) { el.textContent = value; el.classList.add('updated'); }
+                    });
+                    break;
+                case 'merge_compare': [step.left_index, step.right_index].forEach(i => document.getElementById(`el-${i}`)?.classList.add('comparing')); break;
+                case 'run_found': case 'reverse_run': for (let i = step.range[0]; i <= step.range[1]; i++) { document.getElementById(`el-${i}`)?.classList.add('comparing'); } break;
+                case 'pivot': document.getElementById(`el-${step.index}`)?.classList.add('min-element'); break;
+                case 'pivot_candidates': step.indices.forEach(i => document.getElementById(`el-${i}`)?.classList.add('comparing')); document.getElementById(`el-${step.chosen}`)?.classList.add('min-element'); break;
+                case 'heap_fallback': for (let i = step.range[0]; i <= step.range[1]; i++) { document.getElementById(`el-${i}`)?.classList.add('comparing'); } break;
+                case 'highlight_key': document.getElementById(`el-${step.index}`)?.classList.add('min-element'); break;
+                case 'compare_shift': step.indices.forEach(i => document.getElementById(`el-${i}`)?.classList.add('comparing')); break;
+                case 'shift_right': { const el = document.getElementById(`el-${step.to}`); if (el) { el.textContent = step.value; el.classList.add('updated'); } break; }
+                case 'insert_key': { const el = document.getElementById(`el-${step.index}`); if (el) { el.textContent = step.key; el.classList.add('updated'); } break; }
+                case 'init_counts': this.drawBuckets('Counts', step.labels, 0); break;
+                case 'count': document.getElementById(`el-${step.index}`)?.classList.add('comparing'); this.setBucket(step.bucket, step.count); break;
+                case 'prefix_sum': this.setBucket(step.bucket, step.total); break;
+                case 'place': document.getElementById(`el-${step.index}`)?.classList.add('comparing'); this.setBucket(step.bucket, step.count); break;
+                case 'init_buckets': this.drawBuckets('Buckets', step.labels, ''); break;
+                case 'scatter': document.getElementById(`el-${step.index}`)?.classList.add('comparing'); this.setBucket(step.bucket, step.value, true); break;
                 case 'eliminate': for (let i = step.range[0]; i <= step.range[1]; i++) { document.getElementById(`el-${i}`)?.classList.add('faded'); } break;
                 
                 // Graph & Traversal Actions
-                case 'enqueue': case 'push': this.drawAuxiliary(step.action === 'enqueue' ? 'queue' : 'stack', step.queue_state || step.stack_state); this.nodeElements[step.node]?.classList.add('visiting'); break;
-                case 'dequeue': case 'pop': this.drawAuxiliary(step.action === 'dequeue' ? 'queue' : 'stack', step.queue_state || step.stack_state); this.nodeElements[step.node]?.classList.add('visiting'); break;
+                case 'enqueue': case 'dequeue': this.drawAuxiliary('queue', this.snapshots.queue_state); this.nodeElements[step.node]?.classList.add('visiting'); break;
+                case 'push': case 'pop': this.drawAuxiliary('stack', this.snapshots.stack_state); this.nodeElements[step.node]?.classList.add('visiting'); break;
                 case 'visit_node': this.nodeElements[step.node]?.classList.remove('visiting'); this.nodeElements[step.node]?.classList.add('visited'); break;
                 case 'explore_edge': this.linkElements[`${step.from}-${step.to}`]?.classList.add('exploring'); break;
                 case 'neighbor_visited': case 'skip_visited': this.nodeElements[step.node]?.classList.add('faded'); break;
@@ -275,10 +524,30 @@ class Animator {
                 // Tree Actions (BST Build)
                 case 'insert': this.drawTreeNode(step.value, step.parent, step.direction); this.nodeElements[step.value]?.classList.add('found'); break;
                 case 'traverse': this.nodeElements[step.from]?.classList.add('comparing'); break;
+
+                // Tree Actions (AVL, Red-Black)
+                case 'insert_node':
+                    this.treeShape.nodes[step.node] = { value: step.value, left: -1, right: -1, color: step.color };
+                    this.applyTreeLinks(step); this.drawTreeShape(); this.nodeElements[step.node]?.classList.add('found'); break;
+                case 'rotate': this.applyTreeLinks(step); this.drawTreeShape(); [step.node, step.pivot].forEach(id => this.nodeElements[id]?.classList.add('comparing')); break;
+                case 'delete_node': delete this.treeShape.nodes[step.node]; this.applyTreeLinks(step); this.drawTreeShape(); break;
+                case 'replace_key': this.treeShape.nodes[step.node].value = step.value; this.drawTreeShape(); this.nodeElements[step.node]?.classList.add('updated'); break;
+                case 'recolor': step.colors.forEach(([id, color]) => { this.treeShape.nodes[id].color = color; }); this.drawTreeShape(); step.colors.forEach(([id]) => this.nodeElements[id]?.classList.add('updated')); break;
+                case 'load_tree':
+                    this.treeShape = { nodes: {}, root: step.root };
+                    step.nodes.forEach(([id, value, left, right]) => { this.treeShape.nodes[id] = { value, left, right }; });
+                    this.drawTreeShape(); break;
+                case 'compare_node': this.nodeElements[step.node]?.classList.add('comparing'); break;
+                case 'check_balance': this.nodeElements[step.node]?.classList.add('visiting'); break;
+                case 'found_node': this.nodeElements[step.node]?.classList.add('found'); break;
                 
                 // Dijkstra Actions
-                case 'init_distances': Object.keys(step.distances).forEach(node => this.distanceLabels[node].textContent = step.distances[node] === Infinity ? '∞' : step.distances[node]); break;
-                case 'update_distance': this.distanceLabels[step.node].textContent = step.new_dist; this.distanceLabels[step.node].classList.add('updated'); this.nodeElements[step.node]?.classList.add('visiting'); break;
+                case 'init_distances': Object.entries(this.snapshots.distances).forEach(([node, dist]) => this.distanceLabels[node].textContent = dist === null ? '∞' : dist); break;
+                case 'update_distance':
+                    // Backward searches (bidirectional Dijkstra) mark their distances with an arrow
+                    this.distanceLabels[step.node].textContent = step.direction === 'backward' ? `←${step.new_dist}` : step.new_dist;
+                    this.distanceLabels[step.node].classList.add('updated'); this.nodeElements[step.node]?.classList.add('visiting'); break;
+                case 'meet': this.nodeElements[step.node]?.classList.add('found'); break;
                 case 'highlight_path':
                     for (let i = 0; i < step.path.length - 1; i++) {
                         this.nodeElements[step.path[i]]?.classList.add('path-node');
@@ -304,6 +573,26 @@ class Animator {
                     withCell?.classList.add('dp-referenced');
                     if (resultCell) resultCell.textContent = step.result;
                     break;
+                case 'dp_row':
+                    // Row steps only carry the row when the table is small enough to draw
+                    (step.values || []).forEach((value, w) => {
+                        const cell = document.getElementById(`cell-${step.row}-${w}`);
+                        if (cell) { cell.textContent = value; cell.classList.add('dp-highlight'); }
+                    });
+                    break;
+                case 'take_item':
+                    if (step.cell) document.getElementById(`cell-${step.cell[0]}-${step.cell[1]}`)?.classList.add('dp-referenced');
+                    break;
+                case 'knapsack_split': break;
+
+                // Tower of Hanoi: the towers come from the towers_state snapshot
+                case 'set_towers':
+                    this.drawBuckets('Towers', HANOI_PEGS, '');
+                    HANOI_PEGS.forEach((peg, i) => this.setBucket(i, this.snapshots.towers_state[peg].join(' ')));
+                    break;
+                case 'move_disk':
+                    [step.from_peg, step.to_peg].forEach(peg => this.setBucket(HANOI_PEGS.indexOf(peg), this.snapshots.towers_state[peg].join(' ')));
+                    break;
             }
             await this.sleep();
         }
@@ -3,8 +3,13 @@
 document.addEventListener('DOMContentLoaded', () => {
     let ALL_CONTENT = {};
     let currentData = null;
+    let currentDatasetId = null; // Server-side copy of currentData, sent instead of the data itself
     let currentDataType = 'array';
     const animator = new Animator('visualization-container', 'aux-visualization-container', 'status-log', 'speed-slider');
+    // How a run's steps are fetched, by input size (array/tree values, graph nodes, or N):
+    // up to WHOLE_MAX_ITEMS the trace comes in one compact columnar response, up to
+    // STREAM_MAX_ITEMS it is streamed as NDJSON, and past that it is paginated
+    const TRACE_TRANSPORT = { WHOLE_MAX_ITEMS: 32, STREAM_MAX_ITEMS: 200 };
 
     const UI = {
         dsSelect: document.getElementById('ds-select'),
@@ -18,6 +23,7 @@ document.addEventListener('DOMContentLoaded', () => {
         startNodeSelect: document.getElementById('start-node-select'),
         endNodeGroup: document.getElementById('end-node-group'),
         endNodeSelect: document.getElementById('end-node-select'),
+        optionsGroup: document.getElementById('options-group'),
         info: { title: document.getElementById('info-title'), idea: document.getElementById('info-idea'), pseudo: document.getElementById('info-pseudo'), timeBest: document.getElementById('time-best'), timeAvg: document.getElementById('time-avg'), timeWorst: document.getElementById('time-worst'), spaceWorst: document.getElementById('space-worst'), }
     };
 
@@ -26,6 +32,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const response = await fetch('/get_content');
             if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
             ALL_CONTENT = await response.json();
+            animator.messageTemplates = ALL_CONTENT.message_templates;
             populateDataStructureSelect();
             handleDataStructureChange();
         } catch (error) {
@@ -79,17 +86,54 @@ document.addEventListener('DOMContentLoaded', () => {
         UI.targetInputGroup.style.display = 'none';
         UI.startNodeGroup.style.display = 'none';
         UI.endNodeGroup.style.display = 'none';
+        UI.optionsGroup.style.display = 'none';
+        UI.optionsGroup.innerHTML = '';
         if (!algo) return;
         if (algo.category === 'Searching') { UI.targetInputGroup.style.display = 'block'; }
         if (['Graph Traversal', 'Shortest Path'].includes(algo.category)) { UI.startNodeGroup.style.display = 'block'; }
-        if (algoKey === 'dijkstra') { UI.endNodeGroup.style.display = 'block'; }
+        if (algo.category === 'Shortest Path') { UI.endNodeGroup.style.display = 'block'; }
+        // Algorithm options declared in content.py; the first value of each is the default
+        Object.entries(algo.options || {}).forEach(([name, values]) => {
+            const label = document.createElement('label');
+            label.textContent = `${name.replace(/_/g, ' ')}:`;
+            const select = document.createElement('select');
+            select.dataset.option = name;
+            values.forEach((value, i) => {
+                const option = document.createElement('option');
+                option.value = i; // Index into the declared values, so booleans survive the round trip
+                option.textContent = String(value).replace(/_/g, ' ');
+                select.appendChild(option);
+            });
+            UI.optionsGroup.append(label, select);
+            UI.optionsGroup.style.display = 'block';
+        });
     }
 
 
-    function updateInfoPanel() {
+    // /get_content only lists the algorithms; each one's idea, pseudocode and complexity is fetched on first use
+    const ALGORITHM_DETAILS = {};
+    function fetchAlgorithmDetail(algoKey) {
+        if (!ALGORITHM_DETAILS[algoKey]) {
+            ALGORITHM_DETAILS[algoKey] = fetch(`/algorithms/${algoKey}`).then(response => {
+                if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+                return response.json();
+            }).catch(error => { delete ALGORITHM_DETAILS[algoKey]; throw error; });
+        }
+        return ALGORITHM_DETAILS[algoKey];
+    }
+
+    async function updateInfoPanel() {
         const algoKey = UI.algoSelect.value;
         if (!algoKey || !ALL_CONTENT.algorithms[algoKey]) return;
-        const content = ALL_CONTENT.algorithms[algoKey];
+        UI.info.title.textContent = ALL_CONTENT.algorithms[algoKey].name;
+        let content;
+        try {
+            content = await fetchAlgorithmDetail(algoKey);
+        } catch (error) {
+            console.error("Could not load algorithm details:", error);
+            return;
+        }
+        if (UI.algoSelect.value !== algoKey) return; // The selection moved on while this was loading
         UI.info.title.textContent = content.name;
         UI.info.idea.textContent = content.idea;
         UI.info.pseudo.textContent = content.pseudocode.trim();
@@ -139,6 +183,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 body: JSON.stringify({ size: UI.dataSizeInput.value, dtype: currentDataType, sorted: isSorted })
             });
             currentData = await response.json();
+            currentDatasetId = response.headers.get('X-Dataset-Id');
             animator.drawInitialState(currentDataType, currentData);
             animator.updateLog("New data generated. Ready to run an algorithm.");
 
@@ -161,6 +206,25 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Number of input elements a run works on, the proxy for how long its trace will be
+    function inputSize(ds, params) {
+        if (ds === 'conceptual') return Number(params.n) || 0;
+        if (ds === 'graph') return Object.keys(currentData.adjacency_list || {}).length;
+        return currentData.length;
+    }
+
+    // Accept header and body fields for a run of `size` elements (see TRACE_TRANSPORT)
+    function traceTransport(size, params) {
+        if (size > TRACE_TRANSPORT.STREAM_MAX_ITEMS) {
+            // The animator fetches it a window at a time, so long traces never sit in the browser whole
+            params.paginate = true;
+            return 'application/json';
+        }
+        // Both are kept in the server's trace cache, so a rerun is answered without running again
+        if (size > TRACE_TRANSPORT.WHOLE_MAX_ITEMS) return 'application/x-ndjson';
+        return 'application/vnd.algomirror.trace, application/json;q=0.5';
+    }
+
     async function runAlgorithm() {
         const algoKey = UI.algoSelect.value;
         const algoInfo = ALL_CONTENT.algorithms[algoKey];
@@ -179,7 +243,8 @@ document.addEventListener('DOMContentLoaded', () => {
                     animator.updateLog("Please generate data first.");
                     return;
                 }
-                params.input_data = currentData;
+                if (currentDatasetId) params.dataset_id = currentDatasetId;
+                else params.input_data = currentData;
                 if (algoInfo.category === 'Searching') {
                     if (!UI.targetValueInput.value) {
                         animator.updateLog("Please enter a target value.");
@@ -190,7 +255,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 if (['Graph Traversal', 'Shortest Path'].includes(algoInfo.category)) {
                     params.start_node = UI.startNodeSelect.value;
                 }
-                if (algoKey === 'dijkstra') {
+                if (algoInfo.category === 'Shortest Path') {
                     params.end_node = UI.endNodeSelect.value;
                 }
                 break;
@@ -208,15 +273,32 @@ document.addEventListener('DOMContentLoaded', () => {
                 break;
         }
 
+        const options = {};
+        UI.optionsGroup.querySelectorAll('select').forEach(select => {
+            options[select.dataset.option] = algoInfo.options[select.dataset.option][select.value];
+        });
+        if (Object.keys(options).length) params.options = options;
+
         setControlsDisabled(true);
         try {
-            const response = await fetch('/run_algorithm', {
+            const accept = traceTransport(inputSize(algoInfo.ds, params), params);
+            const request = () => fetch('/run_algorithm', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Accept': accept },
                 body: JSON.stringify(params)
             });
-            const result = await response.json();
-            if (result.error) throw new Error(result.error);
+            let response = await request();
+            if (response.status === 404 && params.dataset_id) {
+                // The server evicted the dataset; fall back to sending the data itself
+                delete params.dataset_id;
+                params.input_data = currentData;
+                currentDatasetId = null;
+                response = await request();
+            }
+            if (!response.ok) {
+                const result = await response.json();
+                throw new Error(result.error || `HTTP error! status: ${response.status}`);
+            }
 
             // Redraw initial state only if it's a data-driven algorithm
             if (algoInfo.ds !== 'conceptual') {
@@ -225,7 +307,7 @@ document.addEventListener('DOMContentLoaded', () => {
                  animator.clearAll(); // Clear board for conceptual animations
             }
            
-            await animator.runAnimation(result.steps);
+            await animator.runAnimation(await animator.readSteps(response));
         } catch (error) {
             console.error("Algorithm execution failed:", error);
             animator.updateLog(`Execution Error: ${error.message}`);
@@ -0,0 +1,17 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root, next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app, TRACE_CACHE  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    TRACE_CACHE.clear()
+    return app.test_client()
@@ -0,0 +1,103 @@
+# tests/test_batch_search.py
+
+import random
+
+import pytest
+
+from algorithms.searching import batch_search, interpolation_search, linear_search
+
+SEARCHES = ['linear_search', 'binary_search', 'jump_search', 'interpolation_search']
+
+
+@pytest.mark.parametrize('algorithm', SEARCHES)
+def test_batch_answers_match_a_lookup(client, algorithm):
+    rng = random.Random(4)
+    values = sorted(rng.sample(range(1000), 200))
+    targets = [rng.randint(-10, 1010) for _ in range(300)]
+    response = client.post('/batch_search', json={'algorithm': algorithm, 'input_data': values, 'targets': targets, 'trace_sample': 3, 'seed': 1})
+    body = response.get_json()
+    assert response.status_code == 200
+    for target, index in zip(targets, body['indices']):
+        assert (values[index] == target) if index is not None else target not in values
+    assert len(body['traces']) == 3
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2, 3],
+    {'algorithm': 'bubble_sort', 'input_data': [1, 2], 'targets': [1]},
+    {'algorithm': 'binary_search', 'input_data': [1, 2], 'targets': 'x'},
+    {'algorithm': 'binary_search', 'input_data': [1, 2], 'targets': []},
+    {'algorithm': 'binary_search', 'input_data': ['a', 'b'], 'targets': [1]},
+    {'algorithm': 'binary_search', 'input_data': {'a': 1}, 'targets': [1]},
+    {'algorithm': 'binary_search', 'input_data': [2, 1], 'targets': [1]},
+    {'algorithm': 'binary_search', 'input_data': [1, 2], 'targets': [1], 'trace_sample': 'x'},
+    {'algorithm': 'binary_search', 'input_data': [1, 2], 'targets': [1], 'trace_sample': -1},
+    {'algorithm': 'binary_search', 'input_data': [1, 2], 'targets': [1], 'trace_sample': 1, 'seed': [1]},
+])
+def test_malformed_batch_requests_are_rejected(client, body):
+    assert client.post('/batch_search', json=body).status_code == 400
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_interpolation_search_handles_runs_of_equal_values(seed):
+    rng = random.Random(seed)
+    values = sorted(rng.choice([3, 3, 3, 7, 7, 9, 12]) for _ in range(rng.randint(1, 30)))
+    for target in range(0, 15):
+        steps = list(interpolation_search(values, target))
+        found = [s['indices'][0] for s in steps if s['action'] == 'found']
+        if target in values:
+            assert len(found) == 1 and values[found[0]] == target
+        else:
+            assert not found
+
+
+@pytest.mark.parametrize('algorithm', SEARCHES)
+def test_batch_search_on_duplicates(client, algorithm):
+    values = [1, 5, 5, 5, 5, 8, 8, 20]
+    targets = [5, 8, 1, 20, 2, 21]
+    body = client.post('/batch_search', json={'algorithm': algorithm, 'input_data': values, 'targets': targets}).get_json()
+    assert body['errors'] == []
+    for target, index in zip(targets, body['indices']):
+        assert (values[index] == target) if index is not None else target not in values
+
+
+def test_equal_values_run_on_run_algorithm(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'interpolation_search', 'input_data': [5, 5], 'target': 5})
+    assert response.status_code == 200
+    assert response.get_json()['steps'][-1]['action'] == 'found'
+
+
+def _broken_search(data, target, is_sorted=None):
+    yield {'action': 'compare', 'indices': [0]}
+    if target == 2:
+        raise ZeroDivisionError('division by zero')
+    yield {'action': 'found', 'indices': [0]}
+
+
+def test_failing_target_is_reported_without_ending_the_batch():
+    answers = {target: (index, error) for target, index, _, error in batch_search(_broken_search, [1, 2, 3], [1, 2, 3])}
+    assert answers[1] == (0, None) and answers[3] == (0, None)
+    assert answers[2] == (None, 'ZeroDivisionError: division by zero')
+
+
+class _Unscanned(list):
+    """An array that fails if anything walks it, so only a supplied index can answer."""
+
+    def __iter__(self):
+        raise AssertionError('the array was scanned')
+
+
+def test_linear_batch_reuses_supplied_positions():
+    values = _Unscanned([7, 3, 7, 9])
+    answers = {t: (i, c) for t, i, c, _ in batch_search(linear_search, values, [7, 9, 4], positions={7: 0, 3: 1, 9: 3})}
+    assert answers == {7: (0, 1), 9: (3, 4), 4: (None, 4)}
+
+
+def test_dataset_linear_batch_matches_inline(client):
+    values = [5, 1, 5, 8, 2, 8]
+    targets = [8, 5, 3, 2]
+    dataset_id = client.post('/datasets', json={'kind': 'array', 'data': values}).get_json()['dataset_id']
+    inline = client.post('/batch_search', json={'algorithm': 'linear_search', 'input_data': values, 'targets': targets}).get_json()
+    stored = client.post('/batch_search', json={'algorithm': 'linear_search', 'dataset_id': dataset_id, 'targets': targets}).get_json()
+    assert stored['indices'] == inline['indices'] == [3, 0, None, 4]
+    assert stored['comparisons'] == inline['comparisons']
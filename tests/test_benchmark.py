@@ -0,0 +1,35 @@
+# tests/test_benchmark.py
+
+import pytest
+
+from app import ALGORITHM_FUNCTIONS
+from benchmark import main, run_benchmark
+
+
+@pytest.fixture(scope='module')
+def report():
+    return run_benchmark(list(ALGORITHM_FUNCTIONS), 16, 256, 2.0, 0, track_memory=False)
+
+
+def test_every_algorithm_matches_its_declared_complexity(report):
+    assert {fit['algorithm'] for fit in report['fits']} == set(ALGORITHM_FUNCTIONS)
+    failed = [fit for fit in report['fits'] if fit['status'] != 'ok']
+    assert failed == []
+
+
+def test_exponential_algorithms_step_n_by_one(report):
+    hanoi = next(fit for fit in report['fits'] if fit['algorithm'] == 'hanoi')
+    assert hanoi['sizes'] == list(range(1, 11))
+    assert hanoi['expected_range'] == [0.8, 1.2]
+
+
+def test_insufficient_data_has_its_own_exit_code(tmp_path):
+    output = str(tmp_path / 'bench.json')
+    assert main(['--algorithms', 'hanoi', 'fib_dp', '--no-memory', '--output', output]) == 0
+    assert main(['--algorithms', 'hanoi', '--no-memory', '--max-size', '1', '--output', output]) == 2
+
+
+def test_goal_directed_searches_run_to_the_farthest_node(report):
+    fits = {fit['algorithm']: fit for fit in report['fits']}
+    assert fits['astar']['steps_exponent'] >= 0.8
+    assert fits['bidirectional_dijkstra']['expected_range'][0] is None
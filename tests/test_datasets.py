@@ -0,0 +1,66 @@
+# tests/test_datasets.py
+
+import pytest
+
+from datasets import DatasetRegistry, validate
+from graph_generator import generate_graph
+
+
+@pytest.mark.parametrize('kind, data', [
+    ('graph', {'nodes': {}}),
+    ('graph', {'adjacency_list': {'A': 'B'}}),
+    ('graph', {'adjacency_list': {'A': [{'weight': 3}]}}),
+    ('graph', {'adjacency_list': {'A': [{'node': 'B', 'weight': '3'}]}}),
+    ('graph', {'adjacency_list': {'A': [{'node': 'B', 'weight': True}]}}),
+    ('graph', {'adjacency_list': {'A': [1]}}),
+    ('graph', {'adjacency_list': {'A': ['B']}, 'nodes': {'A': {'x': 1}}}),
+    ('graph', {'adjacency_list': {'A': ['B']}, 'nodes': ['A']}),
+    ('array', [1, 'two', 3]),
+    ('array', [1, True]),
+    ('tree', {'values': [1, 2]}),
+    ('matrix', [[1]]),
+])
+def test_malformed_uploads_are_rejected_with_400(client, kind, data):
+    response = client.post('/datasets', json={'kind': kind, 'data': data})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+    with pytest.raises(ValueError):
+        validate(kind, data)
+
+
+def test_upload_body_must_be_an_object(client):
+    assert client.post('/datasets', json=[1, 2, 3]).status_code == 400
+
+
+def test_graph_upload_and_run(client):
+    graph = generate_graph(30, seed=6)
+    created = client.post('/datasets', json={'kind': 'graph', 'data': graph})
+    assert created.status_code == 201
+    info = created.get_json()
+    assert info['nodes'] == 30
+    nodes = list(graph['nodes'])
+    run = client.post('/run_algorithm', json={'algorithm': 'dijkstra', 'dataset_id': info['dataset_id'], 'start_node': nodes[0], 'end_node': nodes[-1]})
+    assert run.status_code == 200
+    assert run.get_json()['steps'][-1]['action'] == 'complete'
+
+
+def test_bare_label_neighbors_are_accepted():
+    registry = DatasetRegistry(max_items=100)
+    dataset = registry.register('graph', {'adjacency_list': {'A': ['B', {'node': 'C', 'weight': 2.5}]}})
+    assert dataset.describe()['nodes'] == 3
+
+
+def test_registering_the_same_data_twice_returns_one_dataset():
+    registry = DatasetRegistry(max_items=100)
+    assert registry.register('array', [3, 1, 2]) is registry.register('array', [3, 1, 2])
+
+
+def test_array_size_counts_the_first_index_map():
+    registry = DatasetRegistry(max_items=100)
+    dataset = registry.register('array', [5, 3, 5, 1])
+    assert dataset.positions == {5: 0, 3: 1, 1: 3}
+    assert dataset.size == registry.stats()['items'] == 4 + 3
+    assert dataset.describe()['min'] == 1 and dataset.describe()['max'] == 5
+    # Forty distinct values need eighty elements of budget, so they do not fit in seventy
+    small = DatasetRegistry(max_items=70)
+    assert small.register('array', list(range(40))).id not in small
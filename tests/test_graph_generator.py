@@ -0,0 +1,53 @@
+# tests/test_graph_generator.py
+
+import math
+
+import pytest
+
+from graph_generator import GOLDEN_ANGLE, GRAPH_FAMILIES, HEIGHT, MARGIN, WIDTH, generate_graph, layout
+
+
+@pytest.mark.parametrize('n', [27, 100, 5000])
+def test_spiral_layout_matches_the_vogel_formula(n):
+    center_x, center_y = WIDTH / 2, HEIGHT / 2
+    expected = [(center_x + (center_x - MARGIN) * math.sqrt(i + 0.5) / math.sqrt(n) * math.cos(i * GOLDEN_ANGLE),
+                 center_y + (center_y - MARGIN) * math.sqrt(i + 0.5) / math.sqrt(n) * math.sin(i * GOLDEN_ANGLE)) for i in range(n)]
+    assert layout(n) == expected
+
+
+@pytest.mark.parametrize('n', [1, 5, 26, 27, 3000])
+def test_layout_stays_on_the_canvas(n):
+    positions = layout(n)
+    assert len(positions) == n
+    assert all(0 <= x <= WIDTH and 0 <= y <= HEIGHT for x, y in positions)
+
+
+@pytest.mark.parametrize('family', GRAPH_FAMILIES)
+def test_generated_graphs_are_undirected_and_reproducible(family):
+    graph = generate_graph(200, family, seed=4)
+    assert graph == generate_graph(200, family, seed=4)
+    assert len(graph['nodes']) == 200
+    edges = {(u, e['node'], e['weight']) for u, adjacent in graph['adjacency_list'].items() for e in adjacent}
+    assert all((v, u, w) in edges for u, v, w in edges)
+
+
+def test_generate_data_route_returns_a_graph(client):
+    response = client.post('/generate_data', json={'dtype': 'graph', 'size': 40, 'family': 'grid', 'seed': 3})
+    graph = response.get_json()
+    assert response.status_code == 200
+    assert len(graph['nodes']) == len(graph['adjacency_list']) == 40
+
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {'dtype': 'graph', 'size': 'x'},
+    {'dtype': 'tree', 'size': -5},
+    {'dtype': 'array', 'size': None},
+    {'dtype': 'graph', 'size': 0},
+    {'dtype': 'graph', 'family': 'nope'},
+    {'dtype': 'graph', 'density': 'dense'},
+    {'dtype': 'graph', 'weights': 'heavy'},
+    {'dtype': 'graph', 'seed': [1]},
+])
+def test_malformed_generate_requests_are_rejected(client, body):
+    assert client.post('/generate_data', json=body).status_code == 400
@@ -0,0 +1,61 @@
+# tests/test_hanoi.py
+
+import pytest
+
+from algorithms.other_algorithms import HANOI_PEGS, hanoi_move, hanoi_state, hanoi_window_steps
+
+
+def _solve(n, source='A', target='C', spare='B'):
+    """The textbook recursion: (disk, from, to) of every move."""
+    if n == 0:
+        return []
+    return _solve(n - 1, source, spare, target) + [(n, source, target)] + _solve(n - 1, spare, target, source)
+
+
+@pytest.mark.parametrize('n', range(0, 9))
+def test_moves_and_states_match_the_recursive_solution(n):
+    towers = {peg: [] for peg in HANOI_PEGS}
+    towers['A'] = list(range(n, 0, -1))
+    assert hanoi_state(n, 0) == towers
+    for k, (disk, source, target) in enumerate(_solve(n), 1):
+        assert hanoi_move(n, k) == (disk, source, target)
+        assert towers[source][-1] == disk
+        towers[target].append(towers[source].pop())
+        assert hanoi_state(n, k) == towers
+
+
+def test_state_of_a_large_puzzle_is_direct():
+    n = 53
+    total = (1 << n) - 1
+    assert hanoi_state(n, total) == {'A': [], 'B': [], 'C': list(range(n, 0, -1))}
+    middle = hanoi_state(n, 1 << (n - 1))
+    # Right after the largest disk moves, it sits alone on C and the rest are on B
+    assert middle == {'A': [], 'B': list(range(n - 1, 0, -1)), 'C': [n]}
+
+
+def test_window_moves_continue_from_the_state_at_start():
+    n, start = 7, 37
+    steps = list(hanoi_window_steps(n, start, 20))
+    assert steps[0]['action'] == 'set_towers' and steps[0]['move'] == start
+    assert [(s['disk_id'], s['from_peg'], s['to_peg']) for s in steps[1:]] == _solve(n)[start:start + 20]
+
+
+def test_window_route_returns_the_requested_moves(client):
+    response = client.post('/hanoi_window', json={'n': 40, 'start': 123456789, 'count': 5})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['total_moves'] == (1 << 40) - 1
+    assert [s['move'] for s in body['steps'][1:]] == list(range(123456790, 123456795))
+
+
+@pytest.mark.parametrize('body', [
+    {'n': 'three'},
+    {'n': 54},
+    {'n': 3, 'start': 8},
+    {'n': 3, 'start': -1},
+    {'n': 3, 'count': -1},
+    {'n': 3, 'count': 10 ** 9},
+    [3, 0, 5],
+])
+def test_malformed_window_requests_are_rejected(client, body):
+    assert client.post('/hanoi_window', json=body).status_code == 400
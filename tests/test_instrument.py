@@ -0,0 +1,48 @@
+# tests/test_instrument.py
+
+import random
+
+import pytest
+
+from algorithms.instrument import count_operations
+from app import COUNTED_ALGORITHMS, build_steps
+from graph_generator import generate_graph
+
+
+def _request(key, rng):
+    if key in ('bfs', 'dfs', 'dijkstra', 'astar', 'bidirectional_dijkstra'):
+        graph = generate_graph(80, seed=rng.randint(0, 99))
+        nodes = list(graph['nodes'])
+        return {'input_data': graph, 'start_node': nodes[0], 'end_node': nodes[-1]}
+    return {'input_data': [rng.randint(-50, 300) for _ in range(rng.choice([0, 1, 2, 40, 150]))]}
+
+
+def _without_time(result):
+    return {k: v for k, v in result.items() if k != 'wall_time_ms'}
+
+
+@pytest.mark.parametrize('key', COUNTED_ALGORITHMS)
+@pytest.mark.parametrize('seed', range(4))
+def test_headless_counts_match_the_animated_trace(key, seed):
+    data = _request(key, random.Random(seed))
+    animated = count_operations(build_steps(key, data))
+    headless = count_operations(build_steps(key, data, record=False))
+    assert _without_time(headless) == _without_time(animated)
+
+
+@pytest.mark.parametrize('options', [{'mode': 'natural'}, {'partition': 'lomuto', 'pivot': 'random'}, {'introsort': True, 'pivot': 'last'}])
+def test_headless_counts_match_with_options(options):
+    key = 'merge_sort' if 'mode' in options else 'quick_sort'
+    data = {'input_data': [5, 4, 3, 2, 1] * 30 + list(range(60)), 'options': options}
+    assert _without_time(count_operations(build_steps(key, data, record=False))) == _without_time(count_operations(build_steps(key, data)))
+
+
+def test_headless_run_builds_no_steps():
+    assert all(not isinstance(step, dict) for step in build_steps('merge_sort', {'input_data': [3, 1, 2]}, record=False))
+
+
+def test_counters_mode_endpoint(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'quick_sort', 'input_data': [3, 1, 2, 5, 4], 'instrument': 'counters'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['counters']['comparisons'] > 0 and body['steps'] == sum(body['actions'].values())
@@ -0,0 +1,35 @@
+# tests/test_integer_sorts.py
+
+import pytest
+
+INTEGER_SORTS = ['counting_sort', 'radix_sort']
+
+
+@pytest.mark.parametrize('algorithm', INTEGER_SORTS)
+@pytest.mark.parametrize('values', [[1.5, 2.5, 0.5], [3, 1, 2.0], [1e3, 2]])
+def test_float_input_is_rejected(client, algorithm, values):
+    response = client.post('/run_algorithm', json={'algorithm': algorithm, 'input_data': values})
+    assert response.status_code == 400
+    assert 'integers' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('algorithm', INTEGER_SORTS)
+def test_float_dataset_is_rejected(client, algorithm):
+    dataset = client.post('/datasets', json={'kind': 'array', 'data': [1.5, 2.5, 0.5]}).get_json()
+    assert dataset['integers'] is False
+    response = client.post('/run_algorithm', json={'algorithm': algorithm, 'dataset_id': dataset['dataset_id']})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('algorithm', INTEGER_SORTS)
+def test_integer_input_still_runs(client, algorithm):
+    dataset = client.post('/datasets', json={'kind': 'array', 'data': [5, -3, 12, 0, 5]}).get_json()
+    for request in ({'input_data': [5, -3, 12, 0, 5]}, {'dataset_id': dataset['dataset_id']}):
+        response = client.post('/run_algorithm', json={'algorithm': algorithm, **request})
+        assert response.status_code == 200
+        assert response.get_json()['steps'][-1]['action'] == 'complete'
+
+
+def test_bucket_sort_still_takes_floats(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'bucket_sort', 'input_data': [1.5, 2.5, 0.5]})
+    assert response.status_code == 200
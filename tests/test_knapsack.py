@@ -0,0 +1,93 @@
+# tests/test_knapsack.py
+
+import random
+import time
+from itertools import combinations
+
+import pytest
+
+from algorithms.other_algorithms import KNAPSACK_MAX_ITEMS, KNAPSACK_MODES, knapsack_01_steps
+from executor import DeadlineExceeded, deadline_guard
+
+
+def _instance(seed, n):
+    rng = random.Random(seed)
+    items = [{'weight': rng.randint(1, 12), 'value': rng.randint(0, 30)} for _ in range(n)]
+    return rng.randint(0, sum(item['weight'] for item in items)), items
+
+
+def _brute_force(capacity, items):
+    return max(sum(items[i]['value'] for i in chosen)
+               for r in range(len(items) + 1) for chosen in combinations(range(len(items)), r)
+               if sum(items[i]['weight'] for i in chosen) <= capacity)
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_modes_agree_with_brute_force(seed):
+    capacity, items = _instance(seed, seed % 9)
+    best = _brute_force(capacity, items)
+    for mode in KNAPSACK_MODES:
+        steps = list(knapsack_01_steps(capacity, items, mode=mode))
+        if steps[-1]['action'] == 'error':
+            assert mode == 'table'
+            continue
+        complete = steps[-1]
+        assert complete['result'] == best
+        if mode != 'rolling':
+            chosen = complete['items']
+            assert chosen == sorted(set(chosen))
+            assert sum(items[i]['value'] for i in chosen) == best
+            assert complete['weight'] == sum(items[i]['weight'] for i in chosen) <= capacity
+
+
+def test_hirschberg_matches_table_on_larger_instances():
+    for seed in range(5):
+        capacity, items = _instance(seed, 60)
+        capacity = min(capacity, 40)
+        table = list(knapsack_01_steps(capacity, items[:8], mode='table'))[-1]
+        hirschberg = list(knapsack_01_steps(capacity, items[:8], mode='hirschberg'))[-1]
+        assert hirschberg['result'] == table['result']
+        rolling = list(knapsack_01_steps(capacity, items, mode='rolling'))[-1]
+        assert list(knapsack_01_steps(capacity, items, mode='hirschberg'))[-1]['result'] == rolling['result']
+
+
+@pytest.mark.parametrize('body', [
+    {'capacity': '10', 'items': [{'weight': 2, 'value': 3}]},
+    {'capacity': -1, 'items': [{'weight': 2, 'value': 3}]},
+    {'capacity': 10, 'items': {'weight': 2, 'value': 3}},
+    {'capacity': 10, 'items': [{'weight': 0, 'value': 3}]},
+    {'capacity': 10, 'items': [{'weight': 2}]},
+    {'capacity': 10, 'items': [[2, 3]]},
+    {'n': 'many'},
+    {'capacity': 10, 'items': [{'weight': 2, 'value': 3}], 'options': {'mode': 'greedy'}},
+])
+def test_malformed_knapsack_requests_are_rejected(client, body):
+    assert client.post('/run_algorithm', json={'algorithm': 'knapsack_01', **body}).status_code == 400
+
+
+def test_item_count_is_capped(client):
+    started = time.monotonic()
+    response = client.post('/run_algorithm', json={'algorithm': 'knapsack_01', 'n': 1_000_000, 'capacity': 1000})
+    assert response.status_code == 400
+    assert time.monotonic() - started < 1
+    items = [{'weight': 1, 'value': 1}] * (KNAPSACK_MAX_ITEMS + 1)
+    assert client.post('/run_algorithm', json={'algorithm': 'knapsack_01', 'capacity': 10, 'items': items}).status_code == 400
+
+
+def test_hirschberg_passes_stop_at_the_deadline():
+    rng = random.Random(1)
+    items = [{'weight': rng.randint(1, 50), 'value': rng.randint(1, 50)} for _ in range(2000)]
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        for _ in deadline_guard(knapsack_01_steps(20_000, items, mode='hirschberg'), 0.05):
+            pass
+    assert time.monotonic() - started < 3
+
+
+def test_hirschberg_rows_cover_each_pass():
+    capacity, items = _instance(3, 8)
+    steps = list(knapsack_01_steps(capacity, items, mode='hirschberg'))
+    for split in (s for s in steps if s['action'] == 'knapsack_split'):
+        lo, hi = split['range']
+        rows = [s['row'] for s in steps if s['action'] == 'dp_row' and tuple(s['range']) in ((lo, split['split']), (split['split'], hi))]
+        assert sorted(set(rows)) == list(range(lo + 1, hi + 1))
@@ -0,0 +1,34 @@
+# tests/test_messages.py
+
+import pytest
+
+from algorithms.other_algorithms import bitwise_swap_steps, count_set_bits_steps, fractional_knapsack_steps
+from app import render_messages
+from content import MESSAGE_TEMPLATES
+
+
+def _rendered(steps):
+    steps = list(render_messages(steps))
+    for step in steps:
+        assert step['message_id'] in MESSAGE_TEMPLATES
+    return [step['message'] for step in steps]
+
+
+def test_fractional_knapsack_messages():
+    items = [{'id': 'a', 'weight': 10, 'value': 60}, {'id': 'b', 'weight': 20, 'value': 100}, {'id': 'c', 'weight': 30, 'value': 120}]
+    messages = _rendered(fractional_knapsack_steps(50, items))
+    assert 'Took all of item a. Capacity left: 40.00.' in messages
+    assert 'Took 66.7% of item c. Knapsack is now full.' in messages
+    assert messages[-1] == 'Greedy knapsack complete. Total value is 240.00.'
+
+
+def test_bitwise_swap_messages():
+    messages = _rendered(bitwise_swap_steps(5, 9))
+    assert messages[1:4] == ['Step 1: a = a XOR b (5 ^ 9) = 12', 'Step 2: b = a XOR b (12 ^ 9) = 5', 'Step 3: a = a XOR b (12 ^ 5) = 9']
+
+
+@pytest.mark.parametrize('n, count', [(0, 0), (1, 1), (13, 3), (255, 8)])
+def test_count_set_bits_messages(n, count):
+    messages = _rendered(count_set_bits_steps(n))
+    assert messages[-1] == f'Finished. The number of set bits in {n} is {count}.'
+
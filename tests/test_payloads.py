@@ -0,0 +1,54 @@
+# tests/test_payloads.py
+
+import gzip
+import json
+
+import pytest
+
+ROUTES = ['/get_content', '/get_content?detail=full', '/algorithms/avl_tree']
+
+
+@pytest.mark.parametrize('url', ROUTES)
+def test_identity_response_revalidates_to_304(client, url):
+    first = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert first.status_code == 200 and 'Content-Encoding' not in first.headers
+    assert first.headers['Vary'] == 'Accept-Encoding'
+    json.loads(first.get_data())
+    again = client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.get_data() == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+
+@pytest.mark.parametrize('url', ROUTES)
+def test_gzip_variant_has_its_own_etag(client, url):
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    zipped = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert zipped.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+    # The identity ETag does not validate the gzip bytes, and the other way round
+    assert client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']}).status_code == 200
+    assert client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']}).status_code == 304
+    assert client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': zipped.headers['ETag']}).status_code == 200
+
+
+def test_brotli_variant(client):
+    brotli = pytest.importorskip('brotli')
+    plain = client.get('/get_content', headers={'Accept-Encoding': 'identity'})
+    compressed = client.get('/get_content', headers={'Accept-Encoding': 'br, gzip;q=0.5'})
+    assert compressed.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(compressed.get_data()) == plain.get_data()
+    assert client.get('/get_content', headers={'Accept-Encoding': 'br', 'If-None-Match': compressed.headers['ETag']}).status_code == 304
+
+
+def test_summary_and_full_catalogue_differ(client):
+    summary = client.get('/get_content', headers={'Accept-Encoding': 'identity'})
+    full = client.get('/get_content?detail=full', headers={'Accept-Encoding': 'identity'})
+    assert summary.headers['ETag'] != full.headers['ETag']
+    assert 'idea' not in summary.get_json()['algorithms']['avl_tree']
+    assert 'idea' in full.get_json()['algorithms']['avl_tree']
+
+
+def test_unknown_algorithm_is_404(client):
+    assert client.get('/algorithms/no_such_sort').status_code == 404
@@ -0,0 +1,54 @@
+# tests/test_quick_sort.py
+
+import random
+
+import pytest
+
+from algorithms.instrument import count_operations
+from app import build_steps
+from benchmark import fit_exponent, parse_complexity
+from content import ALGORITHM_CONTENT
+
+
+def _comparisons(data, **options):
+    result = count_operations(build_steps('quick_sort', {'input_data': data, 'options': options}, record=False))
+    return result['counters'].get('comparisons', 0)
+
+
+def _exponent(make, **options):
+    return fit_exponent([(n, _comparisons(make(n), **options)) for n in (256, 512, 1024, 2048)])
+
+
+def _sorted_output(data, **options):
+    arr = list(data)
+    for step in build_steps('quick_sort', {'input_data': data, 'options': options}):
+        if step['action'] == 'swap':
+            i, j = step['indices']
+            arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+@pytest.mark.parametrize('pivot', ['median_of_three', 'last', 'random', 'ninther'])
+@pytest.mark.parametrize('partition', ['three_way', 'lomuto'])
+@pytest.mark.parametrize('introsort', [True, False])
+def test_every_option_combination_sorts(pivot, partition, introsort):
+    data = [random.Random(1).randint(0, 30) for _ in range(200)]
+    assert _sorted_output(data, pivot=pivot, partition=partition, introsort=introsort) == sorted(data)
+
+
+def test_declared_bounds_are_the_baseline_ones():
+    complexity = ALGORITHM_CONTENT['quick_sort']['complexity']
+    assert (complexity['time_best'], complexity['time_worst']) == ('O(n log n)', 'O(n^2)')
+    assert parse_complexity(complexity['time_worst']) == (2.0, False)
+
+
+def test_last_pivot_without_introsort_is_quadratic_on_sorted_input():
+    assert _exponent(lambda n: list(range(n)), pivot='last', partition='lomuto', introsort=False) > 1.8
+
+
+def test_introsort_bounds_the_worst_case():
+    assert _exponent(lambda n: list(range(n)), pivot='last', partition='lomuto', introsort=True) < 1.4
+
+
+def test_three_way_partition_is_linear_on_equal_keys():
+    assert _exponent(lambda n: [7] * n, partition='three_way') < 1.1
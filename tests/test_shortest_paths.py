@@ -0,0 +1,77 @@
+# tests/test_shortest_paths.py
+
+import random
+
+import pytest
+
+from app import TREE_CACHE, app, build_steps
+from graph_generator import generate_graph
+
+
+def _distance(key, graph, start, end):
+    """The distance an animated run reports, or None when it finds no path."""
+    last = [step for step in build_steps(key, {'input_data': graph, 'start_node': start, 'end_node': end})
+            if step['action'] in ('highlight_path', 'path_not_found')][-1]
+    return last.get('distance')
+
+
+@pytest.mark.parametrize('family', ['random', 'grid', 'geometric', 'barabasi_albert'])
+def test_bidirectional_dijkstra_agrees_with_dijkstra(family):
+    rng = random.Random(family)
+    graph = generate_graph(120, family, seed=rng.randint(0, 999), density=1.2)
+    nodes = list(graph['nodes'])
+    for _ in range(15):
+        start, end = rng.choice(nodes), rng.choice(nodes)
+        assert _distance('bidirectional_dijkstra', graph, start, end) == _distance('dijkstra', graph, start, end)
+
+
+def test_bidirectional_dijkstra_path_is_a_real_path():
+    graph = generate_graph(200, seed=8)
+    weights = {(u, e['node']): e['weight'] for u, adjacent in graph['adjacency_list'].items() for e in adjacent}
+    nodes = list(graph['nodes'])
+    for step in build_steps('bidirectional_dijkstra', {'input_data': graph, 'start_node': nodes[3], 'end_node': nodes[150]}):
+        if step['action'] == 'highlight_path':
+            path = step['path']
+            assert path[0] == nodes[3] and path[-1] == nodes[150]
+            assert sum(weights[edge] for edge in zip(path, path[1:])) == step['distance']
+
+
+def test_shortest_paths_match_the_animated_run(client):
+    TREE_CACHE.clear()
+    graph = generate_graph(60, seed=2)
+    nodes = list(graph['nodes'])
+    body = client.post('/shortest_paths', json={'input_data': graph, 'start_node': nodes[0], 'end_nodes': nodes[1:]}).get_json()
+    for end in nodes[1:]:
+        expected = _distance('dijkstra', graph, nodes[0], end)
+        assert (body['paths'][end] or {}).get('distance') == expected
+
+
+GRAPH = {'adjacency_list': {'A': [{'node': 'B', 'weight': 2}], 'B': []}}
+
+
+@pytest.mark.parametrize('request_body', [
+    {'input_data': [1, 2], 'start_node': 'A', 'end_node': 'B'},
+    {'input_data': {'nodes': {}}, 'start_node': 'A', 'end_node': 'B'},
+    {'input_data': GRAPH, 'start_node': 'Z', 'end_node': 'B'},
+    {'input_data': GRAPH, 'start_node': ['A'], 'end_node': 'B'},
+    {'input_data': GRAPH, 'start_node': 'A', 'end_nodes': 'B'},
+    {'input_data': GRAPH, 'start_node': 'A', 'end_nodes': [['B']]},
+    {'input_data': {'adjacency_list': {'A': [{'weight': 2}]}}, 'start_node': 'A', 'end_node': 'A'},
+    {'input_data': {'adjacency_list': {'A': [{'node': 'B', 'weight': 'heavy'}]}}, 'start_node': 'A', 'end_node': 'B'},
+    {'input_data': {'adjacency_list': {'A': 7}}, 'start_node': 'A', 'end_node': 'A'},
+    [GRAPH, 'A', 'B'],
+])
+def test_malformed_queries_are_rejected(client, request_body):
+    TREE_CACHE.clear()
+    response = client.post('/shortest_paths', json=request_body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_tree_build_runs_under_the_dijkstra_deadline(client, monkeypatch):
+    TREE_CACHE.clear()
+    monkeypatch.setitem(app.config['ALGORITHM_DEADLINES'], 'dijkstra', 0)
+    graph = generate_graph(50, seed=1)
+    response = client.post('/shortest_paths', json={'input_data': graph, 'start_node': next(iter(graph['nodes'])), 'end_node': '7'})
+    assert response.status_code == 504
+    assert response.get_json()['timeout'] is True
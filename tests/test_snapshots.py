@@ -0,0 +1,101 @@
+# tests/test_snapshots.py
+
+import json
+import random
+
+import pytest
+
+from algorithms.other_algorithms import hanoi_state, hanoi_window_steps
+from algorithms.snapshots import DictSnapshots, ListSnapshots, apply_snapshots
+from app import build_steps
+from graph_generator import generate_graph
+
+
+def test_dict_snapshots_replay_every_step():
+    rng = random.Random(5)
+    truth, replayed = {k: 0 for k in range(50)}, {}
+    snapshots = DictSnapshots('distances')
+    for _ in range(2000):
+        changed = rng.sample(range(50), rng.randint(0, 3))
+        for k in changed:
+            truth[k] = rng.randint(0, 99)
+        apply_snapshots(replayed, snapshots.record(truth, changed))
+        assert replayed['distances'] == truth
+
+
+def test_list_snapshots_replay_every_step():
+    rng = random.Random(7)
+    truth, replayed = [], {}
+    snapshots = ListSnapshots('queue_state')
+    for i in range(2000):
+        shift = rng.randint(0, min(2, len(truth)))
+        pop = rng.randint(0, min(1, len(truth) - shift))
+        push = [i] * rng.randint(0, 3)
+        del truth[:shift]
+        del truth[len(truth) - pop:]
+        truth.extend(push)
+        apply_snapshots(replayed, snapshots.record(truth, push=push, shift=shift, pop=pop))
+        assert replayed['queue_state'] == truth
+
+
+def test_keyframes_only_once_deltas_outweigh_the_state():
+    snapshots = DictSnapshots('distances')
+    state = dict.fromkeys(range(10), 0)
+    kinds = ['distances' in snapshots.record(state, changed=(0,)) for _ in range(25)]
+    # The first record, then one after every 10 single-key deltas
+    assert [i for i, keyframe in enumerate(kinds) if keyframe] == [0, 11, 22]
+
+
+@pytest.mark.parametrize('n_disks, start', [(5, 0), (7, 40)])
+def test_hanoi_towers_replay_matches_hanoi_state(n_disks, start):
+    state = {}
+    for step in hanoi_window_steps(n_disks, start):
+        apply_snapshots(state, step)
+        if 'move' in step:
+            assert state['towers_state'] == hanoi_state(n_disks, step['move'])
+
+
+def _keyframe_every_step(policy):
+    class Full(policy):
+        def record(self, *args, **kwargs):
+            self.pending = None
+            return super().record(*args, **kwargs)
+    return Full
+
+
+def _replayed_states(steps):
+    state = {}
+    for step in steps:
+        apply_snapshots(state, step)
+        yield json.loads(json.dumps(state))
+
+
+@pytest.mark.parametrize('key', ['bfs', 'dfs', 'dijkstra', 'astar', 'bidirectional_dijkstra', 'tree_traversal', 'fib_dp'])
+def test_replay_matches_a_trace_of_full_copies(key, monkeypatch):
+    graph = generate_graph(60, seed=11)
+    nodes = list(graph['nodes'])
+    if key == 'tree_traversal':
+        data = {'input_data': random.Random(2).sample(range(200), 60)}
+    elif key == 'fib_dp':
+        data = {'n': 12}
+    else:
+        data = {'input_data': graph, 'start_node': nodes[0], 'end_node': nodes[-1]}
+    adaptive = list(build_steps(key, data))
+    for module in ('algorithms.graphs', 'algorithms.trees', 'algorithms.other_algorithms'):
+        monkeypatch.setattr(f'{module}.DictSnapshots', _keyframe_every_step(DictSnapshots), raising=False)
+        monkeypatch.setattr(f'{module}.ListSnapshots', _keyframe_every_step(ListSnapshots), raising=False)
+    full = list(build_steps(key, data))
+    assert len(adaptive) == len(full)
+    assert list(_replayed_states(adaptive)) == list(_replayed_states(full))
+
+
+def _bytes_per_step(size):
+    graph = generate_graph(size, seed=1)
+    nodes = list(graph['nodes'])
+    steps = list(build_steps('dijkstra', {'input_data': graph, 'start_node': nodes[0], 'end_node': nodes[-1]}))
+    return len(json.dumps(steps)) / len(steps)
+
+
+def test_dijkstra_trace_size_is_linear_in_steps():
+    small, large = _bytes_per_step(250), _bytes_per_step(4000)
+    assert large < 1.5 * small
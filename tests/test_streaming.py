@@ -0,0 +1,98 @@
+# tests/test_streaming.py
+
+import json
+
+import pytest
+
+from executor import AlgorithmExecutor, PoolSaturated
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+
+def test_ndjson_stream_matches_json_trace(client):
+    request = {'algorithm': 'bubble_sort', 'input_data': [5, 1, 4, 2, 8, 3]}
+    expected = client.post('/run_algorithm', json=request).get_json()['steps']
+    streamed = client.post('/run_algorithm', json={**request, 'stream': 'ndjson'})
+    assert streamed.mimetype == 'application/x-ndjson'
+    assert _ndjson(streamed) == expected
+
+
+def test_sse_stream_frames_every_step(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'fib_dp', 'n': 6, 'stream': 'sse'})
+    frames = [f for f in response.get_data(as_text=True).split('\n\n') if f]
+    assert all(f.startswith('data: ') for f in frames)
+    assert json.loads(frames[-1][6:])['action'] == 'complete'
+
+
+def test_stream_failure_is_reported_as_final_step(client, monkeypatch):
+    # A deadline fails inside the generator, after the stream has started
+    monkeypatch.setitem(client.application.config['ALGORITHM_DEADLINES'], 'bubble_sort', 0)
+    response = client.post('/run_algorithm', json={'algorithm': 'bubble_sort', 'input_data': list(range(60, 0, -1)), 'stream': 'ndjson'})
+    steps = _ndjson(response)
+    assert steps[-1]['action'] == 'error'
+    assert steps[-1]['partial_steps'] >= len(steps) - 1
+
+
+def test_malformed_input_is_rejected_before_streaming(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'bubble_sort', 'input_data': [3, 'a', 1], 'stream': 'ndjson'})
+    assert response.status_code == 400
+
+
+def _numbers(count):
+    yield from range(count)
+
+
+def _boom():
+    yield 1
+    raise ValueError('boom')
+
+
+def test_stream_runs_in_the_pool_and_counts_against_its_limits():
+    executor = AlgorithmExecutor(max_workers=1, max_queued=0)
+    try:
+        items = executor.stream(_numbers, 100000, timeout=10)
+        assert executor.stats()['in_flight'] == 1
+        with pytest.raises(PoolSaturated):
+            executor.stream(_numbers, 10, timeout=10)
+        assert list(items) == list(range(100000))
+    finally:
+        executor.shutdown()
+
+
+def test_stream_reraises_the_job_error():
+    items = AlgorithmExecutor(max_workers=0).stream(_boom, timeout=10)
+    assert next(items) == 1
+    with pytest.raises(ValueError, match='boom'):
+        next(items)
+
+
+
+# The Accept headers static/js/main.js sends, smallest inputs first (see TRACE_TRANSPORT there)
+@pytest.mark.parametrize('accept,mimetype', [
+    ('application/vnd.algomirror.trace, application/json;q=0.5', 'application/vnd.algomirror.trace'),
+    ('application/x-ndjson', 'application/x-ndjson'),
+])
+def test_unpaginated_ui_runs_are_served_from_the_trace_cache(client, accept, mimetype):
+    request = {'algorithm': 'insertion_sort', 'input_data': [9, 4, 7, 1, 8, 2]}
+    first = client.post('/run_algorithm', json=request, headers={'Accept': accept})
+    assert first.mimetype == mimetype
+    assert first.headers['X-Trace-Cache'] == 'miss'
+    # A streamed body is only cached once it has been read to the end
+    body = first.get_data()
+    again = client.post('/run_algorithm', json=request, headers={'Accept': accept})
+    assert again.headers['X-Trace-Cache'] == 'hit'
+    assert again.get_data() == body
+
+
+def test_paginated_ui_runs_return_a_handle(client):
+    response = client.post('/run_algorithm', json={'algorithm': 'insertion_sort', 'input_data': list(range(300, 0, -1)), 'paginate': True},
+                           headers={'Accept': 'application/json'})
+    body = response.get_json()
+    assert body['total_steps'] > 0 and 'steps' not in body
+
+
+@pytest.mark.parametrize('body', [[1, 2, 3], 'bubble_sort', {'algorithm': 'no_such_sort'}])
+def test_malformed_run_requests_are_rejected(client, body):
+    assert client.post('/run_algorithm', json=body).status_code == 400
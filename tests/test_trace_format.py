@@ -0,0 +1,48 @@
+# tests/test_trace_format.py
+
+import json
+
+import pytest
+
+from app import build_steps
+from graph_generator import generate_graph
+from trace_format import MIMETYPE, decode_columnar, encode_columnar
+
+
+def _round_trip(steps):
+    # Compared as JSON: tuples in a step come back as lists, as they would from jsonify
+    steps = json.loads(json.dumps(list(steps)))
+    assert decode_columnar(encode_columnar(steps)) == steps
+
+
+@pytest.mark.parametrize('key', ['bubble_sort', 'merge_sort', 'quick_sort', 'radix_sort', 'counting_sort', 'bucket_sort'])
+@pytest.mark.parametrize('values', [[], [7], [5, 3, 9, 1, 3, 120, 0, 64]])
+def test_sorting_traces_round_trip(key, values):
+    _round_trip(build_steps(key, {'input_data': values}))
+
+
+def test_empty_tree_traversal_round_trips():
+    _round_trip(build_steps('tree_traversal', {'input_data': []}))
+
+
+def test_graph_trace_round_trips():
+    graph = generate_graph(12, seed=3)
+    _round_trip(build_steps('dijkstra', {'input_data': graph, 'start_node': next(iter(graph['nodes']))}))
+
+
+def test_width_zero_and_ragged_lists():
+    _round_trip([{'action': 'update_range', 'values': []}, {'action': 'update_range', 'values': []},
+                 {'action': 'mark', 'indices': [1]}, {'action': 'mark', 'indices': [2, 3]}, {'action': 'mark', 'indices': []}])
+
+
+def test_mixed_columns_fall_back_to_json():
+    _round_trip([{'action': 'note', 'value': 1.5, 'label': 'a'}, {'action': 'note', 'value': 'x', 'label': None},
+                 {'action': 'note', 'value': 2 ** 40, 'label': 'a'}])
+
+
+def test_run_algorithm_serves_the_columnar_format(client):
+    request = {'algorithm': 'radix_sort', 'input_data': []}
+    expected = client.post('/run_algorithm', json=request).get_json()['steps']
+    response = client.post('/run_algorithm', json=request, headers={'Accept': MIMETYPE})
+    assert response.mimetype == MIMETYPE
+    assert decode_columnar(response.get_data()) == expected
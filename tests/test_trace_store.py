@@ -0,0 +1,146 @@
+# tests/test_trace_store.py
+
+import json
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from algorithms.other_algorithms import hanoi_steps
+from algorithms.snapshots import apply_snapshots
+from executor import AlgorithmExecutor
+from trace_store import DiskTrace, TraceStore, write_trace
+
+
+@pytest.fixture
+def store():
+    store = TraceStore(max_bytes=10 ** 9)
+    yield store
+    store.close()
+
+
+def _steps():
+    # 511 moves with towers_state keyframes and deltas, over many checkpoints
+    return json.loads(json.dumps(list(hanoi_steps(9))))
+
+
+@pytest.mark.parametrize('start,count', [(0, 10), (15, 1), (16, 40), (100, 500), (510, 10), (513, 5), (0, 0)])
+def test_window_matches_the_trace(store, start, count):
+    steps = _steps()
+    trace = write_trace(iter(steps), store.new_path(), interval=16)
+    store.put('hanoi', trace)
+    lines, snapshots = trace.window(start, count)
+    assert isinstance(lines, memoryview)
+    assert json.loads(b'[' + lines[:-2] + b']') == steps[start:start + count]
+    expected = {}
+    for step in steps[:start] if start < len(steps) and count else []:
+        apply_snapshots(expected, step)
+    assert snapshots == expected
+
+
+def test_evicted_trace_stays_readable(store):
+    steps = _steps()
+    trace = write_trace(iter(steps), store.new_path(), interval=16)
+    store.put('first', trace)
+    assert store.open('first') is trace
+    # A second trace pushes the first out, and its files are deleted, while it is still being read
+    store.max_bytes = trace.size
+    store.put('second', write_trace(iter(steps), store.new_path(), interval=16))
+    assert store.get('first') is None
+    assert not os.path.exists(trace.path + '.steps') and not os.path.exists(trace.path + '.state')
+    lines, snapshots = trace.window(300, 20)
+    assert json.loads(b'[' + lines[:-2] + b']') == steps[300:320]
+    assert 'towers_state' in snapshots
+
+
+def test_closed_trace_maps_its_files_per_read(store):
+    steps = _steps()
+    trace = write_trace(iter(steps), store.new_path(), interval=16)
+    store.put('first', trace)
+    lines, _ = trace.window(0, 5)
+    assert json.loads(b'[' + lines[:-2] + b']') == steps[:5]
+    trace.remove()
+    with pytest.raises(FileNotFoundError):
+        trace.window(0, 5)
+
+
+def test_only_max_open_traces_stay_mapped(store):
+    store.max_open = 3
+    traces = [write_trace(iter(_steps()[:40]), store.new_path(), interval=16) for _ in range(6)]
+    for i, trace in enumerate(traces):
+        store.put(i, trace)
+        assert store.open(i) is trace
+    assert store.stats()['open'] == 3
+    assert [trace._maps is not None for trace in traces] == [False] * 3 + [True] * 3
+
+
+def test_trace_count_is_capped(store):
+    store.max_traces = 4
+    for i in range(10):
+        store.put(i, write_trace(iter(_steps()[:3]), store.new_path()))
+    assert store.stats()['traces'] == 4
+    assert store.get(5) is None and store.get(9) is not None
+    assert len(os.listdir(store.directory)) == 2 * 4
+
+
+def test_many_traces_fit_under_a_low_descriptor_limit(store):
+    resource = pytest.importorskip('resource')
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    in_use = len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else 64
+    store.max_open = 8
+    steps = _steps()[:3]
+    resource.setrlimit(resource.RLIMIT_NOFILE, (in_use + 32, hard))
+    try:
+        # Far more traces than descriptors, each stored and read
+        for i in range(400):
+            store.put(i, write_trace(iter(steps), store.new_path()))
+            lines, _ = store.open(i).window(0, 3)
+            assert lines
+        for i in range(0, 400, 7):
+            assert store.open(i).window(1, 1)[0]
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_empty_trace(store):
+    trace = write_trace(iter([]), store.new_path())
+    assert store.put('empty', trace)
+    assert trace.window(0, 10) == (b'', {})
+
+
+def _slow_recording(path, delay):
+    time.sleep(delay)
+    return write_trace(iter(_steps()), path)
+
+
+def test_recording_that_outlives_its_timeout_is_deleted(store):
+    executor = AlgorithmExecutor(max_workers=1, max_queued=0)
+    path = store.new_path()
+    try:
+        with pytest.raises(FutureTimeoutError):
+            executor.run(_slow_recording, path, 0.5, timeout=0.05, abandoned=DiskTrace.remove)
+        # The job finishes its trace after the caller gave up; the files then go
+        deadline = time.monotonic() + 10
+        while executor.stats()['in_flight'] or any(os.path.exists(path + suffix) for suffix in ('.steps', '.state')):
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+    finally:
+        executor.shutdown()
+
+
+def test_window_route(client):
+    run = client.post('/run_algorithm', json={'algorithm': 'hanoi', 'n': 9, 'paginate': True}).get_json()
+    body = client.get(f"/traces/{run['trace_id']}/steps?from=300&count=20").get_json()
+    assert body['total_steps'] == run['total_steps']
+    assert body['steps'] == _steps()[300:320]
+
+
+@pytest.mark.parametrize('query', ['from=-1', 'count=x', 'from=1.5', 'count=-1', 'count=1000000'])
+def test_malformed_window_requests_are_rejected(client, query):
+    run = client.post('/run_algorithm', json={'algorithm': 'hanoi', 'n': 3, 'paginate': True}).get_json()
+    assert client.get(f"/traces/{run['trace_id']}/steps?{query}").status_code == 400
+
+
+def test_unknown_trace_is_404(client):
+    assert client.get('/traces/nope/steps').status_code == 404
@@ -0,0 +1,136 @@
+# tests/test_trees.py
+
+import random
+
+import pytest
+
+from algorithms import trees
+from algorithms.trees import NIL, TreeStore, avl_tree_steps, red_black_tree_steps
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    """Every TreeStore a generator creates, so its final tree can be checked."""
+    created = []
+
+    class RecordingStore(TreeStore):
+        __slots__ = ()
+
+        def __init__(self):
+            super().__init__()
+            created.append(self)
+
+    monkeypatch.setattr(trees, 'TreeStore', RecordingStore)
+    return created
+
+
+def _in_order(store):
+    keys, node, stack = [], store.root, []
+    while stack or node != NIL:
+        while node != NIL:
+            stack.append(node)
+            node = store.left[node]
+        node = stack.pop()
+        keys.append(store.keys[node])
+        node = store.right[node]
+    return keys
+
+
+def _check_links(store):
+    """Parent pointers agree with child pointers and the tree holds `size` nodes."""
+    assert store.root == NIL or store.parent[store.root] == NIL
+    count, stack = 0, [store.root] if store.root != NIL else []
+    while stack:
+        node = stack.pop()
+        count += 1
+        for child in (store.left[node], store.right[node]):
+            if child != NIL:
+                assert store.parent[child] == node
+                stack.append(child)
+    assert count == store.size
+
+
+def _avl_height(store, node):
+    """Checks the stored height and the balance factor of every node below `node`; returns its height."""
+    if node == NIL:
+        return 0
+    left, right = _avl_height(store, store.left[node]), _avl_height(store, store.right[node])
+    assert abs(left - right) <= 1
+    assert store.height[node] == 1 + max(left, right)
+    return 1 + max(left, right)
+
+
+def _black_height(store, node):
+    """Checks no red node has a red child and every path below `node` has as many black nodes; returns that count."""
+    if node == NIL:
+        return 1
+    if store.is_red(node):
+        assert not store.is_red(store.left[node]) and not store.is_red(store.right[node])
+    left, right = _black_height(store, store.left[node]), _black_height(store, store.right[node])
+    assert left == right
+    return left + (0 if store.is_red(node) else 1)
+
+
+def _values(seed, n, duplicates=False):
+    rng = random.Random(seed)
+    return [rng.randint(0, n // 4) for _ in range(n)] if duplicates else rng.sample(range(10 * n), n)
+
+
+CASES = [(seed, n, duplicates) for seed in range(4) for n in (1, 2, 7, 120) for duplicates in (False, True)]
+
+
+@pytest.mark.parametrize('delete', ['none', 'half', 'all'])
+@pytest.mark.parametrize('seed,n,duplicates', CASES)
+def test_avl_invariants(stores, seed, n, duplicates, delete):
+    values = _values(seed, n, duplicates)
+    list(avl_tree_steps(values, delete=delete))
+    store = stores[-1]
+    remaining = sorted(values)
+    for value in trees._deletions(values, delete):
+        remaining.remove(value)
+    _check_links(store)
+    assert _in_order(store) == remaining
+    _avl_height(store, store.root)
+
+
+@pytest.mark.parametrize('delete', ['none', 'half', 'all'])
+@pytest.mark.parametrize('seed,n,duplicates', CASES)
+def test_red_black_invariants(stores, seed, n, duplicates, delete):
+    values = _values(seed, n, duplicates)
+    list(red_black_tree_steps(values, delete=delete))
+    store = stores[-1]
+    remaining = sorted(values)
+    for value in trees._deletions(values, delete):
+        remaining.remove(value)
+    _check_links(store)
+    assert _in_order(store) == remaining
+    assert not store.is_red(store.root)
+    _black_height(store, store.root)
+
+
+# AVL trees stay within 1.44 log2(n) levels, red-black trees within 2 log2(n + 1)
+@pytest.mark.parametrize('steps,bound', [(avl_tree_steps, 14), (red_black_tree_steps, 20)])
+def test_sorted_input_stays_logarithmic(stores, steps, bound):
+    list(steps(list(range(1024))))
+    assert stores[-1].depth() <= bound
+
+
+@pytest.mark.parametrize('n', [0, 1, 5, 64, 100])
+def test_bulk_load_is_valid_avl_and_red_black(n):
+    store = TreeStore.from_sorted(list(range(n)))
+    _check_links(store)
+    assert _in_order(store) == list(range(n))
+    _avl_height(store, store.root)
+    assert not store.is_red(store.root)
+    _black_height(store, store.root)
+
+
+@pytest.mark.parametrize('body', [
+    {'algorithm': 'avl_tree', 'input_data': [3, 'a', 1]},
+    {'algorithm': 'red_black_tree', 'input_data': [1, None]},
+    {'algorithm': 'avl_tree', 'input_data': 'x'},
+    {'algorithm': 'bst_build', 'input_data': [True, 2]},
+    {'algorithm': 'red_black_tree', 'input_data': [3, 1], 'options': {'delete': 'some'}},
+])
+def test_malformed_tree_requests_are_rejected(client, body):
+    assert client.post('/run_algorithm', json=body).status_code == 400
@@ -0,0 +1,168 @@
+# trace_cache.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+# Request fields that decide what a step function produces
+INPUT_FIELDS = ('input_data', 'dataset_id', 'target', 'start_node', 'end_node', 'n', 'capacity', 'items', 'seed', 'options')
+
+
+def input_digest(data, fields=INPUT_FIELDS):
+    """Returns a canonical SHA-256 of the request fields that feed the step function."""
+    canonical = json.dumps({f: data.get(f) for f in fields}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class TraceCache:
+    """
+    In-process LRU cache of already-serialized /run_algorithm response bodies.
+    Entries are evicted least-recently-used first once their total size passes
+    `max_bytes`; a single body larger than `max_entry_bytes` is never stored.
+    """
+
+    def __init__(self, max_bytes, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        """Returns (body, mimetype) for `key` and marks it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body, mimetype):
+        """Stores a serialized body, evicting old entries until it fits in the byte budget."""
+        if len(body) > self.max_entry_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._entries[key] = (body, mimetype)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def trace_handle(key, data):
+    """The id a paged trace of this request is stored under: equal requests share one recording."""
+    canonical = f"{key}:{input_digest(data)}:{bool(data.get('render_messages'))}"
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+class ShortestPathTree:
+    """A completed single-source shortest-path tree: distances and predecessors by node id."""
+
+    __slots__ = ('source', 'labels', 'index', 'distances', 'predecessors')
+
+    def __init__(self, source, labels, distances, predecessors):
+        self.source = source
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.distances = distances
+        self.predecessors = predecessors
+
+    def path_to(self, target):
+        """Returns (distance, path of labels) to `target`, or (None, None) if it is unreachable."""
+        i = self.index[target]
+        distance = self.distances[i]
+        if distance == float('inf'):
+            return None, None
+        path = []
+        while i != -1:
+            path.append(self.labels[i])
+            i = self.predecessors[i]
+        path.reverse()
+        return distance, path
+
+
+class ShortestPathTreeCache:
+    """
+    LRU cache of completed shortest-path trees keyed on (graph digest, source),
+    so repeated queries from the same source walk a stored predecessor map
+    instead of re-running Dijkstra. Bounded by the total number of nodes held.
+    """
+
+    def __init__(self, max_nodes):
+        self.max_nodes = max_nodes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, graph_digest, source):
+        with self._lock:
+            tree = self._entries.get((graph_digest, source))
+            if tree is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((graph_digest, source))
+            self.hits += 1
+            return tree
+
+    def put(self, graph_digest, tree):
+        nodes = len(tree.labels)
+        if nodes > self.max_nodes:
+            return False
+        key = (graph_digest, tree.source)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old.labels)
+            self._entries[key] = tree
+            self.size += nodes
+            while self.size > self.max_nodes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.labels)
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'nodes': self.size,
+                'max_nodes': self.max_nodes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
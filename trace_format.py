@@ -0,0 +1,178 @@
+# trace_format.py
+
+import json
+import sys
+from array import array
+from itertools import accumulate, chain
+from operator import itemgetter
+
+# Compact columnar encoding for step traces, served by /run_algorithm when the
+# client sends `Accept: application/vnd.algomirror.trace`.
+#
+# Layout (little-endian):
+#   b'AMT1' | uint32 header length | header JSON (space-padded to 4 bytes) | column buffers
+#
+# The header holds the action-code dictionary, the string table and the step
+# shapes (action code + field names + one column descriptor per field). Each
+# step contributes one entry to the shape column and one entry to each of its
+# shape's field columns, so repeated keys are never written twice.
+MIMETYPE = 'application/vnd.algomirror.trace'
+MAGIC = b'AMT1'
+
+# Integer columns use the narrowest of these widths that fits their min/max
+INT_DTYPES = (('i1', 'b', 2**7), ('i2', 'h', 2**15), ('i4', 'i', 2**31))
+
+
+def _pack_ints(values):
+    """Packs integers into the narrowest little-endian width, padded to 4 bytes."""
+    low, high = (min(values), max(values)) if len(values) else (0, 0)
+    for dtype, typecode, bound in INT_DTYPES:
+        if -bound <= low and high < bound:
+            break
+    else:
+        raise OverflowError('Value does not fit in 32 bits.')
+    packed = array(typecode, values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    chunk = packed.tobytes()
+    return dtype, chunk + b'\0' * (-len(chunk) % 4)
+
+
+def _pack_column(values):
+    """Returns (type, packed) for the narrowest column type that holds every value of a field.
+
+    Type checks run on the set of value types and the packing is done by the
+    array constructor, so a column is classified without a Python-level loop.
+    """
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return 'int', _pack_ints(values)
+        if types <= {list, tuple}:
+            flat = list(chain.from_iterable(values))
+            if set(map(type, flat)) <= {int}:
+                lengths = set(map(len, values))
+                if len(lengths) == 1:
+                    # Fixed-width lists (index pairs, ranges) need no offsets column
+                    return 'int_list', (lengths.pop(), None, len(flat), _pack_ints(flat))
+                offsets = [0, *accumulate(map(len, values))]
+                return 'int_list', (None, _pack_ints(offsets), len(flat), _pack_ints(flat))
+    except OverflowError:
+        pass
+    if types <= {str, type(None)}:
+        return 'str', None
+    return 'json', None
+
+
+def encode_columnar(steps):
+    """Encodes an iterable of step dicts into the columnar binary format."""
+    actions, action_codes = [], {}
+    shapes, shape_codes = [], {}
+    shape_column = []
+    add_shape = shape_column.append
+
+    # One pass files each step under its shape; each column is then cut out of
+    # its shape's steps by a single itemgetter map rather than value by value
+    for step in steps:
+        key = (step.get('action'), *step)
+        shape = shape_codes.get(key)
+        if shape is None:
+            action = key[0]
+            if action not in action_codes:
+                action_codes[action] = len(actions)
+                actions.append(action)
+            shape = shape_codes[key] = (len(shapes), [])
+            shapes.append((action_codes[action], list(key[1:]), shape[1]))
+        add_shape(shape[0])
+        shape[1].append(step)
+
+    strings, string_codes = [], {None: -1}
+    body = []
+    offset = 0
+
+    def _add_chunk(packed):
+        nonlocal offset
+        dtype, chunk = packed
+        body.append(chunk)
+        offset += len(chunk)
+        return {'dtype': dtype, 'offset': offset - len(chunk)}
+
+    def _describe(values):
+        kind, packed = _pack_column(values)
+        if kind == 'int':
+            return {'type': kind, **_add_chunk(packed)}
+        if kind == 'int_list':
+            width, offsets, flat_length, flat = packed
+            desc = {'type': kind, 'width': width}
+            if offsets is not None:
+                desc['offsets'] = _add_chunk(offsets)
+            desc['values'] = {'length': flat_length, **_add_chunk(flat)}
+            return desc
+        if kind == 'str':
+            # The string table is shared by every string column
+            for v in values:
+                if v not in string_codes:
+                    string_codes[v] = len(strings)
+                    strings.append(v)
+            return {'type': kind, **_add_chunk(_pack_ints(list(map(string_codes.__getitem__, values))))}
+        # Mixed or nested values (dicts, floats, lists of labels) stay JSON in the header
+        return {'type': kind, 'values': values}
+
+    shape_desc = _add_chunk(_pack_ints(shape_column))
+    # Columns are kept per shape, so every column is homogeneous and packs tightly
+    header_shapes = []
+    for action_code, keys, members in shapes:
+        fields = [f for f in keys if f != 'action']
+        header_shapes.append([action_code, fields, [_describe(list(map(itemgetter(f), members))) for f in fields], len(members)])
+
+    header = json.dumps({'count': len(shape_column), 'shape_column': shape_desc, 'actions': actions,
+                         'strings': strings, 'shapes': header_shapes}, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-len(header) % 4)
+    return b''.join([MAGIC, len(header).to_bytes(4, 'little'), header, *body])
+
+
+def decode_columnar(payload):
+    """Decodes a columnar payload back into a list of step dicts (mirrors the JS decoder)."""
+    if payload[:4] != MAGIC:
+        raise ValueError('Not a columnar trace payload.')
+    header_length = int.from_bytes(payload[4:8], 'little')
+    header = json.loads(payload[8:8 + header_length])
+    body = memoryview(payload)[8 + header_length:]
+    typecodes = {dtype: typecode for dtype, typecode, _ in INT_DTYPES}
+
+    def _ints(desc, length):
+        values = array(typecodes[desc['dtype']])
+        values.frombytes(body[desc['offset']:desc['offset'] + values.itemsize * length])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tolist()
+
+    def _column(desc, length):
+        if desc['type'] == 'int':
+            return _ints(desc, length)
+        if desc['type'] == 'int_list':
+            flat = _ints(desc['values'], desc['values']['length'])
+            width = desc['width']
+            if width is not None:
+                # Width 0 (every list empty) still yields one list per step
+                return [flat[i * width:(i + 1) * width] for i in range(length)]
+            bounds = _ints(desc['offsets'], length + 1)
+            return [flat[bounds[i]:bounds[i + 1]] for i in range(length)]
+        if desc['type'] == 'str':
+            strings = header['strings']
+            return [strings[c] if c >= 0 else None for c in _ints(desc, length)]
+        return desc['values']
+
+    shapes = []
+    for action_code, fields, descs, length in header['shapes']:
+        readers = [iter(_column(desc, length)) for desc in descs]
+        shapes.append((header['actions'][action_code], list(zip(fields, readers))))
+
+    steps = []
+    for shape_id in _ints(header['shape_column'], header['count']):
+        action, readers = shapes[shape_id]
+        step = {'action': action}
+        for field, reader in readers:
+            step[field] = next(reader)
+        steps.append(step)
+    return steps
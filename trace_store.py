@@ -0,0 +1,287 @@
+# trace_store.py
+#
+# On-disk store for paginated runs. A pool worker streams a run's steps into a
+# file, one JSON line per step, and indexes every CHECKPOINT_INTERVAL-th step
+# with its byte offset and the snapshot state (see algorithms/snapshots.py)
+# just before it. The web process maps the file and answers a window with a
+# view of the mapped bytes, so neither side ever holds a whole trace in memory
+# and a window's steps are not even copied out of the mapping.
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from array import array
+from collections import OrderedDict
+
+from algorithms.snapshots import apply_snapshots
+
+# Steps between two index entries; a window never scans or replays more than this beyond what it returns
+CHECKPOINT_INTERVAL = 256
+# Ends every step line: a run of lines minus its last separator is the inside of a JSON array
+STEP_SEPARATOR = b',\n'
+
+
+class TraceWriter:
+    """
+    Appends steps to `<path>.steps`, one JSON line each ended by STEP_SEPARATOR.
+    Every `interval`-th step gets an index entry: its byte offset there, and the
+    offset in `<path>.state` of the snapshot state before it.
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.offsets = array('Q')
+        self.checkpoints = array('Q')
+        self.total = 0
+        self._steps = open(path + '.steps', 'wb')
+        self._states = open(path + '.state', 'wb')
+        self._position = self._state_position = 0
+        self._state = {}
+
+    def append(self, step):
+        if self.total % self.interval == 0:
+            checkpoint = (json.dumps(self._state, separators=(',', ':')) + '\n').encode('utf-8')
+            self.offsets.append(self._position)
+            self.checkpoints.append(self._state_position)
+            self._states.write(checkpoint)
+            self._state_position += len(checkpoint)
+        line = json.dumps(step, separators=(',', ':')).encode('utf-8') + STEP_SEPARATOR
+        self._steps.write(line)
+        self._position += len(line)
+        apply_snapshots(self._state, step)
+        self.total += 1
+
+    def close(self):
+        """Finishes the files and returns the DiskTrace that reads them."""
+        self._steps.close()
+        self._states.close()
+        self.offsets.append(self._position)
+        self.checkpoints.append(self._state_position)
+        return DiskTrace(self.path, self.interval, self.total, self.offsets, self.checkpoints)
+
+    def discard(self):
+        self._steps.close()
+        self._states.close()
+        for suffix in ('.steps', '.state'):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def write_trace(steps, path, interval=CHECKPOINT_INTERVAL):
+    """Consumes a step generator into a trace at `path`; nothing is left behind if it fails."""
+    writer = TraceWriter(path, interval)
+    try:
+        for step in steps:
+            writer.append(step)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.close()
+
+
+class DiskTrace:
+    """
+    A trace written by TraceWriter. `offsets[i]` is the byte offset of step
+    i * interval (plus a final entry for the end of the file), `checkpoints[i]`
+    that of the state before it. Small enough to send back from a pool worker.
+    Each mapping holds a file descriptor, so a trace is only kept mapped
+    between `open` and `close` (TraceStore bounds how many are); a window read
+    while it is closed maps the files for that read alone.
+    """
+
+    __slots__ = ('path', 'interval', 'total', 'offsets', 'checkpoints', 'size', '_maps')
+
+    def __init__(self, path, interval, total, offsets, checkpoints):
+        self.path = path
+        self.interval = interval
+        self.total = total
+        self.offsets = offsets
+        self.checkpoints = checkpoints
+        self.size = offsets[-1] + checkpoints[-1]
+        self._maps = None
+
+    def __getstate__(self):
+        return (self.path, self.interval, self.total, self.offsets, self.checkpoints)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def _map(self, suffix):
+        with open(self.path + suffix, 'rb') as f:
+            # An empty file cannot be mapped; an empty trace has nothing to read anyway
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+
+    def _map_files(self):
+        """(steps mapping, state mapping); raises FileNotFoundError once the trace is removed."""
+        return self._map('.steps'), self._map('.state')
+
+    def open(self):
+        """
+        Keeps both files mapped. A mapping stays readable after its file is
+        unlinked, so an open trace survives `remove` (an eviction, say).
+        """
+        if self._maps is None:
+            self._maps = self._map_files()
+        return self
+
+    def close(self):
+        # Not mmap.close(): a window may still view the mapping, which is released with its last reference
+        self._maps = None
+
+    def _locate(self, data, step):
+        """Byte offset of `step`: its index entry, then a newline scan of at most `interval` lines."""
+        page = step // self.interval
+        if step == self.total:
+            return self.offsets[-1]
+        position = self.offsets[page]
+        for _ in range(step - page * self.interval):
+            position = data.find(b'\n', position) + 1
+        return position
+
+    def window(self, start, count):
+        """
+        Returns (steps start..start+count-1, snapshot state just before `start`).
+        The steps are a memoryview of the mapping, each line ended by
+        STEP_SEPARATOR: nothing is decoded or copied.
+        """
+        end = min(start + count, self.total)
+        if start >= end:
+            return memoryview(b''), {}
+        data, states = self._maps or self._map_files()
+        page = start // self.interval
+        at = self.checkpoints[page]
+        state = json.loads(states[at:states.find(b'\n', at)])
+        first, low = self.offsets[page], self._locate(data, start)
+        for line in data[first:low].splitlines():
+            apply_snapshots(state, json.loads(line[:-1]))
+        return memoryview(data)[low:self._locate(data, end)], state
+
+    def remove(self):
+        # An open mapping stays readable after the unlink and is released with the last reference
+        for suffix in ('.steps', '.state'):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+class TraceStore:
+    """
+    LRU store of DiskTraces by handle, bounded by the bytes they take on disk
+    and by their number; evicted traces have their files deleted. Only the
+    `max_open` most recently read traces stay mapped, so the file descriptors
+    in use do not grow with the number of traces. Without a `directory` a
+    temporary one is created, and removed again by `close`.
+    """
+
+    def __init__(self, max_bytes, directory=None, max_traces=10_000, max_open=32):
+        self.max_bytes = max_bytes
+        self.max_traces = max_traces
+        self.max_open = max_open
+        self._owned = directory is None
+        self.directory = tempfile.mkdtemp(prefix='traces-') if directory is None else directory
+        os.makedirs(self.directory, exist_ok=True)
+        self._traces = OrderedDict()
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def new_path(self):
+        """A fresh file path for a TraceWriter; concurrent recordings of one handle never share files."""
+        return os.path.join(self.directory, uuid.uuid4().hex)
+
+    def get(self, trace_id):
+        """Returns the DiskTrace stored under `trace_id` and marks it recently used, or None."""
+        with self._lock:
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                self.misses += 1
+                return None
+            self._traces.move_to_end(trace_id)
+            self.hits += 1
+            return trace
+
+    def open(self, trace_id):
+        """
+        Like `get`, but returns the trace mapped, closing the least recently
+        opened one past `max_open`. None as well when the trace was evicted
+        (and its files deleted) before it could be mapped.
+        """
+        trace = self.get(trace_id)
+        if trace is None:
+            return None
+        try:
+            trace.open()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._open[trace_id] = trace
+            self._open.move_to_end(trace_id)
+            closed = [self._open.popitem(last=False)[1] for _ in range(len(self._open) - self.max_open)]
+        for old in closed:
+            old.close()
+        return trace
+
+    def put(self, trace_id, trace):
+        """Stores a trace, deleting old ones until it fits; a trace over the whole budget is deleted instead."""
+        if trace.size > self.max_bytes:
+            trace.remove()
+            return False
+        evicted = []
+        with self._lock:
+            old = self._traces.pop(trace_id, None)
+            if old is not None:
+                self.size -= old.size
+                evicted.append((trace_id, old))
+            self._traces[trace_id] = trace
+            self.size += trace.size
+            while self.size > self.max_bytes or len(self._traces) > self.max_traces:
+                oldest_id, oldest = self._traces.popitem(last=False)
+                self.size -= oldest.size
+                self.evictions += 1
+                evicted.append((oldest_id, oldest))
+            for old_id, old in evicted:
+                if self._open.get(old_id) is old:
+                    del self._open[old_id]
+        # Left mapped: a read already holding an evicted trace finishes, and the mappings go with the trace
+        for _, old in evicted:
+            old.remove()
+        return True
+    def clear(self):
+        with self._lock:
+            traces = list(self._traces.values())
+            self._traces.clear()
+            self._open.clear()
+            self.size = 0
+        for trace in traces:
+            trace.remove()
+
+    def close(self):
+        self.clear()
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'traces': len(self._traces),
+                'max_traces': self.max_traces,
+                'open': len(self._open),
+                'max_open': self.max_open,
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'steps': sum(trace.total for trace in self._traces.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }